@@ -93,6 +93,8 @@ set -euo pipefail
 # meaningful protocol) and rewrite their status to 2 before it can be read.
 trap 'printf "%s\n" "Blocked by safety-net: hook failed while parsing its input; denying fail-closed." >&2; exit 2' ERR
 
+# Start of the "intake" phase for the opt-in LISA_HOOK_PROFILE record below.
+profile_started="${EPOCHREALTIME:-}"
 input="$(cat)"
 
 tool_name="$(printf '%s' "$input" | jq -r '.tool_name // empty')"
@@ -105,6 +107,49 @@ if [ -z "$command_str" ]; then
   exit 0
 fi
 
+# Opt-in latency profile (LISA_HOOK_PROFILE=<file>): append one JSON line per
+# screened command with the wall time of each phase in microseconds, the
+# classifier's per-rule timings, the verdict, and the exit status.
+# scripts/summarize-hook-profile.py turns the file into p50/p95/p99 per phase.
+# Off by default and a no-op on bashes without $EPOCHREALTIME (bash < 5); the
+# marks are builtins only, so profiling adds no process to the phases it times.
+profile_file="${LISA_HOOK_PROFILE:-}"
+[ -n "$profile_started" ] || profile_file=""
+profile_rules_file=""
+if [ -n "$profile_file" ]; then
+  profile_started="${profile_started//[!0-9]/}"
+  profile_last="$profile_started"
+  profile_phase="intake"
+  profile_phases=""
+  profile_verdict="none"
+  # profile_enter closes the open phase and starts timing $1.
+  profile_enter() {
+    local now="${EPOCHREALTIME//[!0-9]/}"
+    profile_phases+="${profile_phases:+,}\"$profile_phase\":$((now - profile_last))"
+    profile_phase="$1"
+    profile_last="$now"
+  }
+  profile_write() {
+    local rules="" now
+    profile_enter done
+    now="${EPOCHREALTIME//[!0-9]/}"
+    if [ -n "$profile_rules_file" ]; then
+      rules="$(<"$profile_rules_file")" || rules=""
+      rm -f "$profile_rules_file"
+    fi
+    case "$rules" in
+      '{'*'}') ;;
+      *) rules="null" ;;
+    esac
+    printf '{"hook":"parity-safety-net","ts":%s,"exit":%s,"verdict":"%s","command_length":%s,"total_us":%s,"phases_us":{%s},"classifier":%s}\n' \
+      "$((profile_started / 1000000))" "$1" "$profile_verdict" "${#command_str}" \
+      "$((now - profile_started))" "$profile_phases" "$rules" >>"$profile_file"
+  }
+  trap 'profile_write "$?" 2>/dev/null || true' EXIT
+else
+  profile_enter() { :; }
+fi
+
 # block() prints the reason to stderr (surfaced to the model) and exits 2 so the
 # Bash tool call is denied. $1 = human-readable reason for the block.
 block() {
@@ -147,25 +192,99 @@ Fix: write the payload to a file with the Write tool, then execute that file
 directly (for example \`python3 <file>\` or \`bash <file>\`)."
 }
 
+# classify_via_daemon is the client half of the opt-in classifier daemon
+# (parity-safety-net-heredoc-daemon.py documents the wire format). Perl rather
+# than python3, because sparing an interpreter start is the daemon's whole
+# point; perl's core IO::Socket::UNIX and Time::HiRes give a Unix-socket client
+# with a sub-second deadline that behaves the same on macOS and Linux, where
+# nc/socat flags do not. Exit 99 means "no usable answer"; the caller treats
+# every status other than 0/10/20 as a fall-back signal, never as a verdict.
+# A SAFE reply replaces the text the guards scan, so the client trusts only a
+# socket it could not have been handed by someone else: the socket and its
+# directory must both be owned by this user and closed to group and others
+# (lstat, so a symlink planted in a shared /tmp fails the check). Anything
+# else is "no usable answer" before a byte is sent.
+# $1 = socket path, $2 = absolute path of the classifier the hook trusts.
+classify_via_daemon() {
+  perl -MIO::Socket::UNIX -MTime::HiRes=alarm -MFile::Basename=dirname -e '
+    binmode STDIN;
+    binmode STDOUT;
+    $SIG{ALRM} = sub { exit 99 };
+    alarm 1;
+    for my $entry (dirname($ARGV[0]), $ARGV[0]) {
+      my @stat = lstat $entry or exit 99;
+      exit 99 unless $stat[4] == $< && !($stat[2] & 077);
+    }
+    exit 99 unless -S $ARGV[0];
+    my $sock = IO::Socket::UNIX->new(Peer => $ARGV[0]) or exit 99;
+    binmode $sock;
+    local $/;
+    my $command = <STDIN>;
+    $command = "" unless defined $command;
+    print {$sock} "lisa-heredoc/1 $ARGV[1]\n", $command or exit 99;
+    shutdown($sock, 1) or exit 99;
+    my $reply = <$sock>;
+    exit 99 unless defined $reply && $reply =~ /\A(0|10|20)\n(.*)\z/s;
+    print $2;
+    exit $1;
+  ' "$1" "$2"
+}
+
+hook_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 command_for_guards="$command_str"
 case "$command_str" in
   *'<<'*)
-    hook_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
     heredoc_parser="$hook_dir/parity-safety-net-heredoc.py"
     if ! command -v python3 >/dev/null 2>&1 || [ ! -r "$heredoc_parser" ]; then
       block_heredoc "cannot safely classify heredoc command because its parser runtime is unavailable"
     fi
-    if ! printf '%s\n' "$command_str" | /bin/bash -n >/dev/null 2>&1; then
-      block_heredoc "malformed heredoc command failed shell syntax validation"
-    fi
+    # The classifier runs the `/bin/bash -n` syntax check itself and reports a
+    # command bash cannot parse as MALFORMED(20), so no separate pipeline here.
 
-    parser_status=0
-    if parser_output="$(printf '%s' "$command_str" | python3 "$heredoc_parser" 2>/dev/null)"; then
-      parser_status=0
-    else
-      parser_status=$?
+    # Opt-in resident classifier (LISA_SAFETY_NET_DAEMON=1): ask the daemon
+    # started from parity-safety-net-heredoc-daemon.py first, and use its answer
+    # only if it is one of the three protocol verdicts. Anything else — no
+    # socket, a socket or directory another user could have planted, no perl
+    # for the client, a refused or slow connection, a daemon serving a
+    # different classifier — leaves parser_status empty and falls
+    # through to the one-shot process below, which fails closed as it always has.
+    profile_enter classifier
+    parser_status=""
+    if [ "${LISA_SAFETY_NET_DAEMON:-0}" = "1" ]; then
+      daemon_runtime="${XDG_RUNTIME_DIR:-${TMPDIR:-}}"
+      daemon_runtime="${daemon_runtime%/}"
+      daemon_socket="${LISA_SAFETY_NET_DAEMON_SOCKET:-${daemon_runtime:-/tmp}/lisa-safety-net-$UID/heredoc.sock}"
+      if [ -S "$daemon_socket" ] && command -v perl >/dev/null 2>&1; then
+        if parser_output="$(printf '%s' "$command_str" \
+          | classify_via_daemon "$daemon_socket" "$heredoc_parser" 2>/dev/null)"; then
+          parser_status=0
+        else
+          parser_status=$?
+        fi
+        case "$parser_status" in
+          0 | 10 | 20) ;;
+          *) parser_status="" ;;
+        esac
+      fi
+    fi
+    if [ -z "$parser_status" ]; then
+      if [ -n "$profile_file" ]; then
+        profile_rules_file="$(mktemp 2>/dev/null)" || profile_rules_file=""
+      fi
+      if parser_output="$(printf '%s' "$command_str" \
+        | LISA_HOOK_PROFILE_RULES="$profile_rules_file" python3 "$heredoc_parser" 2>/dev/null)"; then
+        parser_status=0
+      else
+        parser_status=$?
+      fi
     fi
 
+    case "$parser_status" in
+      0) profile_verdict="SAFE" ;;
+      10) profile_verdict="UNSUPPORTED" ;;
+      20) profile_verdict="MALFORMED" ;;
+      *) profile_verdict="error" ;;
+    esac
     case "$parser_status" in
       0) command_for_guards="$parser_output" ;;
       10) command_for_guards="$command_str" ;;
@@ -175,6 +294,8 @@ case "$command_str" in
     ;;
 esac
 
+profile_enter normalize
+
 # Normalize bash line-continuations (a trailing backslash + newline → space)
 # before segmenting the command. Without this, "git push --force origin
 # \<newline>main" splits into a segment matching --force but not `main`, letting a
@@ -183,6 +304,76 @@ esac
 normalized_command_str="$(printf '%s' "$command_for_guards" \
   | awk '{ if (sub(/\\$/, "")) printf "%s ", $0; else print }')"
 
+# Read by the rm target hardening (guard 1b) on both guard paths below.
+project_dir="${CLAUDE_PROJECT_DIR:-$PWD}"
+tmp_dir_allow="${TMPDIR:-/tmp}"
+tmp_dir_allow="${tmp_dir_allow%/}"
+[ -n "$tmp_dir_allow" ] || tmp_dir_allow="/tmp"
+
+# 14. Project-local custom rules. Each non-comment line is an ERE; a match
+#     blocks. A function because both guard paths below end here, after built-in
+#     guards 1-13 have all passed.
+run_custom_rules() {
+  local rules_file rule rule_status
+  rules_file="${SAFETY_NET_RULES_FILE:-${CLAUDE_PROJECT_DIR:-$PWD}/.claude/safety-net-rules.txt}"
+  if [ ! -f "$rules_file" ]; then
+    return 0
+  fi
+  profile_enter custom_rules
+  while IFS= read -r rule || [ -n "$rule" ]; do
+    case "$rule" in
+      '' | '#'*) continue ;;
+    esac
+    # Normalized text, for the same reason every built-in guard uses it: a
+    # project rule must not be evadable by breaking the command across lines.
+    #
+    # `|| rule_status=$?` rather than a bare pipeline: this script runs under
+    # `set -e`, and a no-match grep exits 1, which would end the hook right
+    # here — before the remaining rules ran, and with an exit status that is
+    # not a refusal. The `||` puts the pipeline in a condition context, where
+    # a non-zero status is expected rather than fatal.
+    rule_status=0
+    printf '%s' "$normalized_command_str" | grep -Eiq -- "$rule" || rule_status=$?
+    case "$rule_status" in
+      0) block "matched a project custom safety rule (${rules_file##*/}): $rule" ;;
+      1) ;; # no match
+      # grep exits 2 on a malformed ERE. Treated as no-match before, so a typo
+      # in a project's rules file silently disabled that rule — a guard the
+      # project believed it had. Say so instead; still non-fatal, because one
+      # bad line must not take the other rules down with it.
+      *)
+        printf 'parity-safety-net: invalid regex in %s, rule NOT enforced: %s\n' \
+          "$rules_file" "$rule" >&2
+        ;;
+    esac
+  done <"$rules_file"
+}
+
+# Built-in guards 1-13 in one process. Each guard below is its own
+# `printf | grep` pipeline, so the shell path forks dozens of processes per
+# command; parity-safety-net-guards.py evaluates the same EREs, in the same
+# order, in one interpreter and prints the first blocking reason verbatim.
+# It is an accelerator only: exit 0 (nothing blocks) and 2 (blocked) are
+# verdicts, and anything else — no python3, no engine beside this hook (a host
+# project's scripts/lisa-hooks copy), a crash, an over-size command — falls
+# through to the shell guards, which stay the reference implementation.
+guard_engine="$hook_dir/parity-safety-net-guards.py"
+profile_enter guard_engine
+if command -v python3 >/dev/null 2>&1 && [ -r "$guard_engine" ]; then
+  guard_status=0
+  guard_reason="$(printf '%s' "$normalized_command_str" \
+    | python3 "$guard_engine" "$project_dir" "$tmp_dir_allow" 2>/dev/null)" \
+    || guard_status=$?
+  case "$guard_status" in
+    0)
+      run_custom_rules
+      exit 0
+      ;;
+    2) block "$guard_reason" ;;
+  esac
+fi
+profile_enter guards
+
 # matches / matches_cs run an ERE against the guarded command text. matches is
 # case-insensitive (the default for these guards); matches_cs is case-SENSITIVE
 # for guards where flag case is meaningful (`git branch -d` vs `-D`).
@@ -270,10 +461,6 @@ readonly RM_CATASTROPHIC_TARGET='([[:space:]='"$qc"'])((/|/\*|/\.\*?|~|~/\*?|\$H
 #       - the target is a `$VAR` expansion other than the sanctioned $TMPDIR.
 #     Globbing is disabled around the token walk so a literal `*` in the command
 #     is never expanded against the hook's own cwd.
-project_dir="${CLAUDE_PROJECT_DIR:-$PWD}"
-tmp_dir_allow="${TMPDIR:-/tmp}"
-tmp_dir_allow="${tmp_dir_allow%/}"
-[ -n "$tmp_dir_allow" ] || tmp_dir_allow="/tmp"
 # Peel command-substitution wrappers off a token so an rm nested in `$(…)`,
 # backticks, `<(…)`/`>(…)`, a `"…"`/`'…'` quote, or a leading `\` alias-bypass
 # (`\rm`) is recognized and its target classified as if the token were unwrapped
@@ -561,36 +748,6 @@ if matches '\b(drop[[:space:]]+(database|schema|table)|truncate[[:space:]]+(tabl
   block "destructive SQL (DROP/TRUNCATE) detected"
 fi
 
-# 14. Project-local custom rules. Each non-comment line is an ERE; a match blocks.
-rules_file="${SAFETY_NET_RULES_FILE:-${CLAUDE_PROJECT_DIR:-$PWD}/.claude/safety-net-rules.txt}"
-if [ -f "$rules_file" ]; then
-  while IFS= read -r rule || [ -n "$rule" ]; do
-    case "$rule" in
-      '' | '#'*) continue ;;
-    esac
-    # Normalized text, for the same reason every built-in guard uses it: a
-    # project rule must not be evadable by breaking the command across lines.
-    #
-    # `|| rule_status=$?` rather than a bare pipeline: this script runs under
-    # `set -e`, and a no-match grep exits 1, which would end the hook right
-    # here — before the remaining rules ran, and with an exit status that is
-    # not a refusal. The `||` puts the pipeline in a condition context, where
-    # a non-zero status is expected rather than fatal.
-    rule_status=0
-    printf '%s' "$normalized_command_str" | grep -Eiq -- "$rule" || rule_status=$?
-    case "$rule_status" in
-      0) block "matched a project custom safety rule (${rules_file##*/}): $rule" ;;
-      1) ;; # no match
-      # grep exits 2 on a malformed ERE. Treated as no-match before, so a typo
-      # in a project's rules file silently disabled that rule — a guard the
-      # project believed it had. Say so instead; still non-fatal, because one
-      # bad line must not take the other rules down with it.
-      *)
-        printf 'parity-safety-net: invalid regex in %s, rule NOT enforced: %s\n' \
-          "$rules_file" "$rule" >&2
-        ;;
-    esac
-  done <"$rules_file"
-fi
+run_custom_rules
 
 exit 0
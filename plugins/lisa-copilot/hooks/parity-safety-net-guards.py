@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""In-process built-in guards for parity-safety-net.sh.
+
+The hook's built-in guards are extended regexes, and the shell evaluates each
+one as its own ``printf | grep -E`` pipeline — a single agent command forks
+dozens of processes before it is allowed. This engine evaluates the same
+guards, in the same order, in ONE interpreter: the guard table is built and
+every ERE compiled once at import, and each guard reads the one normalized
+command. It prints the first blocking guard's reason, byte-for-byte the text
+the shell guard would have passed to ``block()``, and exits 2; it exits 0 when
+no built-in guard blocks.
+
+    printf '%s' "$normalized_command_str" \\
+      | python3 parity-safety-net-guards.py "$project_dir" "$tmp_dir_allow"
+
+It is strictly an accelerator, in the same sense as the heredoc daemon. The
+shell guards stay in parity-safety-net.sh and remain authoritative: any other
+exit — a missing interpreter, a crash, or ``DEFER`` for input past
+``SIZE_LIMIT`` or outside ASCII — makes the hook run them itself. Project-local rules (guard 14)
+are not evaluated here: they are operator-written EREs, and reproducing grep's
+dialect for arbitrary input is a promise this translator does not make.
+
+The EREs below are copied from the shell verbatim and translated by ``ere()``.
+grep is line-oriented, so a pattern matches when it matches some LINE of the
+text, and ``^``/``$``/``[^…]`` never reach across a newline; ``Text`` keeps the
+lines. POSIX classes are read in the C locale (ASCII), but the hook's grep
+runs in the caller's locale, where ``[[:space:]]`` and ``[[:alnum:]]`` may also
+match non-ASCII characters — either way round, so a translated guard could
+stay quiet where grep blocks. Only ASCII input is answered here, where the two
+readings agree; anything else is deferred to grep.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+
+ALLOW = 0
+BLOCK = 2
+DEFER = 3
+
+# Characters the engine will scan. Python's regexes backtrack where grep's DFA
+# cannot, so larger commands go to the grep guards rather than trusting every
+# pattern here to stay linear (see rm_rf_split for the one that did not).
+SIZE_LIMIT = 64 * 1024
+
+POSIX_CLASSES = {
+    "alnum": "A-Za-z0-9",
+    "alpha": "A-Za-z",
+    "digit": "0-9",
+    "space": " \\t\\n\\r\\f\\v",
+}
+
+
+def ere(pattern: str, *, ignore_case: bool = True) -> re.Pattern[str]:
+    """Compile a POSIX ERE as ``grep -E`` (``-i`` by default) would read it.
+
+    Only the ERE features the guards use are translated: bracket expressions
+    with POSIX classes, and backslash escapes (``\\b`` stays a word boundary,
+    anything else is a literal). A range inside a bracket expression is
+    rejected rather than guessed at.
+    """
+    out: list[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1]
+            out.append(r"\b" if escaped == "b" else re.escape(escaped))
+            index += 2
+        elif char == "[":
+            index = translate_bracket(pattern, index, out)
+        else:
+            out.append(char)
+            index += 1
+    flags = re.ASCII | (re.IGNORECASE if ignore_case else 0)
+    return re.compile("".join(out), flags)
+
+
+def translate_bracket(pattern: str, index: int, out: list[str]) -> int:
+    """Append the bracket expression at ``index``; return the index after it."""
+    index += 1
+    negate = pattern.startswith("^", index)
+    if negate:
+        index += 1
+    start = index
+    items: list[str] = []
+    while True:
+        char = pattern[index]
+        if char == "]" and index > start:
+            break
+        if pattern.startswith("[:", index):
+            end = pattern.index(":]", index)
+            items.append(POSIX_CLASSES[pattern[index + 2 : end]])
+            index = end + 2
+            continue
+        if char == "-" and index > start and pattern[index + 1] != "]":
+            raise ValueError(f"range in bracket expression: {pattern!r}")
+        items.append(re.escape(char))
+        index += 1
+    out.append("[" + ("^" if negate else "") + "".join(items) + "]")
+    return index + 1
+
+
+def grep_lines(text: str) -> list[str]:
+    """The lines ``grep`` would read from ``printf '%s' "$text"``."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+STATEMENT_BREAKS = str.maketrans("&|;", "\n\n\n")
+
+
+class Text:
+    """The normalized command, as the shell's ``matches`` helpers see it."""
+
+    def __init__(self, command: str) -> None:
+        self.lines = grep_lines(command)
+        # `tr '&|;' '\n'`: the statements the rm and push loops walk.
+        self.statements = grep_lines(command.translate(STATEMENT_BREAKS))
+
+    def matches(self, pattern: re.Pattern[str]) -> bool:
+        return any(pattern.search(line) for line in self.lines)
+
+
+def line_matches(pattern: re.Pattern[str], line: str) -> bool:
+    return pattern.search(line) is not None
+
+
+# Shared ERE fragments, verbatim from parity-safety-net.sh.
+GIT_TOKENS = "([[:space:]]+[^;&|[:space:]]+)*[[:space:]]+"
+GIT_GLOBAL_OPTS = (
+    "(-[^;&|[:space:]]+([[:space:]]+[^-;&|[:space:]][^;&|[:space:]]*)?[[:space:]]+)*"
+)
+GIT_CMD = "(^|[^[:alnum:]_-])git[[:space:]]+" + GIT_GLOBAL_OPTS
+RM_CMD = "(^|[^[:alnum:]_./-])([[:alnum:]_./-]*/)?rm"
+RM_RF_CLUSTER = (
+    RM_CMD
+    + "([[:space:]]+-[[:alnum:]-]+)*[[:space:]]+(-[[:alnum:]]*r[[:alnum:]]*f"
+    "|-[[:alnum:]]*f[[:alnum:]]*r)([[:space:]]|$)"
+)
+RM_RF_SPLIT = (
+    RM_CMD
+    + "(([[:space:]][^;&|]*)?[[:space:]](-[[:alnum:]]*r[[:alnum:]]*|--recursive)"
+    "([[:space:]][^;&|]*)?[[:space:]](-[[:alnum:]]*f[[:alnum:]]*|--force)([[:space:]]|$)"
+    "|([[:space:]][^;&|]*)?[[:space:]](-[[:alnum:]]*f[[:alnum:]]*|--force)"
+    "([[:space:]][^;&|]*)?[[:space:]](-[[:alnum:]]*r[[:alnum:]]*|--recursive)([[:space:]]|$))"
+)
+QC = "'\""
+TC = "'\"`)"
+RM_CATASTROPHIC_TARGET = (
+    "([[:space:]=" + QC + "])((/|/\\*|/\\.\\*?|~|~/\\*?|\\$HOME\\b|\\$\\{HOME\\})"
+    "([[:space:]" + TC + "]|/?\\*?[" + TC + "]?$)"
+    "|\\*([[:space:]" + QC + "]|/?\\*?[" + QC + "]?$))"
+)
+GIT_CHECKOUT = GIT_CMD + "checkout"
+GIT_CLEAN = GIT_CMD + "clean"
+GIT_BRANCH = GIT_CMD + "branch"
+
+RM_STATEMENT = ere(RM_CMD + "([[:space:]]|$)")
+RM_RF_CLUSTER_RE = ere(RM_RF_CLUSTER)
+# RM_RF_SPLIT in pieces, for rm_rf_split().
+RM_BEFORE_BLANK = ere(RM_CMD + "[[:space:]]")
+RECURSIVE_FLAG = "(-[[:alnum:]]*r[[:alnum:]]*|--recursive)"
+FORCE_FLAG = "(-[[:alnum:]]*f[[:alnum:]]*|--force)"
+SPLIT_FLAG_ORDERS = (
+    (
+        ere("[[:space:]]" + RECURSIVE_FLAG + "[[:space:]]"),
+        ere("[[:space:]]" + FORCE_FLAG + "([[:space:]]|$)"),
+    ),
+    (
+        ere("[[:space:]]" + FORCE_FLAG + "[[:space:]]"),
+        ere("[[:space:]]" + RECURSIVE_FLAG + "([[:space:]]|$)"),
+    ),
+)
+RM_TARGET = ere(RM_CATASTROPHIC_TARGET, ignore_case=False)
+PUSH_STATEMENT = ere(GIT_CMD + "push\\b")
+PUSH_FORCE = ere("(--force([[:space:]]|=|$)|[[:space:]]-f([[:space:]]|$))")
+PUSH_LEASE = ere("--force-with-lease")
+PUSH_PROTECTED = ere(
+    "(^|[^[:alnum:]_/-])(main|master|production|prod|release)([^[:alnum:]_/-]|$)"
+)
+RESET_DISCARD = ere(GIT_CMD + "reset\\b.*--(hard|merge)\\b")
+REBASE_ABORT = ere(GIT_CMD + "rebase" + GIT_TOKENS + "--(abort|quit)([[:space:]]|$)")
+
+RM_TARGET_REASON = "recursive forced delete of a root, home, or wildcard path (rm -rf)"
+RM_HOME_CWD_REASON = (
+    "recursive forced delete while the working directory is $HOME "
+    "(cd into a project first)"
+)
+RM_CWD_REASON = "recursive forced delete of the current directory (rm -rf .)"
+RM_TRAVERSAL_REASON = (
+    "recursive forced delete of a path outside the project (.. traversal)"
+)
+RM_HOME_PATH_REASON = (
+    "recursive forced delete of a home-anchored path (~/…) outside the project"
+)
+RM_ABSOLUTE_REASON = (
+    "recursive forced delete of an absolute path outside the project "
+    "(only the project, /tmp, /var/tmp, and $TMPDIR are allowed)"
+)
+RM_WILDCARD_REASON = "recursive forced delete of a top-level wildcard (rm -rf *)"
+RM_VARIABLE_REASON = (
+    "recursive forced delete of a variable-expanded target (unset or mistyped "
+    "variables can point anywhere; $TMPDIR is the only sanctioned dynamic target)"
+)
+
+
+@dataclass(frozen=True)
+class Context:
+    """What the shell guards read from outside the command text."""
+
+    project_dir: str
+    tmp_dir_allow: str
+
+
+def strip_subst_wrappers(token: str) -> str:
+    """Port of the hook's ``strip_subst_wrappers`` (issue #1982)."""
+    previous = None
+    while token != previous:
+        previous = token
+        if token.startswith("$(("):
+            break
+        for wrapper in ("\\", "$(", "<(", ">(", '"', "'", "`", "("):
+            if token.startswith(wrapper):
+                token = token[len(wrapper) :]
+                break
+    previous = None
+    while token != previous:
+        previous = token
+        for closer in (")", "`", '"', "'"):
+            if token.endswith(closer):
+                token = token[: -len(closer)]
+                break
+    return token
+
+
+def cwd_is_home() -> bool:
+    """``[ "$(pwd -P)" = "$(cd -- "$HOME" && pwd -P)" ]`` with HOME set."""
+    home = os.environ.get("HOME", "")
+    if not home or not os.path.isdir(home):
+        return False
+    try:
+        return os.getcwd() == os.path.realpath(home)
+    except OSError:
+        return False
+
+
+def under(token: str, root: str) -> bool:
+    return token == root or token.startswith(root + "/")
+
+
+def rm_token_reason(token: str, context: Context) -> str | None:
+    """The token-walk arm of guard 1b for one target, in the shell's case order."""
+    if token.startswith("-"):
+        return None
+    if token in (".", "./"):
+        return RM_CWD_REASON
+    if token == ".." or token.startswith("../") or token.endswith("/.."):
+        return RM_TRAVERSAL_REASON
+    if "/../" in token:
+        return RM_TRAVERSAL_REASON
+    if token == "~" or token.startswith("~/"):
+        return RM_HOME_PATH_REASON
+    if token.startswith("/"):
+        allowed = (context.project_dir, "/tmp", "/var/tmp", context.tmp_dir_allow)
+        if any(under(token, root) for root in allowed):
+            return None
+        return RM_ABSOLUTE_REASON
+    if token == "*":
+        return RM_WILDCARD_REASON
+    if "$" in token:
+        if under(token, "$TMPDIR") or under(token, "${TMPDIR}"):
+            return None
+        return RM_VARIABLE_REASON
+    return None
+
+
+def rm_rf_split(statement: str) -> bool:
+    """Whether ``RM_RF_SPLIT`` matches ``statement``, without its backtracking.
+
+    Compiled whole, the pattern re-scans the rest of the statement from every
+    `rm` and every flag, which is quadratic on a long run of flags where grep's
+    DFA is linear. Only existence matters, and each piece can be found at its
+    leftmost occurrence without losing a match: the first `rm` followed by a
+    blank leaves the longest tail, and the first flag of an order leaves the
+    most room for the second. The blank after the first flag may also be the
+    one the second flag starts with, as in the pattern.
+    """
+    rm = RM_BEFORE_BLANK.search(statement)
+    if rm is None:
+        return False
+    for first, second in SPLIT_FLAG_ORDERS:
+        flag = first.search(statement, rm.end() - 1)
+        if flag is not None and second.search(statement, flag.end() - 1):
+            return True
+    return False
+
+
+def rm_guard(text: Text, context: Context) -> str | None:
+    """Guards 1 and 1b: every rm statement with recursive and force flags."""
+    for statement in text.statements:
+        if not line_matches(RM_STATEMENT, statement):
+            continue
+        if not line_matches(RM_RF_CLUSTER_RE, statement) and not rm_rf_split(
+            statement
+        ):
+            continue
+        if line_matches(RM_TARGET, statement):
+            return RM_TARGET_REASON
+        if cwd_is_home():
+            return RM_HOME_CWD_REASON
+        seen_rm = False
+        # Unquoted `for raw_token in $rm_stmt` under `set -f`: IFS splitting.
+        for raw_token in re.split("[ \t\n]+", statement):
+            if not raw_token:
+                continue
+            token = strip_subst_wrappers(raw_token)
+            if not seen_rm:
+                seen_rm = token == "rm" or token.endswith("/rm")
+                continue
+            reason = rm_token_reason(token, context)
+            if reason is not None:
+                return reason
+    return None
+
+
+def push_guard(text: Text, context: Context) -> str | None:
+    """Guard 2: force-pushing a protected branch, per `git push` statement."""
+    for statement in text.statements:
+        if (
+            line_matches(PUSH_STATEMENT, statement)
+            and line_matches(PUSH_FORCE, statement)
+            and not line_matches(PUSH_LEASE, statement)
+            and line_matches(PUSH_PROTECTED, statement)
+        ):
+            return (
+                "force-pushing a protected branch (use --force-with-lease, "
+                "or push a feature branch)"
+            )
+    return None
+
+
+def git(*args: str) -> subprocess.CompletedProcess[bytes]:
+    """Run git as the shell guard would, with 127 standing in for "no git"."""
+    try:
+        return subprocess.run(
+            ["git", *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except OSError:
+        return subprocess.CompletedProcess(["git", *args], 127, b"")
+
+
+def git_output(*args: str) -> str:
+    """``"$(git … 2>/dev/null)"``: stdout minus trailing newlines, even on failure."""
+    return os.fsdecode(git(*args).stdout).rstrip("\n")
+
+
+def reset_guard(text: Text, context: Context) -> str | None:
+    """Guard 3: `git reset --hard/--merge` on a dirty working tree."""
+    if not text.matches(RESET_DISCARD):
+        return None
+    if git("rev-parse", "--is-inside-work-tree").returncode == 0 and git_output(
+        "status", "--porcelain"
+    ):
+        return (
+            "git reset --hard/--merge on a dirty working tree would discard "
+            "uncommitted changes (stash or commit first)"
+        )
+    return None
+
+
+def rebase_guard(text: Text, context: Context) -> str | None:
+    """Guard 3b: `git rebase --abort/--quit` over human conflict resolutions."""
+    if not text.matches(REBASE_ABORT):
+        return None
+    apply_dir = git_output("rev-parse", "--git-path", "rebase-apply")
+    merge_dir = git_output("rev-parse", "--git-path", "rebase-merge")
+    if apply_dir and os.path.isdir(apply_dir):
+        return (
+            "git rebase --abort/--quit on an apply-backend rebase cannot prove no "
+            "conflict resolutions would be lost (fail closed; finish or continue "
+            "the rebase instead)"
+        )
+    if merge_dir and os.path.isdir(merge_dir):
+        if git("rev-parse", "-q", "--verify", "AUTO_MERGE").returncode != 0:
+            return (
+                "git rebase --abort/--quit with an unresolvable AUTO_MERGE ref "
+                "cannot prove no conflict resolutions would be lost (fail closed)"
+            )
+        if git("diff", "--quiet", "AUTO_MERGE").returncode != 0:
+            return (
+                "git rebase --abort/--quit would discard conflict resolutions in "
+                "the working tree (finish resolving and run git rebase --continue "
+                "instead)"
+            )
+        if (
+            not git_output("ls-files", "-u")
+            and git("diff", "--cached", "--quiet", "AUTO_MERGE").returncode != 0
+        ):
+            return (
+                "git rebase --abort/--quit would discard staged conflict "
+                "resolutions (finish resolving and run git rebase --continue "
+                "instead)"
+            )
+    return None
+
+
+CHECKOUT_DISCARD = (
+    ere(GIT_CHECKOUT + GIT_TOKENS + "--([[:space:]]|$)"),
+    ere(
+        GIT_CHECKOUT
+        + GIT_TOKENS
+        + "(-[[:alnum:]]*f[[:alnum:]]*|--force)([[:space:]]|=|$)"
+    ),
+    ere(GIT_CHECKOUT + "[[:space:]][^;&|]*--pathspec-from-file"),
+    ere(GIT_CHECKOUT + "[[:space:]]+\\.(/)?([[:space:]]|$)"),
+)
+SWITCH_DISCARD = ere(
+    GIT_CMD + "switch" + GIT_TOKENS + "(--discard-changes|--force|-f)([[:space:]]|=|$)"
+)
+RESTORE = ere(GIT_CMD + "restore([[:space:]]|$)")
+RESTORE_WORKTREE = ere(GIT_CMD + "restore[^;&|]*--worktree")
+RESTORE_STAGED = ere(GIT_CMD + "restore[^;&|]*--staged")
+STASH_DESTROY = ere(GIT_CMD + "stash[[:space:]]+(drop|clear)([[:space:]]|$)")
+CLEAN_FORCE = ere(
+    GIT_CLEAN + GIT_TOKENS + "(-[[:alnum:]]*f[[:alnum:]]*|--force)([[:space:]]|=|$)"
+)
+CLEAN_DRY_RUN = ere(
+    GIT_CLEAN + GIT_TOKENS + "(-[[:alnum:]]*n[[:alnum:]]*|--dry-run)([[:space:]]|=|$)"
+)
+BRANCH_FORCE_DELETE = ere(
+    GIT_BRANCH + GIT_TOKENS + "-[[:alnum:]]*D[[:alnum:]]*([[:space:]]|$)",
+    ignore_case=False,
+)
+BRANCH_DELETE_FLAG = ere(
+    GIT_BRANCH + GIT_TOKENS + "-[[:alnum:]]*d[[:alnum:]]*([[:space:]]|$)",
+    ignore_case=False,
+)
+BRANCH_FORCE_FLAG = ere(
+    GIT_BRANCH + GIT_TOKENS + "-[[:alnum:]]*f[[:alnum:]]*([[:space:]]|$)",
+    ignore_case=False,
+)
+BRANCH_DELETE_LONG = ere(GIT_BRANCH + "[^;&|]*--delete")
+BRANCH_FORCE_LONG = ere(GIT_BRANCH + "[^;&|]*--force")
+TAG_DELETE = ere(
+    GIT_CMD
+    + "tag"
+    + GIT_TOKENS
+    + "(-[[:alnum:]]*d[[:alnum:]]*([[:space:]]|$)|--delete([[:space:]]|=|$))",
+    ignore_case=False,
+)
+REFLOG_DELETE = ere(GIT_CMD + "reflog[[:space:]]+delete([[:space:]]|$)")
+WORKTREE_FORCE_REMOVE = ere(
+    GIT_CMD
+    + "worktree[[:space:]]+remove[^;&|]*(--force([[:space:]]|=|$)"
+    "|[[:space:]]-[[:alnum:]]*f[[:alnum:]]*([[:space:]]|$))"
+)
+FIND_DELETE = ere(
+    "(^|[^[:alnum:]_./-])find[[:space:]][^;&|]*[[:space:]]-delete([[:space:]]|$)"
+)
+FIND_EXEC_RM_RF = ere(
+    "(^|[^[:alnum:]_./-])find[[:space:]][^;&|]*-exec[[:space:]]+rm[[:space:]]+"
+    "(-[[:alnum:]]*r[[:alnum:]]*f|-[[:alnum:]]*f[[:alnum:]]*r)([[:space:]]|$)"
+)
+XARGS_RM_RF = ere(
+    "(^|[^[:alnum:]_./-])xargs[[:space:]]([^;&|]*[[:space:]])?rm[[:space:]]+"
+    "(-[[:alnum:]]*r[[:alnum:]]*f|-[[:alnum:]]*f[[:alnum:]]*r)([[:space:]]|$)"
+)
+DD_DEVICE = ere("(^|[^[:alnum:]_./-])dd[[:space:]]+([^;&|]*[[:space:]])?of=/dev/")
+MKFS_DEVICE = ere("(^|[^[:alnum:]_./-])mkfs(\\.[[:alnum:]]+)?[[:space:]][^;&|]*/dev/")
+SHRED = ere("(^|[^[:alnum:]_./-])shred([[:space:]]|$)")
+DESTRUCTIVE_SQL = ere(
+    "\\b(drop[[:space:]]+(database|schema|table)|truncate[[:space:]]+"
+    '(table[[:space:]]+)?[[:alnum:]_."`]+)\\b'
+)
+
+Guard = Callable[[Text, Context], "str | None"]
+
+
+def pattern_guard(reason: str, fires: Callable[[Text], bool]) -> Guard:
+    """A guard decided by the command text alone."""
+
+    def guard(text: Text, context: Context) -> str | None:
+        return reason if fires(text) else None
+
+    return guard
+
+
+# The built-in guards 1-13, in the shell's order: the first reason wins.
+GUARDS: tuple[Guard, ...] = (
+    rm_guard,
+    push_guard,
+    reset_guard,
+    rebase_guard,
+    pattern_guard(
+        "git checkout discarding local changes (--, -f/--force, "
+        "--pathspec-from-file, or bare .) — use git stash to preserve work first",
+        lambda text: any(text.matches(pattern) for pattern in CHECKOUT_DISCARD),
+    ),
+    pattern_guard(
+        "git switch discarding local changes (--discard-changes/-f/--force)",
+        lambda text: text.matches(SWITCH_DISCARD),
+    ),
+    pattern_guard(
+        "git restore overwriting worktree files (only 'git restore --staged "
+        "<path>' without --worktree is allowed)",
+        lambda text: text.matches(RESTORE)
+        and (text.matches(RESTORE_WORKTREE) or not text.matches(RESTORE_STAGED)),
+    ),
+    pattern_guard(
+        "git stash drop/clear destroys stashed work",
+        lambda text: text.matches(STASH_DESTROY),
+    ),
+    pattern_guard(
+        "git clean --force deletes untracked files (preview with git clean -n first)",
+        lambda text: text.matches(CLEAN_FORCE) and not text.matches(CLEAN_DRY_RUN),
+    ),
+    pattern_guard(
+        "git branch force-delete (-D) loses unmerged commits (use -d, which "
+        "refuses unmerged work)",
+        lambda text: text.matches(BRANCH_FORCE_DELETE)
+        or (text.matches(BRANCH_DELETE_FLAG) and text.matches(BRANCH_FORCE_FLAG))
+        or (text.matches(BRANCH_DELETE_LONG) and text.matches(BRANCH_FORCE_LONG)),
+    ),
+    pattern_guard(
+        "git tag -d deletes a shared ref",
+        lambda text: text.matches(TAG_DELETE),
+    ),
+    pattern_guard(
+        "git reflog delete erases recovery history",
+        lambda text: text.matches(REFLOG_DELETE),
+    ),
+    pattern_guard(
+        "git worktree remove --force discards a dirty worktree (remove without "
+        "--force, which refuses dirty trees)",
+        lambda text: text.matches(WORKTREE_FORCE_REMOVE),
+    ),
+    pattern_guard(
+        "find -delete removes files tree-wide (use -print to preview, or an "
+        "explicit rm on reviewed paths)",
+        lambda text: text.matches(FIND_DELETE),
+    ),
+    pattern_guard(
+        "find -exec rm -rf performs a recursive forced delete on unreviewed paths",
+        lambda text: text.matches(FIND_EXEC_RM_RF),
+    ),
+    pattern_guard(
+        "xargs rm -rf performs a recursive forced delete on dynamic stdin input",
+        lambda text: text.matches(XARGS_RM_RF),
+    ),
+    pattern_guard(
+        "dd writing to a raw device (of=/dev/…) destroys it",
+        lambda text: text.matches(DD_DEVICE),
+    ),
+    pattern_guard(
+        "mkfs formatting a device erases it",
+        lambda text: text.matches(MKFS_DEVICE),
+    ),
+    pattern_guard(
+        "shred overwrites files unrecoverably",
+        lambda text: text.matches(SHRED),
+    ),
+    pattern_guard(
+        "destructive SQL (DROP/TRUNCATE) detected",
+        lambda text: text.matches(DESTRUCTIVE_SQL),
+    ),
+)
+
+
+def first_block(command: str, context: Context) -> str | None:
+    """The reason of the first built-in guard that blocks ``command``, if any."""
+    text = Text(command)
+    for guard in GUARDS:
+        reason = guard(text, context)
+        if reason is not None:
+            return reason
+    return None
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        return DEFER
+    command = sys.stdin.buffer.read().decode("utf-8", "surrogateescape")
+    if len(command) > SIZE_LIMIT or not command.isascii():
+        return DEFER
+    reason = first_block(command, Context(project_dir=argv[0], tmp_dir_allow=argv[1]))
+    if reason is None:
+        return ALLOW
+    sys.stdout.buffer.write(reason.encode("utf-8"))
+    return BLOCK
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
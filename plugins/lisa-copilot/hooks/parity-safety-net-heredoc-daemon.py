@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Opt-in long-lived server for the parity-safety-net heredoc classifier.
+
+Every heredoc command costs ``parity-safety-net.sh`` a fresh ``python3``, and on
+a busy agent host interpreter startup outweighs the classification itself. This
+daemon keeps ONE interpreter resident behind a per-user Unix socket and answers
+with exactly the verdict ``parity-safety-net-heredoc.py`` would have exited with
+— SAFE(0), UNSUPPORTED(10) or MALFORMED(20), from ``checked_classify``'s
+``bash -n`` check and rules — by importing that file rather than re-implementing
+any of it.
+
+It is strictly an accelerator. The hook consults it only when
+``LISA_SAFETY_NET_DAEMON=1``, and a missing socket, refused connection, protocol
+mismatch, timeout or unreadable reply drops the hook back to the one-shot
+process, which fails closed exactly as before. The daemon can make a verdict
+cheaper; it can never make one different.
+
+Wire format, one request per connection. The client sends the header line
+``lisa-heredoc/1 <absolute classifier path>`` followed by the raw command, then
+half-closes; the daemon replies ``<status>\\n<sanitized text>`` and closes. The
+path in the header is what makes a socket shared by two installs safe: the
+daemon answers only for the classifier file it was started beside (compared
+after resolving symlinks), and only while that file is still the one it loaded
+(same mtime and size). A plugin upgrade therefore retires the old daemon on its
+first request instead of classifying with the previous version's rules. Every
+refusal is answered with silence, which the client reads as "fall back" — as is
+a command over the classifier's intake ceiling, which the daemon stops buffering
+at that ceiling just as the one-shot process does.
+
+Start it by hand (or from a login script):
+
+    python3 parity-safety-net-heredoc-daemon.py [--socket PATH] [--idle-timeout S]
+
+It exits on its own after ``--idle-timeout`` seconds without a request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import socket
+import socketserver
+import sys
+from types import ModuleType
+
+PROTOCOL = "lisa-heredoc/1"
+REQUEST_TIMEOUT = 2.0
+IDLE_TIMEOUT = 3600.0
+MAX_HEADER = 4096
+CLASSIFIER = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "parity-safety-net-heredoc.py"
+)
+
+
+def default_socket_path() -> str:
+    """The per-user socket both the hook and the daemon derive by default.
+
+    ``$LISA_SAFETY_NET_DAEMON_SOCKET`` wins; otherwise ``$XDG_RUNTIME_DIR``
+    (already per-user and private on systemd hosts), else ``$TMPDIR``, else
+    ``/tmp`` — always inside a ``lisa-safety-net-<uid>`` directory this daemon
+    creates 0700. Keep in lockstep with the derivation in parity-safety-net.sh.
+    """
+    override = os.environ.get("LISA_SAFETY_NET_DAEMON_SOCKET")
+    if override:
+        return override
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or ""
+    runtime = runtime.rstrip("/") or "/tmp"
+    return f"{runtime}/lisa-safety-net-{os.getuid()}/heredoc.sock"
+
+
+def source_identity(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_classifier(path: str) -> ModuleType:
+    """Import the hyphen-named classifier file as a module."""
+    spec = importlib.util.spec_from_file_location("parity_safety_net_heredoc", path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"cannot load classifier from {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Registered before execution: @dataclass resolves the defining module
+    # through sys.modules while the class body runs.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def ensure_private_dir(socket_path: str) -> None:
+    """Create (or verify) the socket directory as ours and 0700.
+
+    A socket in a directory another user can write is a socket another user can
+    replace, and a replaced daemon could answer SAFE for anything. Refuse to
+    serve rather than trust such a directory.
+    """
+    directory = os.path.dirname(socket_path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    stat = os.stat(directory)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        raise SystemExit(
+            f"refusing to serve: {directory} must be owned by uid {os.getuid()} "
+            "and closed to group and others (chmod 700)"
+        )
+
+
+def clear_stale_socket(socket_path: str) -> None:
+    """Unlink a socket file nothing answers on; refuse if a daemon still does."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise SystemExit(f"a classifier daemon is already listening on {socket_path}")
+
+
+class ClassifierServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, idle_timeout: float) -> None:
+        self.classifier = load_classifier(CLASSIFIER)
+        self.identity = source_identity(CLASSIFIER)
+        self.timeout = idle_timeout
+        self.stopping = False
+        super().__init__(socket_path, ClassifierHandler)
+        os.chmod(socket_path, 0o600)
+
+    def handle_timeout(self) -> None:
+        self.stopping = True
+
+
+class ClassifierHandler(socketserver.StreamRequestHandler):
+    server: ClassifierServer
+
+    def handle(self) -> None:
+        server = self.server
+        self.connection.settimeout(REQUEST_TIMEOUT)
+        try:
+            header = self.rfile.readline(MAX_HEADER).decode("utf-8")
+            protocol, _, path = header.rstrip("\n").partition(" ")
+            if protocol != PROTOCOL or os.path.realpath(path) != CLASSIFIER:
+                return
+            try:
+                current = source_identity(CLASSIFIER)
+            except OSError:
+                current = None
+            if current != server.identity:
+                # The file on disk is no longer the code in memory: stay silent
+                # so this request falls back, and retire.
+                server.stopping = True
+                return
+            # The one-shot classifier's intake ceiling, applied while reading.
+            # Over it, stay silent: the client falls back to the one-shot
+            # process, which answers MALFORMED as it always has.
+            intake = io.TextIOWrapper(self.rfile, encoding="utf-8", newline="")
+            command = server.classifier.read_command(intake, server.classifier.work_budget())
+            intake.detach()
+        except (OSError, UnicodeDecodeError):
+            return
+        if command is None:
+            return
+        status, output = server.classifier.checked_classify(command)
+        self.wfile.write(f"{status}\n{output}".encode("utf-8"))
+
+
+def serve(socket_path: str, idle_timeout: float) -> int:
+    ensure_private_dir(socket_path)
+    clear_stale_socket(socket_path)
+    server = ClassifierServer(socket_path, idle_timeout)
+    inode = os.stat(socket_path).st_ino
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        # Only remove the socket if it is still ours — a successor may already
+        # have bound a fresh one at the same path.
+        with contextlib.suppress(OSError):
+            if os.stat(socket_path).st_ino == inode:
+                os.unlink(socket_path)
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix socket path (default: per-user runtime directory).",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=IDLE_TIMEOUT,
+        help="Exit after this many seconds without a request.",
+    )
+    args = parser.parse_args(argv)
+    return serve(args.socket or default_socket_path(), args.idle_timeout)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
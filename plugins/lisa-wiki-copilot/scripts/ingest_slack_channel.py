@@ -9,51 +9,100 @@ access follows the authorizing user's Slack visibility.
 from __future__ import annotations
 
 import argparse
+import copy
 import datetime as dt
+import fnmatch
+import gzip
+import hashlib
+import http.client
+import itertools
 import json
 import os
+import queue
+import random
 import re
+import shutil
+import ssl
+import sys
+import tempfile
+import threading
 import time
 import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, so no peak-memory statistic.
+    resource = None  # type: ignore[assignment]
 
+
+# Secrets scrubbed from everything the connector writes: (label, pattern,
+# replacement), applied in this order, each pass over the previous one's output.
+# A pattern with a ``<label>_value`` group redacts only that group and keeps the
+# key, separator and quotes around it. Order matters: a private key is redacted
+# before ``password:``/``api_key:`` can claim its ``-----BEGIN`` line as a value.
+# ``scripts/bench-slack-redaction.py`` measures throughput against running every
+# pass on every text.
 TOKEN_PATTERNS = [
-    (re.compile(r"xox[pbar]-[A-Za-z0-9-]+"), "[REDACTED:OAUTH_TOKEN]"),
-    (
-        re.compile(r"(?i)bearer\s+[A-Za-z0-9._~+/=-]{20,}"),
-        "[REDACTED:OAUTH_TOKEN]",
-    ),
-    (re.compile(r"AKIA[0-9A-Z]{16}"), "[REDACTED:API_KEY]"),
+    ("oauth", r"xox[pbar]-[A-Za-z0-9-]+", "[REDACTED:OAUTH_TOKEN]"),
+    ("bearer", r"(?i)bearer\s+[A-Za-z0-9._~+/=-]{20,}", "[REDACTED:OAUTH_TOKEN]"),
+    ("aws", r"AKIA[0-9A-Z]{16}", "[REDACTED:API_KEY]"),
     (
-        re.compile(
-            r"-----BEGIN [A-Z ]*PRIVATE KEY-----.*?-----END [A-Z ]*PRIVATE KEY-----",
-            re.S,
-        ),
+        "private_key",
+        r"-----BEGIN [A-Z ]*PRIVATE KEY-----(?s:.*?)-----END [A-Z ]*PRIVATE KEY-----",
         "[REDACTED:PRIVATE_KEY]",
     ),
+    ("ssn", r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b", "[REDACTED:SSN]"),
     (
-        re.compile(r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b"),
-        "[REDACTED:SSN]",
-    ),
-    (
-        re.compile(
-            r"\b(?:password|passwd|pwd)\s*[:=]\s*(['\"]?)([^\s'\",;]{8,})\1",
-            re.I,
-        ),
+        "password",
+        r"(?i)\b(?:password|passwd|pwd)\s*[:=]\s*(?P<password_quote>['\"]?)(?P<password_value>[^\s'\",;]{8,})(?P=password_quote)",
         "[REDACTED:PASSWORD]",
     ),
     (
-        re.compile(
-            r"\b(?:api[_-]?key|access[_-]?key|secret[_-]?key|client[_-]?secret)\s*[:=]\s*(['\"]?)([A-Za-z0-9._-]{20,})\1",
-            re.I,
-        ),
+        "api_key",
+        r"(?i)\b(?:api[_-]?key|access[_-]?key|secret[_-]?key|client[_-]?secret)\s*[:=]\s*(?P<api_key_quote>['\"]?)(?P<api_key_value>[A-Za-z0-9._-]{20,})(?P=api_key_quote)",
         "[REDACTED:API_KEY]",
     ),
 ]
+REDACTION_PASSES = [(label, re.compile(pattern), replacement) for label, pattern, replacement in TOKEN_PATTERNS]
+PRIVATE_KEY_BEGIN = re.compile(r"-----BEGIN [A-Z ]*PRIVATE KEY-----")
+PRIVATE_KEY_END = re.compile(r"-----END [A-Z ]*PRIVATE KEY-----")
+
+# A pass is skipped when the text cannot match it: every pattern needs one of
+# its literals here or, for SSNs, a digit-dash-digit shape. Most message text
+# holds none, so it is returned without running any pattern. Literals are
+# looked up in the casefolded text, not the lowercased one: ``(?i)`` also
+# matches ``ſ`` as ``s`` and the Kelvin sign as ``k``, and only casefold folds
+# them the same way.
+REDACTION_TRIGGERS = {
+    "oauth": ("xox",),
+    "bearer": ("bearer",),
+    "aws": ("akia",),
+    "private_key": ("-----begin ",),
+    "password": ("pass", "pwd"),
+    "api_key": ("key", "secret"),
+}
+SSN_SHAPE = re.compile(r"\d-\d")
+ANY_TRIGGER = re.compile("|".join(re.escape(trigger) for triggers in REDACTION_TRIGGERS.values() for trigger in triggers) + r"|\d-\d")
+
+
+DEFAULT_API_BASE = "https://slack.com/api"
+
+# Slack's published per-method rate-limit tiers, in calls per minute. Methods not
+# listed here are paced as Tier 3.
+TIER_CALLS_PER_MINUTE = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    "auth.test": 4,
+    "conversations.history": 3,
+    "conversations.info": 3,
+    "conversations.list": 2,
+    "conversations.replies": 3,
+    "users.info": 4,
+    "users.list": 2,
+}
 
 
 def utc_now() -> dt.datetime:
@@ -74,16 +123,66 @@ def ts_from_input(value: str | None) -> str | None:
     return f"{parsed.timestamp():.6f}"
 
 
+def peak_rss_mb() -> float | None:
+    """This process's peak resident set size so far, in MB (None on Windows)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def lap(phases: dict[str, float], phase: str, since: float) -> float:
+    """Charge the time since ``since`` to ``phase`` and return the new mark."""
+    now = time.perf_counter()
+    phases[phase] += now - since
+    return now
+
+
+def may_match(label: str, text: str, folded: str) -> bool:
+    if label == "ssn":
+        return SSN_SHAPE.search(text) is not None
+    return any(trigger in folded for trigger in REDACTION_TRIGGERS[label])
+
+
 def redact(text: str) -> str:
-    out = text
-    for pattern, replacement in TOKEN_PATTERNS:
-        out = pattern.sub(
-            lambda match: match.group(0).replace(match.group(2), replacement)
-            if len(match.groups()) >= 2
-            else replacement,
-            out,
-        )
-    return out
+    folded = text.casefold()
+    if ANY_TRIGGER.search(folded) is None:
+        return text
+    for label, pattern, replacement in REDACTION_PASSES:
+        if not may_match(label, text, folded):
+            continue
+        value = f"{label}_value"
+        if value in pattern.groupindex:
+            redacted = pattern.sub(lambda match: match.group(0).replace(match.group(value), replacement), text)
+        else:
+            redacted = pattern.sub(replacement, text)
+        if redacted != text:
+            text, folded = redacted, redacted.casefold()
+    return text
+
+
+def open_private_key(text: str) -> int:
+    """Offset of a ``-----BEGIN … PRIVATE KEY-----`` whose END has not arrived yet, else -1."""
+    position = 0
+    while begin := PRIVATE_KEY_BEGIN.search(text, position):
+        end = PRIVATE_KEY_END.search(text, begin.end())
+        if end is None:
+            return begin.start()
+        position = end.end()
+    return -1
+
+
+def tier_rate(value: str) -> tuple[int, int]:
+    """Parse ``--tier-rate TIER=CALLS_PER_MINUTE``."""
+    tier, _, rate = value.partition("=")
+    try:
+        parsed = int(tier), int(rate)
+    except ValueError:
+        parsed = (0, 0)
+    if parsed[0] not in TIER_CALLS_PER_MINUTE or parsed[1] < 1:
+        raise argparse.ArgumentTypeError(f"expected TIER=CALLS_PER_MINUTE with TIER 1-4, got {value!r}")
+    return parsed
 
 
 def load_token(args: argparse.Namespace) -> str:
@@ -100,43 +199,275 @@ def load_token(args: argparse.Namespace) -> str:
     raise SystemExit("Provide --token, --token-file, or SLACK_USER_TOKEN.")
 
 
+class TokenBucket:
+    """One Slack rate-limit tier: ``burst`` calls at once, refilled at ``per_minute``.
+
+    Callers reserve tokens ahead of time, so the balance can go negative: that
+    debt is how many calls are already queued for the tier.
+    """
+
+    def __init__(self, per_minute: int, burst: int) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.resume_at = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take the next token and return how many seconds until it is due."""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        self.tokens -= 1
+        due = self.updated + max(0.0, -self.tokens) / self.rate
+        return max(0.0, due - now)
+
+    def pause(self, now: float, seconds: float) -> None:
+        """Hold the whole tier for a 429's ``Retry-After``, then refill from empty."""
+        self.resume_at = max(self.resume_at, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, self.resume_at)
+
+
+class RateLimiter:
+    """Paces every call through its method tier's token bucket; shared by every worker thread."""
+
+    def __init__(self, calls_per_minute: dict[int, int] | None = None) -> None:
+        rates = {**TIER_CALLS_PER_MINUTE, **(calls_per_minute or {})}
+        # Ten seconds' worth of calls may go out at once, as Slack tolerates short bursts.
+        self.buckets = {tier: TokenBucket(rate, max(1, rate // 6)) for tier, rate in rates.items()}
+        self.lock = threading.Lock()
+
+    def bucket(self, method: str) -> TokenBucket:
+        return self.buckets[METHOD_TIERS.get(method, 3)]
+
+    def acquire(self, method: str) -> float:
+        """Block until ``method`` may be called; return the seconds spent waiting."""
+        bucket = self.bucket(method)
+        with self.lock:
+            wait = bucket.reserve(time.monotonic())
+        waited = 0.0
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            # A 429 that arrived while this call slept holds it too.
+            with self.lock:
+                wait = bucket.resume_at - time.monotonic()
+        return waited
+
+    def pause(self, method: str, seconds: float) -> None:
+        with self.lock:
+            self.bucket(method).pause(time.monotonic(), seconds)
+
+
+class ConnectionPool:
+    """Keep-alive connections to one Slack API host, reused across calls and threads.
+
+    Each call checks a connection out for its whole exchange, so threads never
+    share one mid-request; at most ``max_idle`` are kept between calls.
+    """
+
+    # What a server closing an idle keep-alive connection looks like to the next
+    # request sent on it.
+    RESET_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, base_url: str, max_idle: int = 8, timeout: float = 60) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise SystemExit(f"Slack API base must be an http(s) URL, got {base_url!r}.")
+        self.base_url = base_url.rstrip("/")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.context = ssl.create_default_context() if parts.scheme == "https" else None
+        self.idle: list[http.client.HTTPConnection] = []
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self.lock:
+            if self.idle:
+                return self.idle.pop(), True
+            self.opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.netloc, timeout=self.timeout, context=self.context), False
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout), False
+
+    def checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+    def post(self, path: str, body: bytes, headers: dict[str, str]) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        """POST ``body`` to ``path``: ``(status, reason, headers, raw body)``."""
+        return self.request("POST", path, body, headers)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        sink: Callable[[bytes], None] | None = None,
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        """One exchange on a pooled connection: ``(status, reason, headers, raw body)``.
+
+        With ``sink``, a 200's body is streamed to it a chunk at a time instead
+        of returned; an exception from ``sink`` drops the connection. A reset on
+        a reused connection means the server dropped it while idle, so the
+        request is replayed on the next connection (Slack's read methods and file
+        downloads are safe to repeat) unless part of the body already went to
+        ``sink``. A reset on a fresh connection is a real network error.
+        """
+        while True:
+            connection, reused = self.checkout()
+            streamed = False
+            try:
+                connection.request(method, self.prefix + path, body=body, headers=headers)
+                response = connection.getresponse()
+                if sink is None or response.status != 200:
+                    data = response.read()
+                else:
+                    data = b""
+                    while chunk := response.read(65536):
+                        streamed = True
+                        sink(chunk)
+            except self.RESET_ERRORS:
+                connection.close()
+                if reused and not streamed:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self.checkin(connection)
+            return response.status, response.reason, response.headers, data
+
+
 class SlackClient:
-    def __init__(self, token: str) -> None:
+    # Exponential backoff with full jitter for 5xx and network errors: attempt
+    # ``n`` waits a uniform random time up to ``BACKOFF_BASE * 2**n`` seconds.
+    BACKOFF_BASE = 1.0
+    BACKOFF_CAP = 30.0
+
+    def __init__(self, token: str, limiter: RateLimiter | None = None, api_base: str = DEFAULT_API_BASE) -> None:
         self.token = token
+        self.limiter = limiter or RateLimiter()
+        self.pool = ConnectionPool(api_base)
+        self.parent: SlackClient | None = None
+        self.reset_stats()
 
-    def call(self, method: str, params: dict[str, Any] | None = None, retries: int = 5) -> dict[str, Any]:
-        params = params or {}
+    def reset_stats(self) -> None:
+        self.stats_lock = threading.Lock()
+        # calls and methods: every attempt, retries included, in total and per method.
+        # bytes_received: response bodies as sent on the wire (gzipped).
+        # throttled_seconds: waiting on the rate limiter, including Retry-After holds.
+        # rate_limited_seconds: the Retry-After totals Slack asked for.
+        # backoff_seconds: jittered waits before retrying a 5xx or network error.
+        self.stats: dict[str, Any] = {
+            "calls": 0,
+            "methods": {},
+            "bytes_received": 0,
+            "throttled_seconds": 0.0,
+            "rate_limited": 0,
+            "rate_limited_seconds": 0.0,
+            "retries": 0,
+            "backoff_seconds": 0.0,
+        }
+
+    def fork(self) -> SlackClient:
+        """A client sharing this one's rate limiter and connections but keeping its own stats.
+
+        Each channel ingests through a fork so its proposed cursor reports only
+        its own calls; everything a fork records is added to its parent too.
+        """
+        child = copy.copy(self)
+        child.parent = self
+        child.reset_stats()
+        return child
+
+    def record(self, method: str | None = None, **amounts: float) -> None:
+        with self.stats_lock:
+            if method:
+                self.stats["methods"][method] = self.stats["methods"].get(method, 0) + 1
+            for key, amount in amounts.items():
+                self.stats[key] += amount
+        if self.parent is not None:
+            self.parent.record(method, **amounts)
+
+    def send(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        """One HTTP exchange with the Slack Web API, without pacing or retries."""
         body = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None}).encode("utf-8")
-        request = urllib.request.Request(
-            f"https://slack.com/api/{method}",
-            data=body,
-            headers={
+        status, reason, headers, data = self.pool.post(
+            f"/{method}",
+            body,
+            {
                 "Authorization": f"Bearer {self.token}",
                 "Content-Type": "application/x-www-form-urlencoded",
                 "Accept": "application/json",
+                "Accept-Encoding": "gzip",
             },
-            method="POST",
         )
-        try:
-            with urllib.request.urlopen(request, timeout=60) as response:
-                payload = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as error:
-            if error.code == 429 and retries > 0:
-                retry_after = int(error.headers.get("Retry-After", "60"))
-                time.sleep(retry_after)
-                return self.call(method, params, retries - 1)
-            raise
+        self.record(bytes_received=len(data))
+        if headers.get("Content-Encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        if status >= 400:
+            # Raised as urllib's HTTPError so ``call`` can tell 429 and 5xx apart.
+            raise urllib.error.HTTPError(f"{self.pool.base_url}/{method}", status, reason, headers, None)
+        return json.loads(data.decode("utf-8"))
+
+    def call(self, method: str, params: dict[str, Any] | None = None, retries: int = 5) -> dict[str, Any]:
+        params = params or {}
+        attempt = 0
+        while True:
+            self.record(method, calls=1, throttled_seconds=self.limiter.acquire(method))
+            try:
+                payload = self.send(method, params)
+                break
+            except urllib.error.HTTPError as error:
+                if attempt >= retries or not (error.code == 429 or error.code >= 500):
+                    raise
+                if error.code == 429:
+                    retry_after = float(error.headers.get("Retry-After", "60"))
+                    self.limiter.pause(method, retry_after)
+                    self.record(rate_limited=1, rate_limited_seconds=retry_after, retries=1)
+                else:
+                    self.backoff(attempt)
+            except (http.client.HTTPException, OSError):
+                # OSError covers refused and reset connections, timeouts and URLError.
+                if attempt >= retries:
+                    raise
+                self.backoff(attempt)
+            attempt += 1
         if not payload.get("ok"):
             raise RuntimeError(f"Slack API {method} failed: {payload}")
         return payload
 
+    def backoff(self, attempt: int) -> None:
+        delay = random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2**attempt))
+        self.record(retries=1, backoff_seconds=delay)
+        time.sleep(delay)
+
+
+CHANNEL_ID = re.compile(r"[CGD][A-Z0-9]+")
+# ``--channels`` selector for every channel the authorizing user belongs to.
+ALL_MEMBER = "all-member"
 
-def resolve_channel(client: SlackClient, channel: str) -> dict[str, Any]:
-    if re.fullmatch(r"[CGD][A-Z0-9]+", channel):
-        info = client.call("conversations.info", {"channel": channel})
-        return info["channel"]
 
-    wanted = channel.lstrip("#")
+def list_channels(client: SlackClient) -> Iterator[dict[str, Any]]:
     cursor = None
     while True:
         payload = client.call(
@@ -148,26 +479,135 @@ def resolve_channel(client: SlackClient, channel: str) -> dict[str, Any]:
                 "cursor": cursor,
             },
         )
-        for item in payload.get("channels", []):
-            if item.get("name") == wanted:
-                return item
+        yield from payload.get("channels", [])
         cursor = (payload.get("response_metadata") or {}).get("next_cursor")
         if not cursor:
             break
-    raise SystemExit(f"Could not resolve Slack channel {channel!r}.")
 
 
-def fetch_history(
+def user_display_name(user: dict[str, Any]) -> str:
+    profile = user.get("profile") or {}
+    return profile.get("display_name") or profile.get("real_name") or user.get("real_name") or user.get("name") or user["id"]
+
+
+class DirectoryCache:
+    """Slack's channel and user directories, kept under the state dir between runs.
+
+    ``conversations.list`` and ``users.list`` are paged in full at most once per
+    ``ttl_seconds``; in between, a channel name or user ID resolves from memory
+    without a call. The cache is TTL-only: Slack returns no ETag or change marker
+    for either listing, so there is nothing cheaper to revalidate against than
+    listing again. A channel name missing from a fresh cache forces one refresh
+    per run, since the channel may be newer than the cache.
+    With no ``path`` the directories live for one run only.
+    """
+
+    def __init__(self, path: Path | None, ttl_seconds: float) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.data: dict[str, Any] = {}
+        if path is not None and path.exists():
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.data = {}
+        self.refreshed: set[str] = set()
+        self.lock = threading.Lock()
+
+    def fresh(self, section: str) -> bool:
+        entry = self.data.get(section) or {}
+        try:
+            validated = dt.datetime.fromisoformat(entry["validated_at"].replace("Z", "+00:00"))
+        except (KeyError, AttributeError, ValueError):
+            return False
+        return (utc_now() - validated).total_seconds() < self.ttl_seconds
+
+    def store(self, section: str, entries: Any) -> None:
+        self.data[section] = {"validated_at": utc_now().isoformat().replace("+00:00", "Z"), "entries": entries}
+        self.refreshed.add(section)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f".{self.path.name}.part")
+            partial.write_text(json.dumps(self.data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(partial, self.path)
+
+    def channels(self, client: SlackClient, refresh: bool = False) -> list[dict[str, Any]]:
+        with self.lock:
+            if refresh or not self.fresh("channels"):
+                keep = ("id", "name", "created", "is_member", "is_private", "is_archived")
+                self.store("channels", [{key: item.get(key) for key in keep} for item in list_channels(client)])
+            return self.data["channels"]["entries"]
+
+    def users(self, client: SlackClient) -> dict[str, str]:
+        with self.lock:
+            if not self.fresh("users"):
+                directory: dict[str, str] = {}
+                cursor = None
+                while True:
+                    payload = client.call("users.list", {"limit": 200, "cursor": cursor})
+                    directory.update({user["id"]: user_display_name(user) for user in payload.get("members", [])})
+                    cursor = (payload.get("response_metadata") or {}).get("next_cursor")
+                    if not cursor:
+                        break
+                self.store("users", directory)
+            return self.data["users"]["entries"]
+
+
+def resolve_channel(client: SlackClient, channel: str, directory: DirectoryCache) -> dict[str, Any]:
+    return resolve_channels(client, [channel], directory)[0]
+
+
+def resolve_channels(client: SlackClient, selectors: list[str], directory: DirectoryCache) -> list[dict[str, Any]]:
+    """Resolve IDs, ``#names``, name globs and ``all-member`` against the channel directory.
+
+    Channels come back in selector order, each once. IDs the directory does not
+    hold cost a ``conversations.info``; nothing else needs a call while the
+    directory cache is fresh.
+    """
+    if all(CHANNEL_ID.fullmatch(selector) for selector in selectors):
+        listing = directory.channels(client) if directory.fresh("channels") else []
+    else:
+        listing = directory.channels(client)
+    resolved: dict[str, dict[str, Any]] = {}
+    for selector in selectors:
+        if CHANNEL_ID.fullmatch(selector):
+            match = next((item for item in listing if item["id"] == selector), None)
+            matches = [match or client.call("conversations.info", {"channel": selector})["channel"]]
+        elif selector == ALL_MEMBER:
+            matches = [item for item in listing if item.get("is_member")]
+        else:
+            pattern = selector.lstrip("#")
+            literal = not any(char in pattern for char in "*?[")
+            matches = [item for item in listing if fnmatch.fnmatchcase(item.get("name") or "", pattern)]
+            if not matches and literal and "channels" not in directory.refreshed:
+                listing = directory.channels(client, refresh=True)
+                matches = [item for item in listing if item.get("name") == pattern]
+            if not matches and literal:
+                raise SystemExit(f"Could not resolve Slack channel {selector!r}.")
+        for item in matches:
+            resolved.setdefault(item["id"], item)
+    if not resolved:
+        raise SystemExit(f"No Slack channels matched {' '.join(selectors)!r}.")
+    return list(resolved.values())
+
+
+def history_pages(
     client: SlackClient,
     channel_id: str,
     oldest: str | None,
     latest: str | None,
     page_limit: int | None,
     limit: int,
-) -> list[dict[str, Any]]:
-    messages: list[dict[str, Any]] = []
-    cursor = None
-    pages = 0
+    inclusive: bool = False,
+    cursor: str | None = None,
+    pages: int = 0,
+) -> Iterator[tuple[list[dict[str, Any]], str | None]]:
+    """Yield ``(page, next_cursor)`` a page at a time, each page oldest first.
+
+    Slack pages newest first, so the pages themselves arrive newest first.
+    ``next_cursor`` is None on the chain's last page; passing a saved cursor and
+    the number of pages already fetched resumes the chain there.
+    """
     while True:
         payload = client.call(
             "conversations.history",
@@ -175,17 +615,100 @@ def fetch_history(
                 "channel": channel_id,
                 "oldest": oldest,
                 "latest": latest,
-                "inclusive": "false",
+                "inclusive": "true" if inclusive else "false",
                 "limit": limit,
                 "cursor": cursor,
             },
         )
-        messages.extend(payload.get("messages", []))
         pages += 1
         cursor = (payload.get("response_metadata") or {}).get("next_cursor")
-        if not cursor or (page_limit and pages >= page_limit):
+        last = not cursor or bool(page_limit and pages >= page_limit)
+        yield sorted(payload.get("messages", []), key=lambda item: float(item.get("ts", "0"))), None if last else cursor
+        if last:
             break
-    return sorted(messages, key=lambda item: float(item.get("ts", "0")))
+
+
+def window_edges(oldest: float, latest: float, windows: int) -> list[str]:
+    """``windows + 1`` Slack timestamps splitting oldest..latest evenly, newest first."""
+    span = (latest - oldest) / windows
+    return [f"{latest - index * span:.6f}" for index in range(windows)] + [f"{oldest:.6f}"]
+
+
+def history_windows(
+    client: SlackClient,
+    channel_id: str,
+    edges: list[str],
+    chains: list[dict[str, Any]],
+    page_limit: int | None,
+    limit: int,
+    seen_on_edge: set[str],
+) -> Iterator[tuple[tuple[int, int], list[dict[str, Any]], str | None]]:
+    """Fetch each window between adjacent ``edges`` concurrently; yield ``((window, page), page, next_cursor)``.
+
+    Every window follows its own ``next_cursor`` chain on its own thread, sharing
+    the client's rate limiter, so a long backfill is paced by Slack's tier rather
+    than by round-trip latency. Windows include both bounds so a message exactly
+    on an edge is not lost; the copy a neighbouring window also returns is
+    dropped (``seen_on_edge`` carries those timestamps across a resume).
+    ``(window, page)`` sorts newest first, like sequential pages. ``chains``
+    holds each window's saved progress; finished windows are not fetched. At
+    most ``2 * windows`` pages wait in memory for the caller.
+    """
+    windows = len(edges) - 1
+    pages: queue.Queue[Any] = queue.Queue(maxsize=2 * windows)
+    stop = threading.Event()
+    done = object()
+
+    def offer(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch(window: int) -> None:
+        saved = chains[window]
+        try:
+            chain = history_pages(
+                client, channel_id, edges[window + 1], edges[window], page_limit, limit,
+                inclusive=True, cursor=saved["cursor"], pages=saved["pages"],
+            )
+            for number, (page, next_cursor) in enumerate(chain, start=saved["pages"]):
+                if not offer(((window, number), page, next_cursor)):
+                    return
+        except BaseException as error:  # re-raised in the consuming thread
+            offer(error)
+        finally:
+            offer(done)
+
+    shared_edges = set(edges[1:-1])
+    pending = [window for window in range(windows) if not chains[window]["done"]]
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as fetchers:
+        for window in pending:
+            fetchers.submit(fetch, window)
+        try:
+            finished = 0
+            while finished < len(pending):
+                item = pages.get()
+                if item is done:
+                    finished += 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                order, page, next_cursor = item
+                unique = []
+                for message in page:
+                    ts = message.get("ts")
+                    if ts in shared_edges:
+                        if ts in seen_on_edge:
+                            continue
+                        seen_on_edge.add(ts)
+                    unique.append(message)
+                yield order, unique, next_cursor
+        finally:
+            stop.set()
 
 
 def fetch_replies(client: SlackClient, channel_id: str, thread_ts: str) -> list[dict[str, Any]]:
@@ -203,61 +726,585 @@ def fetch_replies(client: SlackClient, channel_id: str, thread_ts: str) -> list[
     return [reply for reply in replies if reply.get("ts") != thread_ts]
 
 
-def render_message(message: dict[str, Any], user_map: dict[str, str] | None = None) -> list[str]:
-    ts = message.get("ts", "")
+def is_thread_parent(message: dict[str, Any]) -> bool:
+    return bool(message.get("reply_count")) and message.get("thread_ts", message.get("ts")) == message.get("ts")
+
+
+def thread_marker(message: dict[str, Any]) -> list[Any]:
+    """A thread's entry in the cursor's thread index: ``[latest_reply, reply_count]``."""
+    return [message.get("latest_reply"), message.get("reply_count")]
+
+
+def thread_moved(message: dict[str, Any], known_threads: dict[str, list[Any]]) -> bool:
+    return is_thread_parent(message) and known_threads.get(message["ts"]) != thread_marker(message)
+
+
+def is_new(message: dict[str, Any], since: str | None) -> bool:
+    """Posted, or edited, after ``since`` (every message is new without one)."""
+    if since is None or float(message.get("ts", "0")) > float(since):
+        return True
+    edited = (message.get("edited") or {}).get("ts")
+    return bool(edited) and float(edited) > float(since)
+
+
+def fingerprint(message: dict[str, Any]) -> str:
+    """A message's entry in the cursor's fingerprint index: a short hash of its edit ts, text and reply count."""
+    key = json.dumps([(message.get("edited") or {}).get("ts"), message.get("text") or "", message.get("reply_count") or 0])
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def is_changed(message: dict[str, Any], since: str | None, known_fingerprints: dict[str, str]) -> bool:
+    """New or changed since the last run: its fingerprint moved or, for a message the index lacks, ``is_new``."""
+    known = known_fingerprints.get(message.get("ts", ""))
+    if known is not None:
+        return known != fingerprint(message)
+    return is_new(message, since)
+
+
+def attach_replies(
+    client: SlackClient,
+    channel_id: str,
+    parents: list[dict[str, Any]],
+    pool: ThreadPoolExecutor,
+    known_threads: dict[str, list[Any]] | None = None,
+) -> int:
+    """Fetch each parent's replies on a bounded pool and attach them in message order.
+
+    The workers share ``client`` and so its rate limiter. ``map`` yields results in
+    submission order, so the note is byte-identical to a serial run. A thread in
+    ``known_threads`` keeps only the replies after the ``latest_reply`` recorded
+    there; earlier ones are already in a previous note.
+    """
+    known_threads = known_threads or {}
+    reply_count = 0
+    fetched = pool.map(lambda parent: fetch_replies(client, channel_id, parent["ts"]), parents)
+    for parent, replies in zip(parents, fetched):
+        since = (known_threads.get(parent["ts"]) or [None])[0]
+        replies = [reply for reply in replies if is_new(reply, since)]
+        parent["ingested_replies"] = sorted(replies, key=lambda item: float(item.get("ts", "0")))
+        reply_count += len(replies)
+    return reply_count
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+class FileStore:
+    """Content-addressed store for message attachments, under ``<source-dir>/files/``.
+
+    Each file is saved once as ``<sha256[:2]>/<sha256><ext>`` however many
+    messages, channels or runs attach it, and ``index.json`` maps Slack file IDs
+    to stored paths, so a file met again (an overlap window, a re-ingest, another
+    channel) is never downloaded twice; within a run, a file already downloading
+    is waited on rather than fetched again. Downloads run on their own pool and
+    stream to a temp file in the store, hashed as they arrive, and stop at
+    ``max_bytes``. The user token goes only to the API host and ``*.slack.com``.
+    Text attachments are redacted like note text before they are stored, and
+    hashed as stored, since the store is committed with the wiki.
+    """
+
+    REDIRECTS = 3
+    TEXT_TYPES = ("text/", "application/json", "application/xml", "application/x-yaml", "application/x-sh")
+    TEXT_SUFFIXES = {
+        ".txt", ".log", ".md", ".json", ".jsonl", ".csv", ".tsv", ".yml", ".yaml", ".toml", ".xml", ".html",
+        ".ini", ".cfg", ".conf", ".env", ".properties", ".sh", ".py", ".js", ".ts", ".sql", ".diff", ".patch",
+    }
+
+    def __init__(self, root: Path, token: str, api_base: str, max_bytes: int, workers: int) -> None:
+        self.root = root
+        self.index_path = root / "index.json"
+        self.index: dict[str, dict[str, Any]] = {}
+        if self.index_path.exists():
+            try:
+                self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.index = {}
+        self.token = token
+        self.api_host = urllib.parse.urlsplit(api_base).hostname
+        self.max_bytes = max_bytes
+        self.pools: dict[str, ConnectionPool] = {}
+        self.pending: dict[str, Future[dict[str, Any]]] = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        for pool in self.pools.values():
+            pool.close()
+        self.save()
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.index:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            partial = self.index_path.with_name(f".{self.index_path.name}.part")
+            partial.write_text(json.dumps(self.index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(partial, self.index_path)
+
+    def fetch_all(self, files: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """Store every file in ``files`` concurrently; outcomes keyed by file ID.
+
+        An outcome has the stored ``path`` (relative to the source dir) or the
+        reason the file was ``skipped``; ``bytes`` is set when this call
+        downloaded it.
+        """
+        futures: dict[str, Future[dict[str, Any]]] = {}
+        for file in files:
+            if file.get("id") and file["id"] not in futures:
+                futures[file["id"]] = self.submit(file)
+        return {file_id: future.result() for file_id, future in futures.items()}
+
+    def submit(self, file: dict[str, Any]) -> Future[dict[str, Any]]:
+        with self.lock:
+            entry = self.index.get(file["id"])
+            if entry and (self.root / entry["path"]).exists():
+                done: Future[dict[str, Any]] = Future()
+                done.set_result({"path": f"{self.root.name}/{entry['path']}"})
+                return done
+            if file["id"] not in self.pending:
+                self.pending[file["id"]] = self.executor.submit(self.download, file)
+            return self.pending[file["id"]]
+
+    def download(self, file: dict[str, Any]) -> dict[str, Any]:
+        url = file.get("url_private_download") or file.get("url_private")
+        if file.get("mode") in ("tombstone", "hidden_by_limit") or file.get("is_external") or not url:
+            return {"skipped": "not stored in Slack"}
+        too_large = f"over the {self.max_bytes / (1024 * 1024):g} MB limit"
+        if (file.get("size") or 0) > self.max_bytes:
+            return {"skipped": too_large}
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        content_type, failure = "", None
+        with tempfile.NamedTemporaryFile(dir=self.root, prefix=".download-", delete=False) as handle:
+            partial = Path(handle.name)
+
+            def sink(chunk: bytes) -> None:
+                nonlocal size
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise FileTooLarge
+                digest.update(chunk)
+                handle.write(chunk)
+
+            try:
+                content_type = self.get(url, sink)
+            except FileTooLarge:
+                failure = too_large
+            except (http.client.HTTPException, OSError, ValueError) as error:
+                failure = f"download failed: {redact(str(error))}"
+        # Without files:read Slack answers a download with its sign-in page.
+        if failure is None and content_type.startswith("text/html") and not (file.get("mimetype") or "").startswith("text/html"):
+            failure = "Slack returned a sign-in page (is the files:read scope granted?)"
+        if failure is not None:
+            partial.unlink()
+            return {"skipped": failure}
+        suffix = Path(file.get("name") or "").suffix.lower()
+        suffix = suffix if re.fullmatch(r"\.[a-z0-9]{1,10}", suffix) else ""
+        if suffix in self.TEXT_SUFFIXES or (file.get("mimetype") or "").startswith(self.TEXT_TYPES):
+            text = partial.read_bytes().decode("utf-8", "surrogateescape")
+            cleaned = redact(text)
+            if cleaned != text:
+                body = cleaned.encode("utf-8", "surrogateescape")
+                partial.write_bytes(body)
+                digest, size = hashlib.sha256(body), len(body)
+        stored = f"{digest.hexdigest()[:2]}/{digest.hexdigest()}{suffix}"
+        target = self.root / stored
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            partial.unlink()
+        else:
+            os.replace(partial, target)
+        with self.lock:
+            self.index[file["id"]] = {"path": stored, "sha256": digest.hexdigest(), "size": size}
+        return {"path": f"{self.root.name}/{stored}", "bytes": size}
+
+    def get(self, url: str, sink: Callable[[bytes], None]) -> str:
+        """GET ``url`` into ``sink``, following redirects; returns the content type."""
+        for _ in range(self.REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            host = parts.hostname or ""
+            trusted = host == self.api_host or host == "slack.com" or host.endswith(".slack.com")
+            headers = {"Authorization": f"Bearer {self.token}"} if trusted else {}
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"not an http(s) URL: {url}")
+            origin = f"{parts.scheme}://{parts.netloc}"
+            with self.lock:
+                pool = self.pools.get(origin) or self.pools.setdefault(origin, ConnectionPool(origin))
+            path = parts.path + (f"?{parts.query}" if parts.query else "")
+            status, reason, response_headers, _ = pool.request("GET", path, None, headers, sink)
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            if status != 200:
+                raise OSError(f"HTTP {status} {reason}")
+            return response_headers.get("Content-Type", "")
+        raise OSError(f"more than {self.REDIRECTS} redirects")
+
+
+def file_record(file: dict[str, Any], outcome: dict[str, Any] | None = None) -> dict[str, Any]:
+    """A message attachment's sidecar form: redacted name and permalink, plus the stored path or skip reason."""
+    record = {
+        "id": file.get("id"),
+        "name": redact(file.get("name") or file.get("title") or file.get("id") or "file"),
+        "mimetype": file.get("mimetype"),
+        "size": file.get("size"),
+        "permalink": redact(file["permalink"]) if file.get("permalink") else None,
+        "path": (outcome or {}).get("path"),
+        "skipped": (outcome or {}).get("skipped"),
+    }
+    return {key: value for key, value in record.items() if value is not None}
+
+
+def message_record(
+    message: dict[str, Any],
+    user_map: dict[str, str] | None = None,
+    stored: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """The normalized sidecar form of ``message``, every Slack-supplied field redacted once.
+
+    ``thread_ts`` links a reply to its parent (a parent's equals its own ``ts``);
+    ``reply_count`` is set on parents; ``files`` lists attachments with their
+    outcomes from ``stored``. Absent fields are left out.
+    """
     user = message.get("user") or message.get("bot_id") or message.get("username") or "unknown"
-    if user_map and user in user_map:
-        user = f"{user_map[user]} ({user})"
+    record = {
+        "ts": message.get("ts", ""),
+        "thread_ts": message.get("thread_ts"),
+        "reply_count": message.get("reply_count"),
+        "user": redact(user),
+        "user_name": redact(user_map[user]) if user_map and user in user_map else None,
+        "text": redact(message.get("text") or ""),
+        "permalink": redact(message["permalink"]) if message.get("permalink") else None,
+        "edited_ts": (message.get("edited") or {}).get("ts"),
+        "files": [file_record(file, (stored or {}).get(file.get("id"))) for file in message["files"]]
+        if message.get("files") else None,
+    }
+    return {key: value for key, value in record.items() if value is not None}
+
+
+def render_record(record: dict[str, Any], link_base: str = "") -> list[str]:
+    """Markdown for one record; ``link_base`` leads from the note's directory to the source dir."""
+    ts = record["ts"]
+    user = f"{record['user_name']} ({record['user']})" if "user_name" in record else record["user"]
     lines = [f"### {iso_from_ts(ts)} - {user}", "", f"- ts: `{ts}`"]
-    if message.get("thread_ts") and message.get("thread_ts") != ts:
-        lines.append(f"- thread_ts: `{message['thread_ts']}`")
-    if message.get("permalink"):
-        lines.append(f"- permalink: {message['permalink']}")
-    text = redact(message.get("text") or "")
-    lines.extend(["", "```text", text, "```", ""])
+    if record.get("thread_ts") and record["thread_ts"] != ts:
+        lines.append(f"- thread_ts: `{record['thread_ts']}`")
+    if "permalink" in record:
+        lines.append(f"- permalink: {record['permalink']}")
+    for file in record.get("files") or []:
+        name = file["name"].replace("[", "\\[").replace("]", "\\]")
+        if "path" in file:
+            lines.append(f"- file: [{name}]({link_base}{file['path']})")
+        else:
+            lines.append(f"- file: {name} ({file.get('skipped') or 'not downloaded'})")
+    lines.extend(["", "```text", record["text"], "```", ""])
     return lines
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--channel", required=True, help="Channel ID or #channel-name.")
-    parser.add_argument("--token", help="Slack user token. Prefer SLACK_USER_TOKEN or --token-file.")
-    parser.add_argument("--token-file", help="JSON file from scripts/slack_oauth_user.py.")
-    parser.add_argument("--oldest", help="Slack ts or ISO timestamp. Defaults to previous state with overlap.")
-    parser.add_argument("--latest", help="Slack ts or ISO timestamp.")
-    parser.add_argument("--limit", type=int, default=200, help="Slack page size.")
-    parser.add_argument("--page-limit", type=int, help="Stop after this many history pages.")
-    parser.add_argument("--no-threads", action="store_true", help="Skip thread replies.")
-    parser.add_argument("--thread-lookback-days", type=int, default=14)
-    parser.add_argument("--source-dir", default="wiki/sources/slack")
-    parser.add_argument("--state-dir", default="wiki/state/slack",
-                        help="Read-only: prior cursor is read here for windowing. Final state is advanced by the kernel.")
-    parser.add_argument("--config", help="Path to wiki/lisa-wiki.config.json for the Slack tenant guard.")
-    parser.add_argument("--emit-meta", help="Write the PROPOSED cursor here; the kernel advances final state after verification.")
-    parser.add_argument("--title", help="Optional source-note title.")
-    args = parser.parse_args()
+def render_message(message: dict[str, Any], user_map: dict[str, str] | None = None) -> list[str]:
+    return render_record(message_record(message, user_map))
 
-    token = load_token(args)
-    client = SlackClient(token)
 
-    # Tenant guard: verify the authorized Slack workspace matches config before ingesting.
-    # (external-write does not exempt tenant guards.)
-    if args.config:
+def thread_messages(message: dict[str, Any]) -> list[dict[str, Any]]:
+    """``message`` and its ingested replies, parent first."""
+    return [message, *(message.get("ingested_replies") or [])]
+
+
+def thread_records(
+    message: dict[str, Any],
+    user_map: dict[str, str] | None = None,
+    stored: dict[str, dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """``message`` and its ingested replies as records, parent first."""
+    return [message_record(item, user_map, stored) for item in thread_messages(message)]
+
+
+def render_records(records: list[dict[str, Any]], link_base: str = "") -> list[str]:
+    """Markdown for one thread's records: the parent, then a replies section."""
+    lines = render_record(records[0], link_base)
+    if len(records) > 1:
+        lines.extend(["#### Thread Replies", ""])
+        for record in records[1:]:
+            lines.extend(render_record(record, link_base))
+    return lines
+
+
+def render_thread(message: dict[str, Any], user_map: dict[str, str] | None = None) -> list[str]:
+    return render_records(thread_records(message, user_map))
+
+
+class NoteWriter:
+    """Streams a source note to disk a history page at a time.
+
+    Each page is rendered and redacted into its own spool file as it arrives, so
+    memory holds one page however large the channel. ``render_message`` has
+    already redacted every Slack-supplied field; the page pass catches secrets
+    split across fields, and ``finish`` redacts the stitched note again, holding
+    back a private key whose END is on a later page until it arrives. History
+    arrives newest page first while the note reads oldest first,
+    and the header's counts are only known at the end, so ``finish`` writes the
+    header and then stitches the spools in reverse into a temp file that is
+    renamed into place atomically. The same pass writes a JSONL sidecar beside
+    the note, one ``message_record`` per line in note order, so readers need no
+    markdown parser. Backfill windows arrive interleaved, so each
+    page may carry its place in newest-first order. Spools live in the
+    channel's checkpoint directory and outlast a failed run for ``--resume``.
+    """
+
+    def __init__(self, path: Path, spool_dir: Path, spools: list[tuple[tuple[int, int], Path]] | None = None) -> None:
+        self.path = path
+        self.sidecar_path = path.with_suffix(".jsonl")
+        self.spool_dir = spool_dir
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.spools = list(spools or [])
+
+    def add_page(self, lines: list[str], records: list[dict[str, Any]], order: tuple[int, int] | None = None) -> None:
+        """Spool one page's markdown and sidecar records. ``order`` sorts pages newest first (default: arrival order)."""
+        if not records:
+            return
+        spool = self.spool_dir / f"page-{len(self.spools):06d}.part"
+        spool.write_text(redact("\n".join(lines)), encoding="utf-8")
+        spool.with_suffix(".jsonl").write_text(
+            "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records),
+            encoding="utf-8",
+        )
+        self.spools.append((order or (0, len(self.spools)), spool))
+
+    def finish(self, header: list[str]) -> None:
+        """Stitch the note and its sidecar; the sidecar lands first so a note never lacks one."""
+        partial = self.path.with_name(f".{self.path.name}.part")
+        sidecar = self.sidecar_path.with_name(f".{self.sidecar_path.name}.part")
         try:
-            cfg = json.loads(Path(args.config).read_text(encoding="utf-8"))
-        except Exception:
-            cfg = {}
-        guard = (((cfg.get("connectors") or {}).get("slack") or {}).get("tenantGuard")) or {}
-        if guard:
-            ident = client.call("auth.test")
-            want_team = guard.get("teamId") or guard.get("team_id")
-            want_url = guard.get("url")
-            if want_team and ident.get("team_id") != want_team:
-                raise SystemExit(f"Slack tenant guard: team_id {ident.get('team_id')!r} != configured {want_team!r}; aborting.")
-            if want_url and want_url not in (ident.get("url") or ""):
-                raise SystemExit(f"Slack tenant guard: workspace url {ident.get('url')!r} != configured {want_url!r}; aborting.")
+            with partial.open("w", encoding="utf-8") as note, sidecar.open("w", encoding="utf-8") as rows:
+                held = "\n".join(header)
+                for _, spool in sorted(self.spools, reverse=True):
+                    held += "\n" + spool.read_text(encoding="utf-8")
+                    cut = open_private_key(held)
+                    if cut < 0:
+                        cut = len(held)
+                    note.write(redact(held[:cut]))
+                    held = held[cut:]
+                    with spool.with_suffix(".jsonl").open(encoding="utf-8") as page:
+                        shutil.copyfileobj(page, rows)
+                note.write(redact(held))
+            os.replace(sidecar, self.sidecar_path)
+            os.replace(partial, self.path)
+        finally:
+            partial.unlink(missing_ok=True)
+            sidecar.unlink(missing_ok=True)
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """The spooled sidecar records in note order, read back one page at a time."""
+        for _, spool in sorted(self.spools, reverse=True):
+            with spool.with_suffix(".jsonl").open(encoding="utf-8") as page:
+                for line in page:
+                    yield json.loads(line)
+
+
+def thread_key(record: dict[str, Any]) -> str:
+    """The ``ts`` of the thread a record belongs to: its parent's, or its own."""
+    return record.get("thread_ts") or record["ts"]
+
+
+def group_threads(records: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Records in note order grouped by thread, parent first; a later copy of a message replaces the earlier one."""
+    threads: dict[str, dict[str, dict[str, Any]]] = {}
+    for record in records:
+        thread = threads.setdefault(thread_key(record), {})
+        thread[record["ts"]] = record
+    return {
+        key: sorted(thread.values(), key=lambda record: (record["ts"] != key, float(record["ts"])))
+        for key, thread in threads.items()
+    }
+
+
+class ShardedNotes:
+    """A channel's source notes as day shards, under ``<source-dir>/<name>-<channel>/``.
+
+    ``YYYY-MM-DD.md``, with its JSONL sidecar, holds every ingested thread whose
+    parent was posted that UTC day, oldest first. A run merges its records into
+    the shards they fall in, reading each shard's sidecar back: a message seen
+    again replaces its earlier record, so overlap re-ingests and edits land in
+    place, and a shard is rewritten only when the sha256 of its records changes.
+    ``index.json`` maps each shard to its time range, counts and hash, and
+    ``index.md`` lists the same for readers, so a range can be loaded without
+    the rest of the channel.
+    """
+
+    def __init__(self, directory: Path, channel_id: str, channel_name: str, title: str, today: str) -> None:
+        self.directory = directory
+        self.channel_id = channel_id
+        self.channel_name = channel_name
+        self.title = title
+        self.today = today
+        self.index_path = directory / "index.json"
+        self.index_note = directory / "index.md"
+        try:
+            self.index: dict[str, dict[str, Any]] = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.index = {}
+
+    def merge(self, records: Iterable[dict[str, Any]]) -> list[Path]:
+        """Merge records in note order into their day shards; returns the shards rewritten."""
+        changed = []
+        by_day = itertools.groupby(records, key=lambda record: iso_from_ts(thread_key(record))[:10])
+        for day, day_records in by_day:
+            if self.write_shard(day, list(day_records)):
+                changed.append(self.directory / f"{day}.md")
+        if changed or not self.index_note.exists():
+            self.write_index()
+        return changed
+
+    def write_shard(self, day: str, records: list[dict[str, Any]]) -> bool:
+        note = self.directory / f"{day}.md"
+        sidecar = note.with_suffix(".jsonl")
+        existing: list[dict[str, Any]] = []
+        if sidecar.exists():
+            with sidecar.open(encoding="utf-8") as rows:
+                existing = [json.loads(line) for line in rows]
+        threads = group_threads([*existing, *records])
+        ordered = [record for key in sorted(threads, key=float) for record in threads[key]]
+        rows = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in ordered)
+        digest = hashlib.sha256(rows.encode("utf-8")).hexdigest()
+        entry = self.index.get(day) or {}
+        if entry.get("sha256") == digest and note.exists():
+            return False
+        replies = sum(1 for record in ordered if thread_key(record) != record["ts"])
+        entry = {
+            "path": note.name,
+            "from_ts": min((record["ts"] for record in ordered), key=float),
+            "to_ts": max((record["ts"] for record in ordered), key=float),
+            "messages": len(ordered) - replies,
+            "replies": replies,
+            "sha256": digest,
+            "created": entry.get("created", self.today),
+            "updated": self.today,
+        }
+        header = [
+            "---",
+            "type: source",
+            f"created: {entry['created']}",
+            f"updated: {self.today}",
+            "source_system: slack",
+            f"channel_id: {self.channel_id}",
+            f"channel_name: {self.channel_name}",
+            f"shard: {day}",
+            "sources: []",
+            "---",
+            "",
+            f"# {self.title} - {day}",
+            "",
+            f"- Channel: `#{self.channel_name}` (`{self.channel_id}`)",
+            f"- Day (UTC): `{day}`",
+            f"- Messages: `{entry['messages']}`",
+            f"- Thread replies: `{replies}`",
+            "",
+            "## Messages",
+            "",
+        ]
+        body = [line for key in sorted(threads, key=float) for line in render_records(threads[key], "../")]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(sidecar, rows)
+        write_atomic(note, redact("\n".join(header) + "\n" + "\n".join(body)))
+        self.index[day] = entry
+        return True
+
+    def write_index(self) -> None:
+        days = sorted(self.index)
+        lines = [
+            "---",
+            "type: source",
+            f"created: {min((self.index[day]['created'] for day in days), default=self.today)}",
+            f"updated: {self.today}",
+            "source_system: slack",
+            f"channel_id: {self.channel_id}",
+            f"channel_name: {self.channel_name}",
+            "sources: []",
+            "---",
+            "",
+            f"# {self.title} - Index",
+            "",
+            f"- Channel: `#{self.channel_name}` (`{self.channel_id}`)",
+            f"- Shards: `{len(days)}`",
+            f"- Messages: `{sum(self.index[day]['messages'] for day in days)}`",
+            f"- Thread replies: `{sum(self.index[day]['replies'] for day in days)}`",
+            "",
+            "| Day (UTC) | First message | Last message | Messages | Replies |",
+            "| --- | --- | --- | --- | --- |",
+        ]
+        for day in days:
+            entry = self.index[day]
+            lines.append(
+                f"| [{day}]({entry['path']}) | {iso_from_ts(entry['from_ts'])} | {iso_from_ts(entry['to_ts'])} "
+                f"| {entry['messages']} | {entry['replies']} |"
+            )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.index_path, json.dumps(self.index, indent=2, sort_keys=True) + "\n")
+        write_atomic(self.index_note, redact("\n".join(lines)) + "\n")
+
 
-    channel = resolve_channel(client, args.channel)
+def write_atomic(path: Path, text: str) -> None:
+    partial = path.with_name(f".{path.name}.part")
+    partial.write_text(text, encoding="utf-8")
+    os.replace(partial, path)
+
+
+class Checkpoint:
+    """One channel's ingest in progress, kept so ``--resume`` can finish it.
+
+    The directory holds the note's page spools and ``checkpoint.json``, rewritten
+    atomically after every page: each history chain's next cursor, the spools
+    written so far, the running counts, and the thread index, which covers every
+    thread whose replies have been fetched. A finished run removes the directory;
+    one that dies leaves it behind, so ``--resume`` re-downloads at most the page
+    that was in flight.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.path = directory / "checkpoint.json"
+
+    def load(self) -> dict[str, Any] | None:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, progress: dict[str, Any]) -> None:
+        partial = self.path.with_name(f".{self.path.name}.part")
+        partial.write_text(json.dumps(progress), encoding="utf-8")
+        os.replace(partial, self.path)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def ingest_channel(
+    client: SlackClient,
+    channel: dict[str, Any],
+    args: argparse.Namespace,
+    pool: ThreadPoolExecutor,
+    user_map: dict[str, str] | None = None,
+    resolve_seconds: float = 0.0,
+    store: FileStore | None = None,
+) -> dict[str, Any]:
+    """Ingest one resolved channel into a source note and return its proposed cursor.
+
+    Attachments of the messages written are saved to ``store`` and linked from
+    the note; without one they are listed by name only. The cursor's
+    ``run_stats`` hold this run's cost: the channel's API calls, bytes,
+    throttling and retries, history pages fetched, files stored, wall time per
+    phase and the process's peak memory. ``resolve`` is the shared resolution
+    of channels and users, and ``history`` the time spent waiting on a page.
+    """
+    started = time.perf_counter()
+    client = client.fork()
+    phases = dict.fromkeys(("history", "replies", "files", "render", "write"), 0.0)
+    page_count = 0
+    file_counts = dict.fromkeys(("downloaded", "reused", "skipped", "bytes"), 0)
     channel_id = channel["id"]
     channel_name = channel.get("name") or channel_id
 
@@ -266,70 +1313,180 @@ def main() -> int:
     state_path = state_dir / f"{channel_id}.json"
     previous_state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
 
+    overlap_seconds = args.thread_lookback_days * 24 * 60 * 60
     oldest = ts_from_input(args.oldest)
     if oldest is None and previous_state.get("latest_message_ts"):
-        overlap_seconds = args.thread_lookback_days * 24 * 60 * 60
         oldest_float = max(0.0, float(previous_state["latest_message_ts"]) - overlap_seconds)
         oldest = f"{oldest_float:.6f}"
     latest = ts_from_input(args.latest)
 
-    messages = fetch_history(client, channel_id, oldest, latest, args.page_limit, args.limit)
-    reply_count = 0
-    if not args.no_threads:
-        for message in messages:
-            if message.get("reply_count") and message.get("thread_ts", message.get("ts")) == message.get("ts"):
-                replies = fetch_replies(client, channel_id, message["ts"])
-                message["ingested_replies"] = sorted(replies, key=lambda item: float(item.get("ts", "0")))
-                reply_count += len(replies)
-
-    now = utc_now()
-    stamp = now.strftime("%Y-%m-%d-%H%M%S")
+    # Delta mode: a message already stored by an earlier run is skipped unless
+    # its fingerprint (edit ts, text, reply count) moved from the index; one the
+    # index lacks is skipped when at or before the watermark and not edited
+    # since. A thread is re-fetched only when its ``latest_reply``/``reply_count``
+    # moved from the thread index.
+    watermark = None if args.full_refresh else previous_state.get("latest_message_ts")
+    known_threads: dict[str, list[Any]] = {} if args.full_refresh else dict(previous_state.get("threads") or {})
+    threads = dict(known_threads)
+    known_fingerprints: dict[str, str] = {} if args.full_refresh else dict(previous_state.get("fingerprints") or {})
+    fingerprints = dict(known_fingerprints)
+
     source_dir = Path(args.source_dir)
     source_dir.mkdir(parents=True, exist_ok=True)
-    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "-", channel_name).strip("-") or channel_id
-    source_path = source_dir / f"{stamp}-{safe_name}-{channel_id}.md"
     title = args.title or f"Slack Channel Ingest - #{channel_name}"
 
-    lines = [
-        "---",
-        "type: source",
-        f"created: {now.date()}",
-        f"updated: {now.date()}",
-        "source_system: slack",
-        f"channel_id: {channel_id}",
-        f"channel_name: {channel_name}",
-        "sources: []",
-        "---",
-        "",
-        f"# {title}",
-        "",
-        f"- Ingested at: `{now.isoformat().replace('+00:00', 'Z')}`",
-        f"- Channel: `#{channel_name}` (`{channel_id}`)",
-        f"- Oldest cursor: `{oldest or '0'}`",
-        f"- Latest cursor: `{latest or 'now'}`",
-        f"- Messages: `{len(messages)}`",
-        f"- Thread replies: `{reply_count}`",
-        "",
-        "## Messages",
-        "",
-    ]
-    for message in messages:
-        lines.extend(render_message(message))
-        replies = message.get("ingested_replies") or []
-        if replies:
-            lines.extend(["#### Thread Replies", ""])
-            for reply in replies:
-                lines.extend(render_message(reply))
-
-    source_path.write_text(redact("\n".join(lines)), encoding="utf-8")
+    checkpoint = Checkpoint(state_dir / "checkpoints" / channel_id)
+    saved = checkpoint.load() if args.resume else None
+    if saved is None:
+        checkpoint.clear()
+        now = utc_now()
+        stamp = now.strftime("%Y-%m-%d-%H%M%S")
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "-", channel_name).strip("-") or channel_id
+        if args.shard_by == "day":
+            source_path = source_dir / f"{safe_name}-{channel_id}"
+        else:
+            source_path = source_dir / f"{stamp}-{safe_name}-{channel_id}.md"
+        # Backfill: split oldest..latest into windows fetched concurrently. Without a
+        # lower bound (no --oldest, no prior cursor, no channel creation time) there
+        # is nothing to split, so history is paged as one chain.
+        lower = oldest or channel.get("created")
+        upper = float(latest) if latest else time.time()
+        edges = None
+        if args.backfill_windows > 1 and lower and float(lower) < upper:
+            edges = window_edges(float(lower), upper, args.backfill_windows)
+        chains = [{"cursor": None, "pages": 0, "done": False} for _ in range(len(edges) - 1 if edges else 1)]
+        spools: list[tuple[tuple[int, int], Path]] = []
+        message_count = reply_count = skipped_count = 0
+        newest_ts: str | None = None
+        seen_on_edge: set[str] = set()
+    else:
+        # Resume the saved run as it was planned: same note, range and windows.
+        now = dt.datetime.fromisoformat(saved["started_at"].replace("Z", "+00:00"))
+        source_path = Path(saved["source_path"])
+        oldest, latest, edges, chains = saved["oldest"], saved["latest"], saved["edges"], saved["chains"]
+        spools = [((window, number), checkpoint.directory / name) for window, number, name in saved["spools"]]
+        message_count, reply_count, skipped_count = saved["message_count"], saved["reply_count"], saved["skipped_count"]
+        newest_ts = saved["newest_ts"]
+        threads = saved["threads"]
+        fingerprints = saved.get("fingerprints") or {}
+        seen_on_edge = set(saved["seen_on_edge"])
+        done = sum(chain["pages"] for chain in chains)
+        print(f"Resuming #{channel_name} from its checkpoint: {done} history pages already fetched")
+
+    if edges:
+        pages = history_windows(client, channel_id, edges, chains, args.page_limit, args.limit, seen_on_edge)
+    else:
+        chain = history_pages(
+            client, channel_id, oldest, latest, args.page_limit, args.limit,
+            cursor=chains[0]["cursor"], pages=chains[0]["pages"],
+        ) if not chains[0]["done"] else iter(())
+        pages = (((0, number), page, cursor) for number, (page, cursor) in enumerate(chain, start=chains[0]["pages"]))
+    writer = NoteWriter(source_path, checkpoint.directory, spools)
+    shards: ShardedNotes | None = None
+    changed: list[Path] = []
+    wrote_note = False
+    try:
+        mark = time.perf_counter()
+        for order, page, next_cursor in pages:
+            mark = lap(phases, "history", mark)
+            page_count += 1
+            if page:
+                fresh = [
+                    message for message in page
+                    if is_changed(message, watermark, known_fingerprints) or thread_moved(message, known_threads)
+                ]
+                fingerprints.update({message["ts"]: fingerprint(message) for message in page})
+                if not args.no_threads:
+                    parents = [message for message in fresh if thread_moved(message, known_threads)]
+                    reply_count += attach_replies(client, channel_id, parents, pool, known_threads)
+                    threads.update({message["ts"]: thread_marker(message) for message in page if is_thread_parent(message)})
+                    mark = lap(phases, "replies", mark)
+                stored: dict[str, dict[str, Any]] = {}
+                attached = [file for message in fresh for item in thread_messages(message) for file in item.get("files") or []]
+                if store is not None and attached:
+                    stored = store.fetch_all(attached)
+                    for outcome in stored.values():
+                        kind = "downloaded" if "bytes" in outcome else "reused" if "path" in outcome else "skipped"
+                        file_counts[kind] += 1
+                        file_counts["bytes"] += outcome.get("bytes", 0)
+                    mark = lap(phases, "files", mark)
+                records = [thread_records(message, user_map, stored) for message in fresh]
+                lines = [] if args.shard_by == "day" else [line for thread in records for line in render_records(thread)]
+                mark = lap(phases, "render", mark)
+                writer.add_page(lines, [record for thread in records for record in thread], order)
+                message_count += len(fresh)
+                skipped_count += len(page) - len(fresh)
+                page_newest = max((message["ts"] for message in page), key=float)
+                if newest_ts is None or float(page_newest) > float(newest_ts):
+                    newest_ts = page_newest
+            chains[order[0]] = {"cursor": next_cursor, "pages": order[1] + 1, "done": next_cursor is None}
+            checkpoint.save({
+                "source_path": str(source_path),
+                "started_at": now.isoformat().replace("+00:00", "Z"),
+                "oldest": oldest,
+                "latest": latest,
+                "edges": edges,
+                "chains": chains,
+                "spools": [[*spool_order, spool.name] for spool_order, spool in writer.spools],
+                "message_count": message_count,
+                "reply_count": reply_count,
+                "skipped_count": skipped_count,
+                "newest_ts": newest_ts,
+                "threads": threads,
+                "fingerprints": fingerprints,
+                "seen_on_edge": sorted(seen_on_edge),
+            })
+            mark = lap(phases, "write", mark)
+
+        if args.shard_by == "day":
+            shards = ShardedNotes(source_path, channel_id, channel_name, title, now.date().isoformat())
+            changed = shards.merge(writer.records())
+        header = [
+            "---",
+            "type: source",
+            f"created: {now.date()}",
+            f"updated: {now.date()}",
+            "source_system: slack",
+            f"channel_id: {channel_id}",
+            f"channel_name: {channel_name}",
+            "sources: []",
+            "---",
+            "",
+            f"# {title}",
+            "",
+            f"- Ingested at: `{now.isoformat().replace('+00:00', 'Z')}`",
+            f"- Channel: `#{channel_name}` (`{channel_id}`)",
+            f"- Oldest cursor: `{oldest or '0'}`",
+            f"- Latest cursor: `{latest or 'now'}`",
+            f"- Messages: `{message_count}`",
+            f"- Thread replies: `{reply_count}`",
+            f"- Unchanged messages skipped: `{skipped_count}`",
+            "",
+            "## Messages",
+            "",
+        ]
+        # A run that found nothing new or edited writes no note at all.
+        wrote_note = shards is None and bool(message_count or reply_count)
+        if wrote_note:
+            writer.finish(header)
+        lap(phases, "write", mark)
+    finally:
+        pages.close()
+    checkpoint.clear()
 
     latest_ts = previous_state.get("latest_message_ts")
-    if messages:
-        latest_ts = max([message["ts"] for message in messages] + ([latest_ts] if latest_ts else []), key=float)
+    if newest_ts is not None:
+        latest_ts = max([newest_ts] + ([latest_ts] if latest_ts else []), key=float)
+
+    if latest_ts:
+        # Only threads the next run's overlap window can still see are worth indexing.
+        cutoff = float(latest_ts) - overlap_seconds
+        threads = {ts: marker for ts, marker in threads.items() if float(ts) >= cutoff}
+        fingerprints = {ts: digest for ts, digest in fingerprints.items() if float(ts) >= cutoff}
 
     notes = previous_state.get("source_notes") or []
-    source_note = str(source_path)
-    if source_note not in notes:
+    source_note = str(source_path / "index.md" if shards is not None else source_path)
+    if (shards is not None or wrote_note) and source_note not in notes:
         notes.append(source_note)
 
     # Per the connector contract, the connector does NOT advance final state — it emits a
@@ -341,19 +1498,173 @@ def main() -> int:
         "ran_at": now.isoformat().replace("+00:00", "Z"),
         "latest_message_ts": latest_ts,
         "latest_message_at": iso_from_ts(latest_ts) if latest_ts else None,
-        "last_message_count": len(messages),
+        "last_message_count": message_count,
         "last_thread_reply_count": reply_count,
+        "last_skipped_count": skipped_count,
+        "threads": threads,
+        "fingerprints": fingerprints,
         "source_notes": notes,
+        **({"shards_written": [str(shard) for shard in changed]} if shards is not None else {}),
+        "run_stats": {
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in client.stats.items()},
+            "resumed": saved is not None,
+            "pages": page_count,
+            "files": file_counts,
+            "wall_seconds": {
+                "resolve": round(resolve_seconds, 3),
+                **{phase: round(seconds, 3) for phase, seconds in phases.items()},
+                "total": round(time.perf_counter() - started, 3),
+            },
+            "peak_rss_mb": peak_rss_mb(),
+        },
     }
 
-    print(f"Wrote {source_path}")
-    if args.emit_meta:
+    if shards is not None:
+        print(f"Wrote {len(changed)} of {len(shards.index)} day shards under {source_path} (index: index.md)")
+    elif wrote_note:
+        print(f"Wrote {source_path} and {writer.sidecar_path.name}")
+    else:
+        print(f"No new or edited messages in #{channel_name}; no note written")
+    return proposed_cursor
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--channel", help="Channel ID or #channel-name.")
+    target.add_argument("--channels", nargs="+", metavar="SELECTOR",
+                        help=f"Channel IDs, #names and name globs (space- or comma-separated), or {ALL_MEMBER!r} "
+                             "for every channel you belong to. Emits one proposed cursor per channel.")
+    parser.add_argument("--token", help="Slack user token. Prefer SLACK_USER_TOKEN or --token-file.")
+    parser.add_argument("--token-file", help="JSON file from scripts/slack_oauth_user.py.")
+    parser.add_argument("--oldest", help="Slack ts or ISO timestamp. Defaults to previous state with overlap.")
+    parser.add_argument("--latest", help="Slack ts or ISO timestamp.")
+    parser.add_argument("--limit", type=int, default=200, help="Slack page size.")
+    parser.add_argument("--page-limit", type=int, help="Stop after this many history pages (per window under --backfill-windows).")
+    parser.add_argument("--backfill-windows", type=int, default=1,
+                        help="Split the --oldest..--latest range (from the prior cursor or channel creation when unset) "
+                             "into this many time windows paged concurrently under the shared rate limiter.")
+    parser.add_argument("--shard-by", choices=("run", "day"), default="run",
+                        help="'run': one source note per run. 'day': merge into per-day shards under "
+                             "<source-dir>/<channel>-<id>/ with an index, rewriting only the shards that changed.")
+    parser.add_argument("--no-threads", action="store_true", help="Skip thread replies.")
+    parser.add_argument("--thread-lookback-days", type=int, default=14)
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue each channel from the checkpoint a failed run left under <state-dir>/checkpoints/.")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Ignore the prior cursor's thread and fingerprint indexes: re-fetch every thread and re-emit every message.")
+    parser.add_argument("--thread-workers", type=int, default=4,
+                        help="Concurrent conversations.replies fetches; all share one rate limiter.")
+    parser.add_argument("--channel-workers", type=int, default=4,
+                        help="Channels ingested at once under --channels; all share one client and rate limiter.")
+    parser.add_argument("--source-dir", default="wiki/sources/slack")
+    parser.add_argument("--state-dir", default="wiki/state/slack",
+                        help="The prior cursor <channel-id>.json is read here for windowing and never written; the kernel "
+                             "advances it after verification. The connector's own caches live here too and are not cursors: "
+                             "directory.json (channel/user names) and checkpoints/<channel-id>/ (a failed run's progress, "
+                             "removed once a run succeeds).")
+    parser.add_argument("--config", help="Path to wiki/lisa-wiki.config.json for the Slack tenant guard.")
+    parser.add_argument("--emit-meta", help="Write the PROPOSED cursor here; the kernel advances final state after verification.")
+    parser.add_argument("--title", help="Optional source-note title.")
+    parser.add_argument("--directory-cache",
+                        help="Channel/user directory cache file (default: <state-dir>/directory.json); 'off' disables it.")
+    parser.add_argument("--directory-ttl-hours", type=float, default=24.0,
+                        help="Re-list channels and users once the cached directory is older than this.")
+    parser.add_argument("--files", action="store_true",
+                        help="Download message attachments into <source-dir>/files/ (text ones redacted); by default "
+                             "they are listed by name only.")
+    parser.add_argument("--max-file-mb", type=float, default=25.0,
+                        help="Skip attachments larger than this; they are listed in the note but not downloaded.")
+    parser.add_argument("--file-workers", type=int, default=4, help="Concurrent attachment downloads.")
+    parser.add_argument("--no-user-names", action="store_true",
+                        help="Render raw user IDs instead of names from users.list.")
+    parser.add_argument("--api-base", default=os.environ.get("SLACK_API_BASE") or DEFAULT_API_BASE,
+                        help="Slack Web API base URL (or SLACK_API_BASE), e.g. scripts/slack-api-stand-in.py.")
+    parser.add_argument("--tier-rate", type=tier_rate, action="append", default=[], metavar="TIER=CALLS_PER_MINUTE",
+                        help="Override a Slack rate-limit tier's pacing (repeatable), e.g. for a workspace with "
+                             "raised limits or a local stand-in.")
+    args = parser.parse_args()
+
+    token = load_token(args)
+    client = SlackClient(token, RateLimiter(dict(args.tier_rate)), api_base=args.api_base)
+
+    # Tenant guard: verify the authorized Slack workspace matches config before ingesting.
+    # (external-write does not exempt tenant guards.)
+    if args.config:
+        try:
+            cfg = json.loads(Path(args.config).read_text(encoding="utf-8"))
+        except Exception:
+            cfg = {}
+        guard = (((cfg.get("connectors") or {}).get("slack") or {}).get("tenantGuard")) or {}
+        if guard:
+            ident = client.call("auth.test")
+            want_team = guard.get("teamId") or guard.get("team_id")
+            want_url = guard.get("url")
+            if want_team and ident.get("team_id") != want_team:
+                raise SystemExit(f"Slack tenant guard: team_id {ident.get('team_id')!r} != configured {want_team!r}; aborting.")
+            if want_url and want_url not in (ident.get("url") or ""):
+                raise SystemExit(f"Slack tenant guard: workspace url {ident.get('url')!r} != configured {want_url!r}; aborting.")
+
+    if args.directory_cache == "off":
+        directory_path = None
+    else:
+        directory_path = Path(args.directory_cache or Path(args.state_dir) / "directory.json")
+    resolving = time.perf_counter()
+    directory = DirectoryCache(directory_path, args.directory_ttl_hours * 60 * 60)
+    if args.channel:
+        channels = [resolve_channel(client, args.channel, directory)]
+    else:
+        selectors = [selector for value in args.channels for selector in value.split(",") if selector]
+        channels = resolve_channels(client, selectors, directory)
+    user_map = None if args.no_user_names else directory.users(client)
+    resolve_seconds = time.perf_counter() - resolving
+
+    cursors: list[dict[str, Any]] = []
+    failures: list[str] = []
+    store = None
+    if args.files:
+        max_bytes = int(args.max_file_mb * 1024 * 1024)
+        store = FileStore(Path(args.source_dir) / "files", token, args.api_base, max_bytes, args.file_workers)
+    # Channels run on their own pool so a channel never waits on a reply-fetch
+    # slot held by another channel's thread; every call still shares ``client``.
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.thread_workers)) as pool:
+            with ThreadPoolExecutor(max_workers=max(1, args.channel_workers)) as channel_pool:
+                runs = [
+                    channel_pool.submit(ingest_channel, client, channel, args, pool, user_map, resolve_seconds, store)
+                    for channel in channels
+                ]
+                for channel, run in zip(channels, runs):
+                    try:
+                        cursors.append(run.result())
+                    except Exception as error:  # one channel's failure must not discard the others' notes
+                        failures.append(channel["id"])
+                        print(f"Slack ingest of {channel.get('name') or channel['id']} failed: {error}", file=sys.stderr)
+    finally:
+        if store is not None:
+            store.close()
+    # A finished channel removes its own checkpoint; once every channel has,
+    # checkpoints/ is empty and goes too. A failed channel's keeps it in place.
+    try:
+        (Path(args.state_dir) / "checkpoints").rmdir()
+    except OSError:
+        pass
+
+    stats = client.stats
+    print(
+        f"Slack API: {stats['calls']} calls, {stats['throttled_seconds']:.1f}s throttled, "
+        f"{stats['rate_limited']} rate-limited, {stats['retries']} retried"
+    )
+    if args.emit_meta and cursors:
         meta_path = Path(args.emit_meta)
         meta_path.parent.mkdir(parents=True, exist_ok=True)
-        meta_path.write_text(json.dumps({"proposedCursor": proposed_cursor}, indent=2) + "\n", encoding="utf-8")
+        meta = {"proposedCursor": cursors[0]} if args.channel else {"proposedCursors": cursors}
+        meta_path.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
         print(f"Emitted proposed cursor {meta_path} (kernel advances final state after verification)")
-    else:
+    elif not args.emit_meta:
         print("No --emit-meta given; proposed cursor not persisted (final state is advanced by the kernel).")
+    if failures:
+        raise SystemExit(f"Slack ingest failed for {', '.join(failures)}.")
     return 0
 
 
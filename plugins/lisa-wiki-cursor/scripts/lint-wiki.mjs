@@ -70,13 +70,19 @@ const localConfigPath = path.join(
 );
 const localConfig = readJsonSafe(localConfigPath);
 
-const allMd = walkFiles(wikiRoot, { ext: ".md" });
-const allFiles = walkFiles(wikiRoot);
 const exists = p => fs.existsSync(p);
 const isUnder = (p, dir) => {
   const r = path.relative(path.join(wikiRoot, dir), p);
   return r !== "" && !r.startsWith("..") && !path.isAbsolute(r);
 };
+// Connector attachment stores hold copies of source files, not wiki pages: no
+// page checks apply, binaries are expected, and text is still secret-scanned.
+const ATTACHMENT_DIRS = ["sources/slack/files"];
+const isAttachment = p => ATTACHMENT_DIRS.some(d => isUnder(p, d));
+const allMd = walkFiles(wikiRoot, { ext: ".md" }).filter(
+  f => !isAttachment(f)
+);
+const allFiles = walkFiles(wikiRoot);
 const isSynthesisPage = p => categories.some(c => isUnder(p, c));
 const isSourceNote = p => isUnder(p, "sources");
 
@@ -389,6 +395,7 @@ const terms = (config?.contaminationTerms ?? []).filter(Boolean);
 for (const f of allFiles) {
   const ext = path.extname(f);
   if (!TEXT_EXTS.has(ext) && path.basename(f) !== ".gitkeep") {
+    if (isAttachment(f)) continue;
     report.add(
       "binaries",
       "stray",
@@ -58,25 +58,73 @@ used to be UNSUPPORTED(10). That is a deliberate, test-pinned over-block: the
 documented payload-strip workaround is spelled `<<'EOF'`. Widening
 ``classify_safe`` to admit other spellings is a separate change needing its own
 proof — do not do it as a side effect of body-semantics work.
+
+Cost is part of the contract too: this runs inside a PreToolUse hook, so every
+rule reads the one ``CommandScan`` and nothing rescans the command per marker or
+per line, and words are split by ``shell_words`` because ``shlex`` is quadratic
+in the length of one token. ``scripts/bench-heredoc-classifier.py`` times
+adversarial shapes (MB bodies, thousands of markers, deep ``$(`` nesting, long
+ANSI-C runs) at doubling sizes and fails if any grows super-linearly;
+``work_budget`` caps the size. Memory is held near one copy of the command:
+``read_command`` enforces that ceiling while reading, lines are offset views
+(``BashLines``) rather than one string each, and the continuation collapses
+write through a ``TextBuffer``. Repeats are cheaper still: the one-shot ``main``
+answers a command it has already classified from ``VerdictCache``, which is keyed
+to this file's source so an edit here can never serve a stale verdict.
 """
 
 from __future__ import annotations
 
+import bisect
+import hashlib
+import itertools
+import json
+import os
 import re
-import shlex
+import subprocess
 import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
+from typing import Any, TextIO, overload
 
 SAFE = 0
 UNSUPPORTED = 10
 MALFORMED = 20
 
+# Verdict cache bounds: the whole file, and the largest single entry worth
+# keeping (one huge sanitized body must not evict a session's worth of small
+# ones). Reading the file is paid on every cached call, so it stays small;
+# past the limit it is compacted to its newest half.
+CACHE_LIMIT = 256 * 1024
+CACHE_ENTRY_LIMIT = CACHE_LIMIT // 16
+
+# Characters one call will classify. Past this the verdict is MALFORMED before
+# any rule runs, which bounds the worst case of the linear passes below
+# outright. The costliest shapes in ``scripts/bench-heredoc-classifier.py`` run
+# at roughly 2-3 ms per KiB, so 256 KiB keeps the hook under a second while
+# still holding four times GitHub's 65,536-character body limit.
+# ``$LISA_SAFETY_NET_WORK_BUDGET`` overrides it (see ``work_budget``).
+WORK_BUDGET = 256 * 1024
+# Characters ``read_command`` pulls from stdin per read.
+INTAKE_CHUNK = 1 << 16
+
 DELIMITER = r"(?P<delimiter>[A-Za-z_][A-Za-z0-9_]*)"
+DELIMITER_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 BODY_CAT_MARKER = re.compile(
     r"(?P<prefix>.*(?:^|\s)--body\s+)\"\$\(cat\s+<<'"
     + DELIMITER
     + r"'\s*$"
 )
+# Bytes that can change the lexer's state or start a substitution; everything
+# between them is skipped in one search.
+PLAIN_SPECIAL = re.compile(r"[\\'\"#$`]")
+NON_BLANK = re.compile(r"\S")
+CONTINUATION_SPECIAL = re.compile(r"[\\'\"$]")
+SINGLE_QUOTE_CLOSE = re.compile(r"'")
+DOUBLE_QUOTE_SPECIAL = re.compile(r"[\\\"$`]")
 ALLOWED_GROUPS = {"issue", "pr"}
 ALLOWED_ACTIONS = {"create", "edit", "comment"}
 
@@ -117,27 +165,93 @@ def is_bash_blank(char: str) -> bool:
     return char in " \t\n"
 
 
-def bash_lines(text: str) -> list[str]:
-    """Split into bash's notion of lines: on ``\\n`` ONLY.
+class BashLines(Sequence[str]):
+    """A command's lines in bash's sense — split on ``\\n`` ONLY — as views.
 
     Python ``str.splitlines()`` is the same over-broad classifier as
     ``str.isspace()`` in disguise — it ALSO breaks on ``\\r``, VT/FF
     (``\\x0b``/``\\x0c``), the C0 separators FS/GS/RS (``\\x1c``–``\\x1e``), NEL
     (``\\x85``), and the Unicode line separators (``\\u2028``/``\\u2029``). Bash
     ends a line only at an unquoted ``\\n``, so ``splitlines()`` invents line
-    breaks bash never sees. The concrete hole: ``strip_provably_literal_body``
-    splits with ``splitlines()`` then rejoins with ``\\n``, so a ``echo X\\x1c#$(…)``
+    breaks bash never sees. The concrete hole: the old literal-body strip split
+    with ``splitlines()`` then rejoined with ``\\n``, so a ``echo X\\x1c#$(…)``
     argument gets normalised into ``echo X`` / ``#$(…)`` on separate lines — now
     the ``#`` sits at a real line start, is treated as a comment, and the live
     ``$(…)`` is smuggled past the wall exactly as the ``str.isspace()`` desync
     did (issue #1958 Finding R2, FS/ideographic-space variant). Splitting on
     ``\\n`` alone keeps this parser's lines in lockstep with bash and with the
-    ``command.count("\\n", …)`` offset arithmetic the markers already rely on.
+    line-start offsets ``CommandScan`` maps marker offsets back through.
+
+    Only those offsets are stored (one machine word per line, in ``starts``);
+    a line is sliced out of the command when a rule reads it and freed after,
+    so a multi-megabyte paste of short lines does not become one string object
+    per line for the life of the scan.
     """
-    return text.split("\n")
 
+    # Characters split at a time while building ``starts``: big enough that the
+    # accumulate over each block runs in C, small enough that its line objects
+    # are a bounded transient.
+    BLOCK = 1 << 13
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.starts = array("q", [0])
+        past_newline = (1).__add__
+        for block in range(0, len(text), self.BLOCK):
+            pieces = text[block : block + self.BLOCK].split("\n")
+            if len(pieces) > 1:
+                widths = map(past_newline, map(len, pieces[:-1]))
+                offsets = itertools.accumulate(widths, initial=block)
+                self.starts.extend(itertools.islice(offsets, 1, None))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[line] for line in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start = self.starts[index]
+        if index + 1 < len(self.starts):
+            return self.text[start : self.starts[index + 1] - 1]
+        return self.text[start:]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[index] for index in range(len(self)))
+
+    def find_line(self, value: str, first: int) -> int | None:
+        """Index of the first line from ``first`` on that is exactly ``value``."""
+        if first >= len(self):
+            return None
+        text = self.text
+        index = text.find(value, self.starts[first])
+        while index != -1:
+            end = index + len(value)
+            if (index == 0 or text[index - 1] == "\n") and (
+                end == len(text) or text[end] == "\n"
+            ):
+                return bisect.bisect_right(self.starts, index) - 1
+            index = text.find(value, index + 1)
+        return None
 
-def ansi_c_quote_end(text: str, dollar_index: int) -> int | None:
+    def window(self, first: int, stop: int) -> str:
+        """Lines ``first`` up to ``stop`` joined by ``\\n``, in one slice."""
+        if first >= stop:
+            return ""
+        end = self.starts[stop] - 1 if stop < len(self) else len(self.text)
+        return self.text[self.starts[first] : end]
+
+
+def ansi_c_quote_end(
+    text: str, dollar_index: int, *, resume: int | None = None
+) -> int | None:
     """Index one past a bash ANSI-C ``$'...'`` token, or ``None``.
 
     When an *unquoted* ``$`` is immediately followed by ``'`` bash opens an
@@ -159,11 +273,16 @@ def ansi_c_quote_end(text: str, dollar_index: int) -> int | None:
     Returns the index just past the closing quote, or ``None`` for a
     non-``$'`` position or an unterminated token so callers fail closed. This is
     the single shared home of ANSI-C token boundaries; every quote-state walker
-    consults it rather than re-deriving the rule.
+    consults it rather than re-deriving the rule. ``resume`` continues a token
+    already known to be open at that index, which is how ``CommandScan`` steps
+    over a here-doc body window the token runs into.
     """
-    if not text.startswith("$'", dollar_index):
+    if resume is not None:
+        index = resume
+    elif not text.startswith("$'", dollar_index):
         return None
-    index = dollar_index + 2
+    else:
+        index = dollar_index + 2
     length = len(text)
     while index < length:
         char = text[index]
@@ -176,6 +295,120 @@ def ansi_c_quote_end(text: str, dollar_index: int) -> int | None:
     return None
 
 
+def shell_words(text: str, punctuation: str = "", comments: bool = False) -> list[str]:
+    """Split like posix ``shlex`` with ``whitespace_split``, in linear time.
+
+    ``shlex`` grows each token with ``str +=`` on an attribute, which CPython
+    cannot do in place, so one long token costs quadratic time. This is the
+    same state machine over a list of pieces; unterminated quotes and trailing
+    escapes raise ``ValueError`` as ``shlex`` does.
+    """
+    commenters = "#" if comments else ""
+    special = re.compile(
+        "[" + re.escape(" \t\r\n'\"\\" + punctuation + commenters) + "]"
+    )
+    words: list[str] = []
+    state: str | None = " "
+    pending = ""
+    index = 0
+    length = len(text)
+    while state is not None:
+        token: list[str] = []
+        quoted = False
+        resume = " "
+        while True:
+            if pending:
+                char, pending = pending, ""
+            elif index < length:
+                char = text[index]
+                index += 1
+            else:
+                char = ""
+            if state == " ":
+                if not char:
+                    state = None
+                    break
+                if char in " \t\r\n":
+                    continue
+                if char in commenters:
+                    newline = text.find("\n", index)
+                    index = length if newline < 0 else newline + 1
+                elif char == "\\":
+                    resume = "a"
+                    state = "\\"
+                elif char in punctuation:
+                    token.append(char)
+                    state = "c"
+                elif char in "'\"":
+                    state = char
+                else:
+                    token.append(char)
+                    state = "a"
+            elif state == "'":
+                quoted = True
+                end = text.find("'", index - 1) if char else -1
+                if end < 0:
+                    raise ValueError("No closing quotation")
+                token.append(text[index - 1 : end])
+                index = end + 1
+                state = "a"
+            elif state == '"':
+                quoted = True
+                if not char:
+                    raise ValueError("No closing quotation")
+                if char == '"':
+                    state = "a"
+                elif char == "\\":
+                    resume = state
+                    state = "\\"
+                else:
+                    token.append(char)
+            elif state == "\\":
+                if not char:
+                    raise ValueError("No escaped character")
+                if resume == '"' and char not in '"\\':
+                    token.append("\\")
+                token.append(char)
+                state = resume
+            else:
+                if not char:
+                    state = None
+                    break
+                if char in " \t\r\n" or char in commenters:
+                    if char in commenters:
+                        newline = text.find("\n", index)
+                        index = length if newline < 0 else newline + 1
+                    state = " "
+                    if token or quoted:
+                        break
+                elif state == "c":
+                    if char in punctuation:
+                        token.append(char)
+                    else:
+                        pending = char
+                        state = " "
+                        break
+                elif char in "'\"":
+                    state = char
+                elif char == "\\":
+                    resume = "a"
+                    state = "\\"
+                elif char in punctuation:
+                    pending = char
+                    state = " "
+                    if token or quoted:
+                        break
+                else:
+                    # Take the whole run of ordinary characters at once.
+                    match = special.search(text, index)
+                    end = length if match is None else match.start()
+                    token.append(text[index - 1 : end])
+                    index = end
+        if token or quoted:
+            words.append("".join(token))
+    return words
+
+
 def shell_tokens(prefix: str) -> list[str] | None:
     """Return literal simple-command tokens, rejecting executable shell syntax."""
     state = "plain"
@@ -221,7 +454,7 @@ def shell_tokens(prefix: str) -> list[str] | None:
     if state != "plain" or escaped:
         return None
     try:
-        return shlex.split(prefix, comments=False, posix=True)
+        return shell_words(prefix)
     except ValueError:
         return None
 
@@ -238,10 +471,7 @@ def is_allowed_gh(tokens: list[str]) -> bool:
 def line_has_allowed_writer(line: str) -> bool:
     """Find a writer after shell quote-concatenation and control operators."""
     try:
-        lexer = shlex.shlex(line, posix=True, punctuation_chars=";&|()")
-        lexer.whitespace_split = True
-        lexer.commenters = "#"
-        tokens = list(lexer)
+        tokens = shell_words(line, punctuation=";&|()", comments=True)
     except ValueError:
         return False
     return any(
@@ -257,24 +487,26 @@ def has_body_file_stdin(tokens: list[str]) -> bool:
     )
 
 
-def exact_terminator(lines: list[str], delimiter: str, start: int) -> int | None:
-    for index in range(start, len(lines)):
-        if lines[index] == delimiter:
-            return index
-    return None
+def exact_terminator(lines: BashLines, delimiter: str, start: int) -> int | None:
+    return lines.find_line(delimiter, start)
 
 
-def only_whitespace(lines: list[str], start: int) -> bool:
-    return all(not line.strip() for line in lines[start:])
+def only_whitespace(lines: BashLines, start: int) -> bool:
+    # ``\S`` is exactly what ``str.strip()`` keeps, so this is "every line from
+    # ``start`` strips to empty" without slicing a single line out.
+    if start >= len(lines):
+        return True
+    return NON_BLANK.search(lines.text, lines.starts[start]) is None
 
 
-def classify_safe(command: str) -> str | None:
-    lines = bash_lines(command)
+def classify_safe(scan: CommandScan) -> str | None:
+    command = scan.text
+    lines = scan.lines
     if len(lines) < 2 or "\x00" in command or "\r" in command:
         return None
 
     header = lines[0]
-    body_cat = BODY_CAT_MARKER.search(header)
+    body_cat = BODY_CAT_MARKER.match(header)
     if body_cat is not None:
         tokens = shell_tokens(body_cat.group("prefix"))
         if tokens is None or not is_allowed_gh(tokens):
@@ -288,7 +520,7 @@ def classify_safe(command: str) -> str | None:
             raise ValueError("command follows body cat heredoc")
         return body_cat.group("prefix") + '"<heredoc-text>"'
 
-    header_markers = top_level_markers(header)
+    header_markers = scan.line_markers(0)
     if len(header_markers) != 1:
         return None
     direct = header_markers[0]
@@ -307,48 +539,49 @@ def classify_safe(command: str) -> str | None:
     return prefix.rstrip()
 
 
-def top_level_markers(command: str) -> list[Marker]:
-    """Find conservative top-level markers for malformed/duplicate detection."""
+def line_markers(line: str, offset: int) -> list[Marker]:
+    """Find conservative top-level markers for malformed/duplicate detection.
+
+    Quote state starts over on every line, so this over-reports: a marker inside
+    a multi-line quoted string is recorded too, and ``CommandScan`` settles which
+    recorded markers bash really treats as redirections.
+    """
     markers: list[Marker] = []
-    lines = bash_lines(command)
-    offset = 0
-    for line in lines:
-        state = "plain"
-        escaped = False
-        index = 0
-        while index < len(line):
-            char = line[index]
-            if escaped:
-                escaped = False
-            elif state == "single":
-                if char == "'":
-                    state = "plain"
-            elif state == "double":
-                if char == '"':
-                    state = "plain"
-                elif char == "\\":
-                    escaped = True
-            elif line.startswith("$'", index):
-                end = ansi_c_quote_end(line, index)
-                if end is None:
-                    break
-                index = end
-                continue
-            elif char == "'":
-                state = "single"
-            elif char == '"':
-                state = "double"
+    state = "plain"
+    escaped = False
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if escaped:
+            escaped = False
+        elif state == "single":
+            if char == "'":
+                state = "plain"
+        elif state == "double":
+            if char == '"':
+                state = "plain"
             elif char == "\\":
                 escaped = True
-            elif char == "#" and (index == 0 or is_bash_blank(line[index - 1])):
+        elif line.startswith("$'", index):
+            end = ansi_c_quote_end(line, index)
+            if end is None:
                 break
-            elif line.startswith("<<", index) and not line.startswith("<<<", index):
-                marker = parse_marker(line, index, offset)
-                if marker is not None:
-                    markers.append(marker)
-                    index = marker.end - offset - 1
-            index += 1
-        offset += len(line) + 1
+            index = end
+            continue
+        elif char == "'":
+            state = "single"
+        elif char == '"':
+            state = "double"
+        elif char == "\\":
+            escaped = True
+        elif char == "#" and (index == 0 or is_bash_blank(line[index - 1])):
+            break
+        elif line.startswith("<<", index) and not line.startswith("<<<", index):
+            marker = parse_marker(line, index, offset)
+            if marker is not None:
+                markers.append(marker)
+                index = marker.end - offset - 1
+        index += 1
     return markers
 
 
@@ -399,121 +632,111 @@ def unquoted_code_and_comment(line: str) -> tuple[str, str]:
     return "".join(code), ""
 
 
+class TextBuffer:
+    """Joins many small runs of text with about one copy of the result live.
+
+    A list of runs costs one string object per run, and ``io.StringIO``
+    measured at six times the text; folding every ``CHUNK_RUNS`` runs into one
+    string keeps a multi-megabyte command's working set near its own size.
+    """
+
+    CHUNK_RUNS = 1024
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self.runs: list[str] = []
+
+    def write(self, run: str) -> None:
+        self.runs.append(run)
+        if len(self.runs) >= self.CHUNK_RUNS:
+            self.chunks.append("".join(self.runs))
+            self.runs.clear()
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks) + "".join(self.runs)
+
+
 def collapse_line_continuations(command: str) -> str:
-    """Remove Bash backslash-newline pairs outside single-quoted text."""
-    result: list[str] = []
+    """Remove Bash backslash-newline pairs outside single-quoted text.
+
+    Every other byte is kept, so the walk jumps between the bytes that can
+    change quote state and writes each kept run to a ``TextBuffer``, instead of
+    holding the command a character (or a run) per string object.
+    """
+    if "\\\n" not in command:
+        return command
+    kept = TextBuffer()
+    run_start = 0
     state = "plain"
-    escaped = False
     index = 0
-    while index < len(command):
+    while True:
+        pattern = SINGLE_QUOTE_CLOSE if state == "single" else CONTINUATION_SPECIAL
+        special = pattern.search(command, index)
+        if special is None:
+            break
+        index = special.start()
         char = command[index]
-        if escaped:
-            result.append(char)
-            escaped = False
-        elif state == "single":
-            result.append(char)
-            if char == "'":
-                state = "plain"
-        elif char == "\\" and command.startswith("\n", index + 1):
-            index += 2
-            continue
+        if state == "single":
+            state = "plain"
+            index += 1
         elif char == "\\":
-            result.append(char)
-            escaped = True
-        elif state == "plain" and command.startswith("$'", index):
-            end = ansi_c_quote_end(command, index)
-            if end is None:
-                result.append(char)
-            else:
-                # Preserve the whole inert ANSI-C token verbatim so its bytes
-                # stay a single quoted unit to every downstream walker; a
+            if command.startswith("\n", index + 1):
+                kept.write(command[run_start:index])
+                run_start = index + 2
+            # Either way the next byte is consumed: escaped, or the newline.
+            index += 2
+        elif char == "$":
+            end = None
+            if state == "plain" and command.startswith("$'", index):
+                # Keep the whole inert ANSI-C token verbatim so its bytes stay
+                # a single quoted unit to every downstream walker; a
                 # backslash-newline inside it is part of the token, not a line
                 # continuation to strip.
-                result.append(command[index:end])
-                index = end
-                continue
-        elif char == "'" and state == "plain":
-            result.append(char)
-            state = "single"
-        elif char == '"':
-            result.append(char)
-            state = "plain" if state == "double" else "double"
+                end = ansi_c_quote_end(command, index)
+            index = index + 1 if end is None else end
+        elif char == "'":
+            if state == "plain":
+                state = "single"
+            index += 1
         else:
-            result.append(char)
-        index += 1
-    return "".join(result)
+            state = "plain" if state == "double" else "double"
+            index += 1
+    kept.write(command[run_start:])
+    return kept.getvalue()
 
 
-def writer_owns_real_marker(command: str, markers: list[Marker]) -> bool:
+def writer_owns_real_marker(scan: CommandScan) -> bool:
     """Detect a supported writer on a line containing a real heredoc marker."""
-    logical_command = collapse_line_continuations(command)
-    logical_markers = (
-        markers if logical_command == command else top_level_markers(logical_command)
-    )
-    lines = bash_lines(logical_command)
-    for marker in logical_markers:
-        line_index = logical_command.count("\n", 0, marker.start)
-        if line_has_allowed_writer(lines[line_index]):
+    scan = scan.logical
+    for marker in scan.markers:
+        if line_has_allowed_writer(scan.lines[scan.line_of(marker.start)]):
             return True
     return False
 
 
-def writer_has_commented_marker_and_following_code(command: str) -> bool:
+def writer_has_commented_marker_and_following_code(scan: CommandScan) -> bool:
     """Reject fake writer markers whose following lines would execute."""
-    lines = bash_lines(command)
+    lines = scan.lines
     for index, line in enumerate(lines):
+        if "<<" not in line:
+            continue
         _code, comment = unquoted_code_and_comment(line)
         if (
-            line_has_allowed_writer(line)
-            and "<<" in comment
-            and any(candidate.strip() for candidate in lines[index + 1 :])
+            "<<" in comment
+            and line_has_allowed_writer(line)
+            and not only_whitespace(lines, index + 1)
         ):
             return True
     return False
 
 
-def has_active_command_substitution(command: str) -> bool:
-    """Detect substitutions outside single-quoted text and shell comments."""
-    state = "plain"
-    escaped = False
-    index = 0
-    while index < len(command):
-        char = command[index]
-        if escaped:
-            escaped = False
-        elif state == "single":
-            if char == "'":
-                state = "plain"
-        elif state == "double":
-            if char == '"':
-                state = "plain"
-            elif char == "\\":
-                escaped = True
-            elif char == "`" or command.startswith("$(", index):
-                return True
-        elif command.startswith("$'", index):
-            end = ansi_c_quote_end(command, index)
-            if end is None:
-                return True
-            index = end
-            continue
-        elif char == "'":
-            state = "single"
-        elif char == '"':
-            state = "double"
-        elif char == "\\":
-            escaped = True
-        elif char == "#" and (
-            index == 0 or is_bash_blank(command[index - 1])
-        ):
-            newline = command.find("\n", index)
-            if newline < 0:
-                return False
-            index = newline
-        elif char == "`" or command.startswith("$(", index):
-            return True
-        index += 1
-    return False
+def has_active_command_substitution(scan: CommandScan) -> bool:
+    """Detect substitutions outside single-quoted text and shell comments.
+
+    Read off the shared lexer pass, which skips here-doc body windows the way
+    bash does — see ``CommandScan``.
+    """
+    return scan.substitution is not None
 
 
 def collapse_body_continuations(body: str) -> str:
@@ -536,21 +759,16 @@ def collapse_body_continuations(body: str) -> str:
     contiguous token bash will execute. Fail-closed: a trailing lone backslash is
     kept verbatim (it can start no substitution).
     """
-    result: list[str] = []
-    index = 0
-    length = len(body)
-    while index < length:
-        char = body[index]
-        if char == "\\":
-            if index + 1 < length and body[index + 1] == "\n":
-                index += 2
-                continue
-            result.append(body[index : index + 2])
-            index += 2
-            continue
-        result.append(char)
-        index += 1
-    return "".join(result)
+    kept = TextBuffer()
+    run_start = 0
+    index = body.find("\\")
+    while index != -1:
+        if body.startswith("\n", index + 1):
+            kept.write(body[run_start:index])
+            run_start = index + 2
+        index = body.find("\\", index + 2)
+    kept.write(body[run_start:])
+    return kept.getvalue()
 
 
 def trailing_continuation(line: str) -> str | None:
@@ -568,13 +786,13 @@ def trailing_continuation(line: str) -> str | None:
     return line[:-1]
 
 
-def terminator_line_index(command: str, marker: Marker) -> int | None:
+def terminator_line_index(scan: CommandScan, marker: Marker) -> int | None:
     """Index of the physical line that closes ``marker``, or ``None``.
 
     THE single home of "where does this here-doc body end", consulted by the
-    closure check, the body scanner, the literal-body strip and the body
-    neutraliser so no two of them can ever disagree about the window (issue
-    #1993 R5a).
+    closure check, the body scanner and the lexer's body-window skip so no two
+    of them can ever disagree about the window (issue #1993 R5a). The answer is
+    memoised on the scan, so every rule asking about one marker shares one walk.
 
     Bash removes ``\\<newline>`` continuations from an UNQUOTED here-doc body
     BEFORE it matches the delimiter, so a trailing backslash on the last body
@@ -591,10 +809,12 @@ def terminator_line_index(command: str, marker: Marker) -> int | None:
     backslash is DATA there, not an escape — so those markers keep the exact
     per-physical-line match, which the same measurement proves correct.
     """
-    lines = bash_lines(command)
-    marker_line = command.count("\n", 0, marker.start)
+    if marker in scan.terminators:
+        return scan.terminators[marker]
+    lines = scan.lines
+    found = None
     pending: list[str] = []
-    for index in range(marker_line + 1, len(lines)):
+    for index in range(scan.line_of(marker.start) + 1, len(lines)):
         line = lines[index]
         if not marker.quoted:
             continued = trailing_continuation(line)
@@ -606,50 +826,10 @@ def terminator_line_index(command: str, marker: Marker) -> int | None:
         if marker.strip_tabs:
             candidate = candidate.lstrip("\t")
         if candidate == marker.delimiter:
-            return index
-    return None
-
-
-def neutralize_heredoc_bodies(command: str, markers: list[Marker]) -> str:
-    """Blank every real here-doc body window, preserving offsets.
-
-    ``has_active_command_substitution`` runs ONE flat single/double-quote state
-    machine across the whole command — including here-doc bodies, where bash
-    applies NO quote processing at all. An odd apostrophe in an unquoted body
-    (``it's fine``) therefore opens a phantom single-quoted string in the flat
-    scanner that persists PAST the terminator, hiding a live ``$(...)`` on a
-    FOLLOWING command line that bash happily executes (issue #1993 R5b). The
-    trigger is precisely an odd ``'`` count: an even ``''``, an odd ``"``, a
-    ``#``, an ANSI-C ``$'a`` and a lone trailing backslash all leave the flat
-    state correct, which is what pins the defect to this one branch.
-
-    ``strip_provably_literal_body`` cannot fix this: it bails whenever the marker
-    is unquoted, so the poisoning body is exactly the one it never touches. So
-    blank the body window of EVERY marker bash really treats as a here-doc
-    redirection before the flat scan runs. Bytes are replaced with spaces and
-    newlines are preserved, so marker offsets and line numbering stay valid for
-    every later walker.
-
-    Blanking loses nothing: a substitution INSIDE an unquoted body is still
-    caught by ``unquoted_heredoc_body_has_substitution`` (scanned with correct
-    here-doc-body semantics), and a quoted body is genuinely inert to bash. A
-    marker that is not closed blanks to end of command — that command is
-    MALFORMED on the closure check regardless, and its trailing region is still
-    body-scanned. As everywhere else, a marker nested inside an open quoted
-    string is NOT a here-doc to bash and is skipped, so its "body" stays fully
-    visible to the flat scan (issue #1958 Finding 1).
-    """
-    lines = bash_lines(command)
-    blanked = list(lines)
-    for marker in markers:
-        if cross_line_quote_state(command, marker.start) != "plain":
-            continue
-        marker_line = command.count("\n", 0, marker.start)
-        end = terminator_line_index(command, marker)
-        stop = len(lines) if end is None else end
-        for index in range(marker_line + 1, stop):
-            blanked[index] = " " * len(lines[index])
-    return "\n".join(blanked)
+            found = index
+            break
+    scan.terminators[marker] = found
+    return found
 
 
 def body_line_has_substitution(line: str) -> bool:
@@ -679,9 +859,7 @@ def body_line_has_substitution(line: str) -> bool:
     return False
 
 
-def unquoted_heredoc_body_has_substitution(
-    command: str, markers: list[Marker]
-) -> bool:
+def unquoted_heredoc_body_has_substitution(scan: CommandScan) -> bool:
     """Detect a live substitution inside an unquoted top-level heredoc body.
 
     ``has_active_command_substitution`` applies flat shell quote/comment
@@ -696,7 +874,7 @@ def unquoted_heredoc_body_has_substitution(
     A quoted-delimiter body (``Marker.quoted``) is genuinely inert to bash and is
     skipped — that is the whole point of the Finding-1 literal-payload win.
     Before scanning, the marker is re-verified to sit at bash top level under
-    CROSS-LINE quote tracking (mirroring ``strip_provably_literal_body``): a
+    the scan's CROSS-LINE quote tracking (``CommandScan.quote_state_at``): a
     heredoc-shaped ``<<EOF`` nested inside an open single-quoted string is not a
     real heredoc — its body is literal string data bash never expands — so
     scanning it would over-block ordinary quoted prose; and one nested inside an
@@ -704,16 +882,15 @@ def unquoted_heredoc_body_has_substitution(
     Either way, only markers bash actually treats as top-level heredoc
     redirections get the body scan.
     """
-    lines = bash_lines(command)
-    for marker in markers:
+    lines = scan.lines
+    for marker in scan.markers:
         if marker.quoted:
             continue
-        if cross_line_quote_state(command, marker.start) != "plain":
+        if scan.quote_state_at(marker.start) != "plain":
             continue
-        marker_line = command.count("\n", 0, marker.start)
-        end = terminator_line_index(command, marker)
+        marker_line = scan.line_of(marker.start)
+        end = terminator_line_index(scan, marker)
         stop = len(lines) if end is None else end
-        body_lines = lines[marker_line + 1 : stop]
         # Join the raw body window under bash's unquoted-here-doc ``\<newline>``
         # removal BEFORE scanning, so a ``$(`` a caller split across a line
         # continuation is seen as the one contiguous token bash executes. The
@@ -727,7 +904,7 @@ def unquoted_heredoc_body_has_substitution(
         # as body. This does not rely on ``collapse_line_continuations`` — whose
         # flat quote state a body apostrophe corrupts — which is the whole point
         # of Finding R4.
-        body = collapse_body_continuations("\n".join(body_lines))
+        body = collapse_body_continuations(lines.window(marker_line + 1, stop))
         if body_line_has_substitution(body):
             return True
     return False
@@ -772,7 +949,7 @@ def parse_marker(line: str, start: int, offset: int) -> Marker | None:
         # an invisible body still opened a phantom string that hid a live
         # `$(...)` on a following line (issue #1993 R5c). Recording it as the
         # quoted marker bash actually treats it as is both more faithful and
-        # what brings it under `neutralize_heredoc_bodies`. The same
+        # what brings its body under the lexer's window skip. The same
         # token-must-end discipline as the quote-pair branch applies, so exotic
         # spellings (`<<\EOF'x'` — real bash delimiter EOFx) stay conservative.
         # quoted=True here is a statement about BODY semantics only. Recording a
@@ -784,14 +961,14 @@ def parse_marker(line: str, start: int, offset: int) -> Marker | None:
         # the literal `<<'DELIM'` spelling and `<<\EOF` can never reach SAFE
         # anyway. The documented payload-strip workaround is `<<'EOF'`.
         index += 1
-        match = re.match(r"[A-Za-z_][A-Za-z0-9_]*", line[index:])
+        match = DELIMITER_WORD.match(line, index)
         if match is None:
             return None
         delimiter = match.group(0)
         final = index + len(delimiter)
         quoted = final >= len(line) or line[final] in " \t;&|)<>#"
     else:
-        match = re.match(r"[A-Za-z_][A-Za-z0-9_]*", line[index:])
+        match = DELIMITER_WORD.match(line, index)
         if match is None:
             return None
         delimiter = match.group(0)
@@ -801,94 +978,259 @@ def parse_marker(line: str, start: int, offset: int) -> Marker | None:
     return Marker(offset + start, offset + final, delimiter, strip_tabs, quoted)
 
 
-def cross_line_quote_state(command: str, offset: int) -> str:
-    """Return the single/double/plain quote state bash sees at ``offset``.
-
-    Unlike ``top_level_markers`` (which re-initialises quote state at the start
-    of every line), this walks the whole command with a SINGLE cross-line state
-    machine — the same quote/escape/comment model ``has_active_command_substitution``
-    uses. It answers "is this position inside an open single- or double-quoted
-    string?" so a heredoc-shaped token can be checked against bash's real parse.
+class CommandScan:
+    """One lexer pass over a command, shared by every rule in this module.
+
+    The rules used to re-walk the command with their own copies of the same
+    quote state machine — once for markers, once per marker for its cross-line
+    quote state, once more over a body-blanked copy for live substitutions —
+    which made classification super-linear in markers and re-paid the whole
+    walk for every multi-kilobyte body. This holds the physical lines, their
+    start offsets, the per-line markers, each marker's terminator, and the
+    result of ONE cross-line lex: a table of offset-preserving ``spans`` (quoted
+    text and here-doc body windows) plus the offset of the first live
+    substitution. Everything is computed lazily, so the SAFE path never pays for
+    the lex it does not read.
+
+    The lex is the single cross-line quote/escape/comment model: a
+    ``$(...)``/backtick outside single quotes and comments is live, an ANSI-C
+    ``$'...'`` token is consumed whole (``ansi_c_quote_end``), and an
+    unterminated one fails closed as live. Unlike ``line_markers`` — which
+    re-initialises quote state on every line — it answers "is this offset inside
+    an open single- or double-quoted string?" against bash's real parse, so a
+    heredoc-shaped token nested in a multi-line quoted string is NOT mistaken for
+    a redirection: to bash the whole thing is one string, and a ``$(...)`` inside
+    a double-quoted one is EXECUTED (issue #1958 Finding 1).
+
+    Body windows are SKIPPED rather than lexed, because bash applies NO quote
+    processing inside a here-doc body: an odd apostrophe in an unquoted body
+    (``it's fine``) would otherwise open a phantom single-quoted string that
+    persists PAST the terminator and hides a live ``$(...)`` on a following
+    command line (issue #1993 R5b). Each marker the lex reaches at plain top
+    level opens a window from its next line up to ``terminator_line_index`` (to
+    end of command when unclosed — MALFORMED on the closure check regardless),
+    and the lex resumes after it in the quote state it entered with. Skipping
+    loses nothing: a substitution INSIDE an unquoted body is caught by
+    ``unquoted_heredoc_body_has_substitution`` with here-doc-body semantics, and
+    a quoted body is genuinely inert to bash. A marker inside a skipped window is
+    body text, not a redirection, and reports the ``"body"`` state.
     """
-    state = "plain"
-    escaped = False
-    index = 0
-    limit = min(offset, len(command))
-    while index < limit:
-        char = command[index]
-        if escaped:
-            escaped = False
-        elif state == "single":
-            if char == "'":
-                state = "plain"
-        elif state == "double":
-            if char == '"':
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.lines = BashLines(text)
+        self.terminators: dict[Marker, int | None] = {}
+        self.spans: list[tuple[int, int, str]] = []
+        self._line_markers: dict[int, list[Marker]] = {}
+        self._markers: list[Marker] | None = None
+        self._substitution: int | None = None
+        self._lexed = False
+        self._logical: CommandScan | None = None
+
+    @property
+    def logical(self) -> CommandScan:
+        """The scan of this command with line continuations collapsed.
+
+        ``self`` when there is nothing to collapse. Built once and shared, so
+        the rules that read the logical command do not each re-walk and
+        re-copy it; the collapse is idempotent, so the logical scan is its own
+        logical scan.
+        """
+        if self._logical is None:
+            logical_command = collapse_line_continuations(self.text)
+            if logical_command == self.text:
+                self._logical = self
+            else:
+                self._logical = CommandScan(logical_command)
+                self._logical._logical = self._logical
+        return self._logical
+
+    @property
+    def starts(self) -> array[int]:
+        """Offset of the first byte of each physical line."""
+        return self.lines.starts
+
+    def line_of(self, offset: int) -> int:
+        return bisect.bisect_right(self.starts, offset) - 1
+
+    def line_markers(self, index: int) -> list[Marker]:
+        if index not in self._line_markers:
+            line = self.lines[index]
+            if "<<" not in line:
+                return []
+            self._line_markers[index] = line_markers(line, self.starts[index])
+        return self._line_markers[index]
+
+    @property
+    def markers(self) -> list[Marker]:
+        """Every recorded marker, in offset order (see ``line_markers``).
+
+        Only lines holding a ``<<`` can record one, so the walk jumps from each
+        ``<<`` to its line and on to the next line, never visiting the rest.
+        """
+        if self._markers is None:
+            markers: list[Marker] = []
+            text = self.text
+            found = text.find("<<")
+            while found != -1:
+                index = self.line_of(found)
+                markers.extend(self.line_markers(index))
+                if index + 1 >= len(self.starts):
+                    break
+                found = text.find("<<", self.starts[index + 1])
+            self._markers = markers
+        return self._markers
+
+    @property
+    def substitution(self) -> int | None:
+        """Offset of the first live substitution bash would run, or ``None``."""
+        self._lex()
+        return self._substitution
+
+    def quote_state_at(self, offset: int) -> str:
+        """``"plain"``, ``"single"``, ``"double"`` or ``"body"`` at ``offset``.
+
+        The state after bash has read everything before ``offset``; an offset
+        inside an ANSI-C token reads as ``"single"``.
+        """
+        self._lex()
+        index = bisect.bisect_right(self.spans, (offset, float("inf"), "")) - 1
+        if index >= 0:
+            _first, end, state = self.spans[index]
+            if offset < end:
+                return state
+        return "plain"
+
+    def _lex(self) -> None:
+        if self._lexed:
+            return
+        self._lexed = True
+        text = self.text
+        length = len(text)
+        spans = self.spans
+        markers = self.markers
+        settled = 0
+        windows: list[tuple[int, int]] = []
+        state = "plain"
+        opened = 0
+        escaped = False
+        index = 0
+
+        def span(first: int, end: int, kind: str) -> None:
+            # Spans are half-open, disjoint and appended in offset order, so
+            # ``quote_state_at`` can bisect them.
+            if first < end:
+                spans.append((first, end, kind))
+
+        while index < length:
+            if windows and index >= windows[0][0]:
+                begin, end = windows.pop(0)
+                if state != "plain":
+                    span(opened, begin, state)
+                    opened = end
+                span(begin, end, "body")
+                index = max(index, end)
+                escaped = False
+                continue
+            while settled < len(markers) and markers[settled].start <= index:
+                marker = markers[settled]
+                settled += 1
+                if marker.start == index:
+                    here = state
+                else:
+                    here = self.quote_state_at(marker.start)
+                if here != "plain":
+                    continue
+                first = self.line_of(marker.start) + 1
+                stop = terminator_line_index(self, marker)
+                stop = len(self.lines) if stop is None else stop
+                if stop > first:
+                    begin = self.starts[first]
+                    end = self.starts[stop] if stop < len(self.lines) else length
+                    if windows and windows[-1][0] == begin:
+                        windows[-1] = (begin, max(end, windows[-1][1]))
+                    else:
+                        windows.append((begin, end))
+            if escaped:
+                escaped = False
+                index += 1
+                continue
+            # Jump straight to the next byte that can change anything, but
+            # never past a marker still to settle or a window still to skip.
+            limit = length
+            if windows:
+                limit = min(limit, windows[0][0])
+            if settled < len(markers):
+                limit = min(limit, markers[settled].start)
+            if state == "single":
+                close = text.find("'", index, limit)
+                if close < 0:
+                    index = limit
+                    continue
+                span(opened, close + 1, state)
                 state = "plain"
+                index = close + 1
+                continue
+            special = DOUBLE_QUOTE_SPECIAL if state == "double" else PLAIN_SPECIAL
+            found = special.search(text, index, limit)
+            if found is None:
+                index = limit
+                continue
+            index = found.start()
+            char = text[index]
+            if state == "double":
+                if char == '"':
+                    span(opened, index + 1, state)
+                    state = "plain"
+                elif char == "\\":
+                    escaped = True
+                elif char == "`" or text.startswith("$(", index):
+                    self._note_substitution(index)
+            elif text.startswith("$'", index):
+                end = ansi_c_quote_end(text, index)
+                first = index + 1
+                # A token still open at a body window reads that window as the
+                # blank text it is to this lex and continues after it.
+                while end is not None and windows and end > windows[0][0]:
+                    begin, stop = windows.pop(0)
+                    span(first, begin, "single")
+                    span(begin, stop, "body")
+                    first = stop
+                    end = ansi_c_quote_end(text, index, resume=stop)
+                if end is None:
+                    self._note_substitution(index)
+                    state = "single"
+                    opened = first
+                    break
+                span(first, end, "single")
+                index = end
+                continue
+            elif char == "'":
+                state = "single"
+                opened = index + 1
+            elif char == '"':
+                state = "double"
+                opened = index + 1
             elif char == "\\":
                 escaped = True
-        elif command.startswith("$'", index):
-            end = ansi_c_quote_end(command, index)
-            if end is None or end > limit:
-                # The offset sits inside (or an unterminated) ANSI-C token: bash
-                # is not at plain top level there, so any heredoc-shaped marker
-                # is inert. Report a non-plain state so the strip gate refuses.
-                return "single"
-            index = end
-            continue
-        elif char == "'":
-            state = "single"
-        elif char == '"':
-            state = "double"
-        elif char == "\\":
-            escaped = True
-        elif char == "#" and (index == 0 or is_bash_blank(command[index - 1])):
-            newline = command.find("\n", index)
-            if newline < 0 or newline >= limit:
-                return state
-            index = newline
-            continue
-        index += 1
-    return state
-
-
-def strip_provably_literal_body(command: str, markers: list[Marker]) -> str:
-    """Drop the body window of a single fully-quoted, closed heredoc.
-
-    A fully-quoted delimiter (Marker.quoted) makes the body literal data to
-    bash, so substitution tokens inside it must not flip the classification to
-    MALFORMED (issue #1958). The exclusion is deliberately narrow: EXACTLY one
-    marker, provably quoted, provably closed, and — critically — a marker bash
-    actually treats as a top-level heredoc redirection. ``top_level_markers``
-    resets quote state per line, so a ``<<'DELIM'`` line nested inside an open
-    multi-line single/double-quoted string is mis-recorded as a top-level
-    quoted heredoc. To bash there is NO heredoc there — the whole thing is one
-    string, and a ``$(...)`` inside a double-quoted string is EXECUTED. Excluding
-    that fake "body" window would delete the live substitution before the scan
-    runs, smuggling arbitrary command execution past the wall (issue #1958
-    Finding 1). So before excluding, re-verify the marker sits at bash top level
-    (quote state ``plain``) under CROSS-LINE quote tracking; if it is inside an
-    open quote, strip nothing and let ``has_active_command_substitution`` see the
-    real substitution. Anything else returns the command unchanged so the scan
-    stays fail-closed. Only the body lines are removed; the header line,
-    terminator line, and everything after remain, so a substitution on the
-    command line proper is still detected. The raw payload itself still reaches
-    every content guard because this classifier returns UNSUPPORTED (raw
-    pass-through) for the target class, never SAFE.
-    """
-    if len(markers) != 1 or not markers[0].quoted:
-        return command
-    marker = markers[0]
-    if cross_line_quote_state(command, marker.start) != "plain":
-        return command
-    lines = bash_lines(command)
-    marker_line = command.count("\n", 0, marker.start)
-    end = terminator_line_index(command, marker)
-    if end is None:
-        return command
-    return "\n".join(lines[: marker_line + 1] + lines[end:])
+            elif char == "#" and (index == 0 or is_bash_blank(text[index - 1])):
+                newline = text.find("\n", index)
+                if newline < 0:
+                    break
+                index = newline
+                continue
+            elif char == "`" or text.startswith("$(", index):
+                self._note_substitution(index)
+            index += 1
+        if state != "plain":
+            span(opened, length + 1, state)
+
+    def _note_substitution(self, index: int) -> None:
+        if self._substitution is None:
+            self._substitution = index
 
 
-def marker_is_closed(command: str, marker: Marker) -> bool:
+def marker_is_closed(scan: CommandScan, marker: Marker) -> bool:
     """True when bash really terminates this here-doc inside the command.
 
     Delegates to ``terminator_line_index`` so the closure verdict and the body
@@ -897,62 +1239,465 @@ def marker_is_closed(command: str, marker: Marker) -> bool:
     line correctly reads as NOT closed — which is what bash does, and what makes
     the swallowed-terminator shape fail closed as MALFORMED (issue #1993 R5a).
     """
-    return terminator_line_index(command, marker) is not None
+    return terminator_line_index(scan, marker) is not None
+
+
+def work_budget() -> int:
+    """The size ceiling in characters: ``WORK_BUDGET`` unless overridden.
+
+    ``$LISA_SAFETY_NET_WORK_BUDGET`` (a positive integer) replaces it. Lowering
+    it keeps the hook small on constrained hosts; raising it trades latency for
+    classifying bigger payloads. Either way, past it the verdict is MALFORMED.
+    """
+    override = os.environ.get("LISA_SAFETY_NET_WORK_BUDGET", "")
+    if override.isdigit() and int(override) > 0:
+        return int(override)
+    return WORK_BUDGET
+
+
+def read_command(stream: TextIO, limit: int) -> str | None:
+    """The whole command from ``stream``, or ``None`` once it passes ``limit``.
+
+    Read in ``INTAKE_CHUNK`` pieces so the ceiling applies while reading, not
+    after a multi-megabyte paste is already held in full. Past the ceiling the
+    rest is read and discarded, a chunk at a time, instead of the pipe being
+    closed, so the hook's writer never dies of SIGPIPE mid-command.
+    """
+    chunks: list[str] = []
+    size = 0
+    while chunk := stream.read(INTAKE_CHUNK):
+        size += len(chunk)
+        if size > limit:
+            while stream.read(INTAKE_CHUNK):
+                pass
+            return None
+        chunks.append(chunk)
+    return "".join(chunks)
+
 
+def classify(command: str) -> tuple[int, str]:
+    """Classify one command: ``(exit status, text the content guards scan)``.
 
-def main() -> int:
-    command = sys.stdin.read()
+    The status is the SAFE/UNSUPPORTED/MALFORMED contract ``main`` exits with.
+    The text is only meaningful for SAFE; every other verdict returns ``""``
+    because the hook hands the RAW command to the guards instead. Kept free of
+    I/O so the one-shot ``main`` and the long-lived ``serve`` loop cannot drift
+    apart on a verdict (the opt-in daemon in
+    ``parity-safety-net-heredoc-daemon.py`` calls this directly).
+    """
     if "<<" not in command:
-        print(command, end="")
-        return SAFE
+        return SAFE, command
+    if len(command) > work_budget():
+        return MALFORMED, ""
+    scan = CommandScan(command)
     try:
-        sanitized = classify_safe(command)
+        sanitized = classify_safe(scan)
     except ValueError:
-        return MALFORMED
+        return MALFORMED, ""
     if sanitized is not None:
-        print(sanitized, end="")
-        return SAFE
-
-    logical_command = collapse_line_continuations(command)
-    markers = top_level_markers(logical_command)
-    if writer_has_commented_marker_and_following_code(logical_command):
-        return MALFORMED
-    if writer_owns_real_marker(logical_command, markers):
-        return MALFORMED
+        return SAFE, sanitized
+
+    scan = scan.logical
+    markers = scan.markers
+    # Every rule below ends in MALFORMED once a second marker is recorded, so
+    # settle that before paying for any of them.
+    if len(markers) > 1:
+        return MALFORMED, ""
+    if writer_has_commented_marker_and_following_code(scan):
+        return MALFORMED, ""
+    if writer_owns_real_marker(scan):
+        return MALFORMED, ""
     # Textual operators inside quotes or comments are not heredocs. Leave the
     # raw command unchanged so ordinary guard matching proceeds normally.
-    if not markers and not has_active_command_substitution(logical_command):
-        return UNSUPPORTED
+    if not markers and not has_active_command_substitution(scan):
+        return UNSUPPORTED, ""
 
     # A supported writer that failed the exact safe grammar is ambiguous: do
     # not let chaining, alternate redirects, or an expanding delimiter turn a
     # would-be payload exemption into a bypass.
-    if bash_lines(logical_command) and line_has_allowed_writer(
-        bash_lines(logical_command)[0]
-    ):
-        return MALFORMED
+    if line_has_allowed_writer(scan.lines[0]):
+        return MALFORMED, ""
 
     # Nested substitution plus a heredoc is executable shell syntax unless it
-    # matched the one exact quoted `--body "$(cat ...)"` form above. Here-doc
-    # bodies are neutralised before the flat scan: bash applies NO quote
-    # processing inside a body, so leaving those bytes in a flat quote state
-    # machine let an odd body apostrophe poison the scanner PAST the terminator
-    # and hide a live substitution on a following command line (issue #1993
-    # R5b). Neutralising preserves offsets, so the narrower literal-body strip
-    # still applies on top; the text outside every body window is still scanned,
-    # and in-body substitutions are covered by the body-semantics scan below.
+    # matched the one exact quoted `--body "$(cat ...)"` form above. The lex
+    # behind ``has_active_command_substitution`` skips here-doc bodies (bash
+    # applies NO quote processing inside one, issue #1993 R5b), so in-body
+    # substitutions are covered by the body-semantics scan instead.
     if has_active_command_substitution(
-        strip_provably_literal_body(
-            neutralize_heredoc_bodies(logical_command, markers), markers
+        scan
+    ) or unquoted_heredoc_body_has_substitution(scan):
+        return MALFORMED, ""
+    if markers and not marker_is_closed(scan, markers[0]):
+        return MALFORMED, ""
+    return UNSUPPORTED, ""
+
+
+def default_cache_path() -> str | None:
+    """Where ``main`` keeps its verdict cache, or None when it is disabled.
+
+    ``$LISA_SAFETY_NET_VERDICT_CACHE`` names the file, and ``off`` disables the
+    cache; otherwise it lives under ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+    """
+    override = os.environ.get("LISA_SAFETY_NET_VERDICT_CACHE")
+    if override == "off":
+        return None
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "lisa", "safety-net-heredoc-verdicts.jsonl")
+
+
+def is_private(stat: os.stat_result) -> bool:
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+class VerdictCache:
+    """Bounded, approximately-LRU cache of ``classify`` results in one JSONL file.
+
+    Agents re-issue the same ``gh … --body-file - <<'EOF'`` shapes many times a
+    session; a hit skips ``bash -n`` and the lexer entirely. The file is a
+    ``{"version": …}`` header line followed by ``[key, status, output]`` lines,
+    appended as verdicts are recorded; a later line for a key supersedes an
+    earlier one, and position in the file is recency. A lookup finds its key's
+    last line with one string search and parses only that line. Past
+    ``CACHE_LIMIT`` the file is rewritten to the newest entries that fit in half
+    of it, so a hit costs no write unless its line has drifted out of that
+    newest half, where it is appended again to outlive the next compaction.
+
+    Keys hash the command together with the classifier's own source, and the
+    header records that source hash too, so editing or upgrading this file
+    invalidates every entry at once. A cached SAFE verdict decides which text
+    the content guards scan, so the cache is only trusted inside a directory
+    and file owned by this user and closed to everyone else; anything
+    unreadable, foreign or malformed is treated as empty, and a failed write is
+    dropped. The cache can cost a lookup, never a verdict: every miss runs
+    ``checked_classify`` exactly as before. The ``bash`` version is not part of
+    the key, and need not be: a syntax verdict that goes stale can only
+    over-block, or SAFE-strip a command that bash would refuse to run.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(__file__, "rb") as source:
+            self.version = hashlib.sha256(source.read()).hexdigest()
+        self.header = json.dumps({"version": self.version})
+        self.text = self.load()
+
+    def key(self, command: str) -> str:
+        material = f"{self.version}\0{command}".encode("utf-8", "surrogatepass")
+        return hashlib.sha256(material).hexdigest()
+
+    def load(self) -> str:
+        """The file's text, or ``""`` unless it is fully trusted and this version's."""
+        try:
+            if not is_private(os.stat(os.path.dirname(self.path) or ".")):
+                return ""
+            descriptor = os.open(self.path, os.O_RDONLY | os.O_NOFOLLOW)
+            with os.fdopen(descriptor, encoding="utf-8") as handle:
+                if not is_private(os.fstat(handle.fileno())):
+                    return ""
+                text = handle.read()
+            header = json.loads(text.partition("\n")[0])
+        except (OSError, ValueError):
+            return ""
+        return text if header == {"version": self.version} else ""
+
+    @staticmethod
+    def parse(line: str) -> tuple[str, tuple[int, str]] | None:
+        try:
+            key, status, output = json.loads(line)
+        except (ValueError, TypeError):
+            return None
+        if status not in (SAFE, UNSUPPORTED, MALFORMED) or not isinstance(output, str):
+            return None
+        return str(key), (status, output)
+
+    def get(self, command: str) -> tuple[int, str] | None:
+        at = self.text.rfind(f'\n["{self.key(command)}",')
+        if at < 0:
+            return None
+        end = self.text.find("\n", at + 1)
+        line = self.text[at + 1 : end if end >= 0 else len(self.text)]
+        entry = self.parse(line)
+        if entry is None:
+            return None
+        if len(self.text) - at - 1 > CACHE_LIMIT // 2:
+            self.append(line)
+        return entry[1]
+
+    def put(self, command: str, verdict: tuple[int, str]) -> None:
+        if len(verdict[1]) > CACHE_ENTRY_LIMIT:
+            return
+        self.append(json.dumps([self.key(command), *verdict]))
+
+    def append(self, line: str) -> None:
+        """Add one line, starting the file or compacting it when due."""
+        if not self.text:
+            self.rewrite([line])
+            return
+        try:
+            descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_NOFOLLOW)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                if not is_private(os.fstat(handle.fileno())):
+                    return
+                handle.write(f"{line}\n")
+        except OSError:
+            return
+        self.text += f"{line}\n"
+        if len(self.text) > CACHE_LIMIT:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file as its newest entries, each once, within half the limit."""
+        entries: dict[str, str] = {}
+        for line in self.text.splitlines()[1:]:
+            entry = self.parse(line)
+            if entry is not None:
+                entries.pop(entry[0], None)
+                entries[entry[0]] = line
+        kept: list[str] = []
+        total = 0
+        for line in reversed(entries.values()):
+            total += len(line) + 1
+            if total > CACHE_LIMIT // 2:
+                break
+            kept.append(line)
+        self.rewrite(kept[::-1])
+
+    def rewrite(self, lines: list[str]) -> None:
+        """Replace the file with a header and ``lines``, atomically."""
+        text = "".join(f"{line}\n" for line in [self.header, *lines])
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not is_private(os.stat(directory)):
+                return
+            descriptor, staged = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                    handle.write(text)
+                os.replace(staged, self.path)
+            except BaseException:
+                os.unlink(staged)
+                raise
+        except OSError:
+            return
+        self.text = text
+
+
+def bash_parses(command: str) -> bool:
+    """True when ``/bin/bash -n`` accepts the command.
+
+    The absolute path is deliberate: the syntax bash will actually run the
+    command with, not whatever ``bash`` is first on PATH. A missing or failing
+    bash reads as a syntax error, which keeps the check fail-closed.
+    """
+    try:
+        result = subprocess.run(
+            ["/bin/bash", "-n"],
+            input=f"{command}\n".encode("utf-8", "surrogateescape"),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
         )
-    ) or unquoted_heredoc_body_has_substitution(logical_command, markers):
-        return MALFORMED
-    if len(markers) > 1:
-        return MALFORMED
-    if markers and not marker_is_closed(logical_command, markers[0]):
-        return MALFORMED
-    return UNSUPPORTED
+    except (OSError, UnicodeEncodeError):
+        return False
+    return result.returncode == 0
+
+
+def checked_classify(command: str) -> tuple[int, str]:
+    """The hook's whole verdict: ``bash -n`` validation, then ``classify``.
+
+    A command bash cannot parse is MALFORMED before any rule runs. This used to
+    be a separate ``printf | /bin/bash -n`` pipeline in parity-safety-net.sh;
+    owning it here saves the hook that fork on every heredoc command, and lets
+    the verdict cache and the daemon answer for it too. Commands ``classify``
+    settles without lexing (no ``<<``, or over ``WORK_BUDGET``) skip the check,
+    because it could not change their verdict.
+    """
+    if "<<" in command and len(command) <= work_budget() and not bash_parses(command):
+        return MALFORMED, ""
+    return classify(command)
+
+
+def cached_classify(command: str) -> tuple[int, str]:
+    """``checked_classify`` behind the verdict cache, when one is configured.
+
+    Commands ``classify`` settles without lexing (no ``<<``, or over
+    ``WORK_BUDGET``) skip the cache: looking them up would cost more.
+    """
+    path = default_cache_path()
+    if path is None or "<<" not in command or len(command) > work_budget():
+        return checked_classify(command)
+    cache = VerdictCache(path)
+    verdict = cache.get(command)
+    if verdict is None:
+        verdict = checked_classify(command)
+        cache.put(command, verdict)
+    return verdict
+
+
+VERDICTS = {SAFE: "SAFE", UNSUPPORTED: "UNSUPPORTED", MALFORMED: "MALFORMED"}
+
+
+def batch_command(record: object) -> str:
+    """The command in one ``--batch`` line.
+
+    Accepts a bare JSON string, ``{"command": …}``, or a recorded PreToolUse
+    payload (``{"tool_input": {"command": …}}``).
+    """
+    if isinstance(record, dict):
+        record = record.get("tool_input", record)
+        if isinstance(record, dict):
+            record = record.get("command")
+    if not isinstance(record, str):
+        raise ValueError("expected a command string")
+    return record
+
+
+def top_level_markers(command: str) -> list[dict[str, object]]:
+    """The here-doc redirections bash would see, as offsets into the command.
+
+    Read from the logical scan, as the rules read them: offsets count from the
+    command with its line continuations collapsed, and a ``<<`` the lex finds
+    inside a quoted string or a here-doc body is text, not a marker.
+    """
+    if "<<" not in command or len(command) > work_budget():
+        return []
+    try:
+        scan = CommandScan(command).logical
+        markers = [
+            marker
+            for marker in scan.markers
+            if scan.quote_state_at(marker.start) == "plain"
+        ]
+    except ValueError:
+        return []
+    return [
+        {
+            "start": marker.start,
+            "end": marker.end,
+            "delimiter": marker.delimiter,
+            "quoted": marker.quoted,
+            "strip_tabs": marker.strip_tabs,
+        }
+        for marker in markers
+    ]
+
+
+def run_batch(source: TextIO, sink: TextIO, rules_only: bool = False) -> int:
+    """Classify newline-delimited JSON commands, one JSON result per line.
+
+    For auditing recorded sessions and diffing verdicts between classifier
+    versions without paying interpreter startup per command. Each result
+    carries the 1-based input ``line``, the ``status`` and its ``verdict``
+    name, the ``sanitized`` text (``""`` unless SAFE), the top-level
+    ``markers``, and ``elapsed_us`` for the classification alone. Verdicts
+    come from ``checked_classify``, so they are exactly the hook's; the verdict
+    cache is bypassed so every timing is a real classification. ``rules_only``
+    (``--rules-only``) calls ``classify`` instead, skipping the ``bash -n``
+    fork that would otherwise dominate both the timings and the run: a command
+    bash cannot parse then gets its rule verdict rather than MALFORMED. A line
+    that is not a command yields ``{"line", "error"}`` and the batch carries
+    on.
+    """
+    classifier = classify if rules_only else checked_classify
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            command = batch_command(json.loads(line))
+        except ValueError as error:
+            result: dict[str, object] = {"line": number, "error": str(error)}
+        else:
+            started = time.perf_counter_ns()
+            status, output = classifier(command)
+            elapsed = time.perf_counter_ns() - started
+            result = {
+                "line": number,
+                "status": status,
+                "verdict": VERDICTS[status],
+                "sanitized": output,
+                "markers": top_level_markers(command),
+                "elapsed_us": elapsed // 1000,
+            }
+        sink.write(json.dumps(result) + "\n")
+    return 0
+
+
+# The ``bash -n`` check and the rules ``classify`` calls directly, in order.
+PROFILED_RULES = (
+    "bash_parses",
+    "classify_safe",
+    "collapse_line_continuations",
+    "writer_has_commented_marker_and_following_code",
+    "writer_owns_real_marker",
+    "has_active_command_substitution",
+    "line_has_allowed_writer",
+    "unquoted_heredoc_body_has_substitution",
+    "marker_is_closed",
+)
+
+
+def profile_rules(timings: dict[str, int]) -> None:
+    """Rebind each rule in ``PROFILED_RULES`` to a copy that times itself.
+
+    ``classify`` resolves the rules as module globals at call time, so this
+    instruments it without a branch on the unprofiled path. Only the outermost
+    rule call is timed (a rule that calls another is charged once), and the
+    lazy ``CommandScan`` lex is charged to whichever rule first reads it.
+    """
+    module = globals()
+    depth = [0]
+
+    def timed(name: str, rule: Callable[..., Any]) -> Callable[..., Any]:
+        def run(*args: Any) -> Any:
+            if depth[0]:
+                return rule(*args)
+            depth[0] += 1
+            started = time.perf_counter_ns()
+            try:
+                return rule(*args)
+            finally:
+                depth[0] -= 1
+                elapsed = (time.perf_counter_ns() - started) // 1000
+                timings[name] = timings.get(name, 0) + elapsed
+
+        return run
+
+    for name in PROFILED_RULES:
+        module[name] = timed(name, module[name])
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv and argv[0] == "--batch" and argv[1:] in ([], ["--rules-only"]):
+        return run_batch(sys.stdin, sys.stdout, rules_only=len(argv) == 2)
+    if argv:
+        raise SystemExit(
+            "usage: parity-safety-net-heredoc.py [--batch [--rules-only]] < input"
+        )
+    command = read_command(sys.stdin, work_budget())
+    # Set by parity-safety-net.sh under LISA_HOOK_PROFILE: the file to leave
+    # this call's rule timings in, for the hook's one profile record.
+    profile = os.environ.get("LISA_HOOK_PROFILE_RULES")
+    timings: dict[str, int] = {}
+    if profile:
+        profile_rules(timings)
+    started = time.perf_counter_ns()
+    # Over the ceiling: the MALFORMED ``classify`` gives an over-budget command.
+    status, output = (MALFORMED, "") if command is None else cached_classify(command)
+    if profile:
+        elapsed = (time.perf_counter_ns() - started) // 1000
+        try:
+            with open(profile, "w", encoding="utf-8") as handle:
+                json.dump({"classify_us": elapsed, "rules_us": timings}, handle)
+        except OSError:
+            pass
+    print(output, end="")
+    return status
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Complexity benchmark for the parity-safety-net heredoc classifier.
+
+The classifier runs inside a PreToolUse hook on every heredoc command, so its
+cost must stay linear in the command no matter how the command is shaped. This
+generates adversarial inputs at doubling sizes, times the classifier's ``main()``
+in-process (stdin/stdout swapped for buffers, so interpreter startup does not
+drown the signal), and prints how each shape's cost grows per doubling: ~2x is
+linear, ~4x is quadratic.
+
+    python3 scripts/bench-heredoc-classifier.py [--max-bytes N] [--check]
+
+Each timing is the median of ``--repeat`` runs, and a shape's growth is judged
+by the slope of a least-squares fit of log time against log size over every
+size, rather than by any one doubling, so a single noisy timing cannot fail
+it. ``--check`` exits 1 when any shape's fitted growth per doubling exceeds
+``--growth-limit``, so the benchmark can gate a change. The classifier's own
+``WORK_BUDGET`` is lifted to the largest size benchmarked so the scaling above
+it is still measured; a final row times one over-budget input under the real
+budget, which must come back MALFORMED without doing the work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import math
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from types import ModuleType
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+CLASSIFIER = os.path.join(
+    REPO_ROOT, "plugins", "src", "base", "hooks", "parity-safety-net-heredoc.py"
+)
+# Below this a timing is mostly noise, so its growth ratio is not judged.
+NOISE_FLOOR = 0.005
+
+
+def repeat_to(unit: str, size: int) -> str:
+    return unit * max(1, size // len(unit))
+
+
+def body_lines(size: int) -> str:
+    return repeat_to("it's a \"quoted\" `tick` $(not run) # not a comment\n", size)
+
+
+SHAPES: dict[str, Callable[[int], str]] = {
+    # The SAFE path: a writer heredoc with a large prose body.
+    "safe-writer-body": lambda size: (
+        "gh pr create --title t --body-file - <<'EOF'\n" + body_lines(size) + "EOF"
+    ),
+    # The same body behind a substitution, which skips SAFE and runs every rule.
+    "commit-body": lambda size: (
+        "git commit -m \"$(cat <<'EOF'\n" + body_lines(size) + "EOF\n)\""
+    ),
+    "unquoted-body": lambda size: "cat <<EOF > out\n" + body_lines(size) + "EOF",
+    "markers-one-line": lambda size: "cat " + repeat_to("<<A ", size),
+    "markers-per-line": lambda size: repeat_to("cat <<A\n", size),
+    "nested-substitution": lambda size: (
+        "x=" + repeat_to("$(", size // 2) + repeat_to(")", size // 2) + " <<EOF\nEOF"
+    ),
+    "ansi-c-run": lambda size: "cat " + repeat_to("$'a\\'b' ", size) + "<<EOF\nEOF",
+    "ansi-c-unterminated": lambda size: "cat <<EOF " + repeat_to("$'\\\\", size),
+    "long-writer-header": lambda size: (
+        "gh pr create " + repeat_to("--body x ", size) + "<<'EOF'\nEOF"
+    ),
+    "line-continuations": lambda size: "cat <<EOF\n" + repeat_to("a\\\n", size) + "EOF",
+}
+
+
+def load_classifier(path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("parity_safety_net_heredoc", path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"cannot load classifier from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_main(classifier: ModuleType, command: str, repeat: int) -> tuple[float, int]:
+    """Median wall time of ``repeat`` runs of ``main()`` on ``command``, and status."""
+    timings = []
+    status = -1
+    for _ in range(max(1, repeat)):
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(command)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                status = classifier.main()
+                timings.append(time.perf_counter() - started)
+        finally:
+            sys.stdin = stdin
+    return statistics.median(timings), status
+
+
+def fitted_growth(points: list[tuple[int, float]]) -> float | None:
+    """Growth per doubling from a log-log least-squares fit, or None if unjudgeable.
+
+    Timings under ``NOISE_FLOOR`` are left out; at least three must remain.
+    """
+    kept = [
+        (math.log2(size), math.log2(elapsed))
+        for size, elapsed in points
+        if elapsed >= NOISE_FLOOR
+    ]
+    if len(kept) < 3:
+        return None
+    mean_x = statistics.fmean(x for x, _ in kept)
+    mean_y = statistics.fmean(y for _, y in kept)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in kept)
+    slope = covariance / sum((x - mean_x) ** 2 for x, _ in kept)
+    return 2**slope
+
+
+def sizes_between(low: int, high: int) -> list[int]:
+    sizes = []
+    size = low
+    while size <= high:
+        sizes.append(size)
+        size *= 2
+    return sizes
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classifier", default=CLASSIFIER)
+    parser.add_argument("--min-bytes", type=int, default=16 * 1024)
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--shape",
+        action="append",
+        choices=sorted(SHAPES),
+        help="Benchmark only this shape (repeatable; default: all).",
+    )
+    parser.add_argument("--growth-limit", type=float, default=3.0)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if any shape's fitted growth per doubling exceeds --growth-limit.",
+    )
+    args = parser.parse_args(argv)
+
+    # Best-of-N timing would otherwise measure verdict-cache hits, not the lexer.
+    os.environ["LISA_SAFETY_NET_VERDICT_CACHE"] = "off"
+    classifier = load_classifier(args.classifier)
+    budget = classifier.WORK_BUDGET
+    sizes = sizes_between(args.min_bytes, args.max_bytes)
+    # Generated commands run a little past their nominal size; leave headroom.
+    classifier.WORK_BUDGET = max(budget, 2 * sizes[-1])
+
+    failures = []
+    print(f"{'shape':<22} {'bytes':>9} {'status':>6} {'ms':>10} {'us/KiB':>8} {'growth':>7}")
+    for name in args.shape or SHAPES:
+        previous = None
+        points = []
+        for size in sizes:
+            command = SHAPES[name](size)
+            elapsed, status = time_main(classifier, command, args.repeat)
+            growth = ""
+            if previous is not None and previous >= NOISE_FLOOR:
+                growth = f"{elapsed / previous:.2f}x"
+            print(
+                f"{name:<22} {len(command):>9} {status:>6} {elapsed * 1000:>10.2f}"
+                f" {elapsed * 1e6 / (len(command) / 1024):>8.1f} {growth:>7}"
+            )
+            previous = elapsed
+            points.append((len(command), elapsed))
+        fitted = fitted_growth(points)
+        if fitted is not None:
+            print(f"{name:<22} {'fitted growth per doubling':>42} {fitted:.2f}x")
+            if fitted > args.growth_limit:
+                failures.append(f"{name} grows {fitted:.2f}x per doubling (fitted)")
+        print()
+
+    classifier.WORK_BUDGET = budget
+    over = "cat <<EOF\n" + "x" * budget + "\nEOF"
+    elapsed, status = time_main(classifier, over, args.repeat)
+    print(f"{'over-budget':<22} {len(over):>9} {status:>6} {elapsed * 1000:>10.3f}")
+    if status != classifier.MALFORMED:
+        failures.append(f"over-budget input returned {status}, not MALFORMED")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if args.check and failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
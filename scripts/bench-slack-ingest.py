@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""End-to-end throughput benchmark for the Slack connector.
+
+Runs the real ``ingest_slack_channel.py`` as a subprocess against
+``scripts/slack-api-stand-in.py`` serving a synthetic channel, once per channel
+size, and reports wall time, API calls per second, messages per second and the
+connector's peak RSS. Slack's per-tier pacing is lifted with ``--tier-rate`` so
+the numbers measure the connector and the simulated network, not the rate
+limiter; ``--paced`` keeps the real tiers.
+
+    python3 scripts/bench-slack-ingest.py [--sizes 1000 10000 100000] [--latency-ms 25]
+    python3 scripts/bench-slack-ingest.py --sizes 10000 -- --backfill-windows 4
+
+Arguments after ``--`` are passed to the connector. ``--rate-limit-every`` and
+``--retry-after`` inject 429s. A run whose proposed cursor does not count every
+message is reported and makes the benchmark exit 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import ModuleType
+from typing import Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+CONNECTOR = os.path.join(REPO_ROOT, "plugins", "src", "wiki", "scripts", "ingest_slack_channel.py")
+STAND_IN = os.path.join(REPO_ROOT, "scripts", "slack-api-stand-in.py")
+UNPACED = [f"--tier-rate={tier}=1000000" for tier in (1, 2, 3, 4)]
+
+
+def load_stand_in(path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("slack_api_stand_in", path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"cannot load stand-in from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb(max_rss: int) -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_size(stand_in: ModuleType, size: int, args: argparse.Namespace) -> dict[str, Any]:
+    server = stand_in.StandIn(
+        ("127.0.0.1", 0),
+        stand_in.synthetic_workspace(size, args.thread_every, args.replies),
+        latency=args.latency_ms / 1000,
+        max_page_size=args.page_size,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-slack-ingest-") as work:
+            meta = os.path.join(work, "meta.json")
+            command = [
+                sys.executable,
+                args.connector,
+                "--channel",
+                stand_in.CHANNEL,
+                "--token",
+                "xoxp-bench",
+                "--api-base",
+                server.base_url,
+                "--limit",
+                str(args.page_size),
+                "--source-dir",
+                os.path.join(work, "sources"),
+                "--state-dir",
+                os.path.join(work, "state"),
+                "--emit-meta",
+                meta,
+                *([] if args.paced else UNPACED),
+                *args.connector_args,
+            ]
+            with open(os.path.join(work, "output.txt"), "w+", encoding="utf-8") as output:
+                started = time.perf_counter()
+                process = subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT)
+                _, status, usage = os.wait4(process.pid, 0)
+                elapsed = time.perf_counter() - started
+                process.returncode = os.waitstatus_to_exitcode(status)
+                output.seek(0)
+                log = output.read()
+            cursor = {}
+            if process.returncode == 0:
+                with open(meta, encoding="utf-8") as handle:
+                    cursor = json.load(handle)["proposedCursor"]
+            note_bytes = sum(entry.stat().st_size for entry in os.scandir(os.path.join(work, "sources")) if entry.is_file())
+    finally:
+        server.shutdown()
+        server.server_close()
+    requests = server.requests
+    return {
+        "messages": size,
+        "status": process.returncode,
+        "ingested": cursor.get("last_message_count"),
+        "replies": cursor.get("last_thread_reply_count"),
+        "wall_seconds": round(elapsed, 3),
+        "requests": requests,
+        "calls": dict(server.calls),
+        "rate_limited": server.rate_limited,
+        "calls_per_second": round(requests / elapsed, 1),
+        "messages_per_second": round(size / elapsed, 1),
+        "peak_rss_mb": round(peak_rss_mb(usage.ru_maxrss), 1),
+        "received_mb": round(server.bytes_sent / 1e6, 2),
+        "note_mb": round(note_bytes / 1e6, 2),
+        "log": log if process.returncode else "",
+    }
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connector", default=CONNECTOR)
+    parser.add_argument("--stand-in", default=STAND_IN)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="Simulated round-trip latency per request.")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--thread-every", type=int, default=20)
+    parser.add_argument("--replies", type=int, default=3)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with a 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--paced", action="store_true", help="Keep Slack's real per-tier pacing.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per size instead of a table.")
+    parser.add_argument("connector_args", nargs=argparse.REMAINDER, help="After --: extra connector arguments.")
+    args = parser.parse_args(argv)
+    if args.connector_args[:1] == ["--"]:
+        args.connector_args = args.connector_args[1:]
+
+    stand_in = load_stand_in(args.stand_in)
+    failures = []
+    if not args.json:
+        print(f"{'messages':>9} {'wall s':>8} {'requests':>9} {'429s':>5} {'calls/s':>8} {'msgs/s':>9} {'peak MB':>8} {'note MB':>8}")
+    for size in args.sizes:
+        row = run_size(stand_in, size, args)
+        if row["status"] != 0 or row["ingested"] != size:
+            failures.append(f"{size}: exit {row['status']}, ingested {row['ingested']}\n{row['log']}")
+        if args.json:
+            print(json.dumps({key: value for key, value in row.items() if key != "log"}))
+        else:
+            print(
+                f"{size:>9} {row['wall_seconds']:>8.2f} {row['requests']:>9} {row['rate_limited']:>5}"
+                f" {row['calls_per_second']:>8.1f} {row['messages_per_second']:>9.1f}"
+                f" {row['peak_rss_mb']:>8.1f} {row['note_mb']:>8.2f}"
+            )
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -19,6 +19,8 @@ const canonicalHookDir = path.join(repoRoot, "plugins", "src", "base", "hooks");
 const canonicalSupportFiles = [
   "parity-safety-net.sh",
   "parity-safety-net-heredoc.py",
+  "parity-safety-net-guards.py",
+  "parity-safety-net-heredoc-daemon.py",
 ];
 
 fs.rmSync(destDir, { recursive: true, force: true });
@@ -230,7 +230,12 @@ const AGY_PLUGIN_HOOKS = [
     event: "PreToolUse",
     matcher: "run_command",
     agyScript: "parity-safety-net.agy.sh",
-    supportScripts: ["parity-safety-net.sh", "parity-safety-net-heredoc.py"],
+    supportScripts: [
+      "parity-safety-net.sh",
+      "parity-safety-net-heredoc.py",
+      "parity-safety-net-heredoc-daemon.py",
+      "parity-safety-net-guards.py",
+    ],
   },
   {
     sourceScript: "block-shell-json-parsing.sh",
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Slack Web API, for running the Slack connector offline.
+
+Serves ``auth.test``, ``conversations.list``/``info``/``history``/``replies`` and
+``users.list`` from a fixture workspace, in the same JSON shape as the
+connector's test harness:
+``{"auth", "channels", "users", "history": {channel: [messages]},
+"replies": {channel: {thread_ts: [replies]}}}``. History pages newest first and
+honours ``oldest``, ``latest`` and ``inclusive``. Every list pages on an opaque
+``next_cursor``, and responses are gzipped when the client asks. Each response
+can be delayed by ``--latency-ms``, pages are capped at ``--max-page-size``, and
+every ``--rate-limit-every``-th request is refused with a 429 carrying
+``Retry-After: --retry-after``.
+
+    python3 scripts/slack-api-stand-in.py --fixture workspace.json [--port 8765]
+    python3 scripts/slack-api-stand-in.py --synthetic 10000 --latency-ms 40
+
+Then point the connector at the printed base URL with ``--api-base`` (or
+``SLACK_API_BASE``). ``--synthetic N`` serves one channel, ``C0BENCH``, of N
+messages, every ``--thread-every``-th of which opens a thread.
+``scripts/bench-slack-ingest.py`` drives the connector against this server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import bisect
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+CHANNEL = "C0BENCH"
+WORDS = (
+    "deploy review merge the a staging prod rollback ticket incident metrics dashboard "
+    "latency flaky test branch release config customer alert retry queue worker cache"
+).split()
+
+
+def synthetic_workspace(
+    messages: int,
+    thread_every: int = 20,
+    replies: int = 3,
+    users: int = 50,
+    start: int = 1_600_000_000,
+) -> dict[str, Any]:
+    """One channel of ``messages`` messages a minute apart, deterministic across runs."""
+    rng = random.Random(0)
+    history = []
+    threads = {}
+    for index in range(messages):
+        ts = f"{start + index * 60}.000100"
+        message = {
+            "type": "message",
+            "ts": ts,
+            "user": f"U{index % users:05d}",
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30))),
+        }
+        if thread_every and replies and index % thread_every == 0:
+            thread = [
+                {
+                    "type": "message",
+                    "ts": f"{start + index * 60 + offset}.000200",
+                    "thread_ts": ts,
+                    "user": f"U{(index + offset) % users:05d}",
+                    "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 12))),
+                }
+                for offset in range(1, replies + 1)
+            ]
+            message.update(thread_ts=ts, reply_count=len(thread), latest_reply=thread[-1]["ts"])
+            threads[ts] = thread
+        history.append(message)
+    return {
+        "auth": {"team_id": "T0STANDIN", "url": "https://stand-in.slack.com/"},
+        "channels": [{"id": CHANNEL, "name": "bench", "created": start, "is_member": True}],
+        "users": [{"id": f"U{n:05d}", "name": f"user{n}", "real_name": f"User {n}"} for n in range(users)],
+        "history": {CHANNEL: history},
+        "replies": {CHANNEL: threads},
+    }
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> int:
+    if not cursor:
+        return 0
+    return int(base64.urlsafe_b64decode(cursor.encode()).decode().split(":", 1)[1])
+
+
+class StandIn(ThreadingHTTPServer):
+    """The stand-in server; ``calls`` counts answered requests per method."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workspace: dict[str, Any],
+        latency: float = 0.0,
+        max_page_size: int = 1000,
+        rate_limit_every: int = 0,
+        retry_after: float = 1.0,
+    ) -> None:
+        super().__init__(address, Handler)
+        self.workspace = workspace
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        # Oldest first, with the float timestamps alongside for bisecting.
+        self.history = {
+            channel: sorted(messages, key=lambda message: float(message["ts"]))
+            for channel, messages in workspace.get("history", {}).items()
+        }
+        self.stamps = {channel: [float(message["ts"]) for message in messages] for channel, messages in self.history.items()}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.calls: Counter[str] = Counter()
+        self.rate_limited = 0
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def admit(self, method: str) -> bool:
+        """Count the request; False when it is one to refuse with a 429."""
+        with self.lock:
+            self.requests += 1
+            if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+                self.rate_limited += 1
+                return False
+            self.calls[method] += 1
+            return True
+
+    def page(self, items: list[Any], params: dict[str, str], key: str) -> dict[str, Any]:
+        start = decode_cursor(params.get("cursor"))
+        size = max(1, min(int(params.get("limit") or 100), self.max_page_size))
+        more = start + size < len(items)
+        return {
+            "ok": True,
+            key: items[start : start + size],
+            "has_more": more,
+            "response_metadata": {"next_cursor": encode_cursor(start + size) if more else ""},
+        }
+
+    def channel(self, channel_id: str | None) -> dict[str, Any] | None:
+        return next((channel for channel in self.workspace.get("channels", []) if channel["id"] == channel_id), None)
+
+    def answer(self, method: str, params: dict[str, str]) -> dict[str, Any]:
+        if method == "auth.test":
+            return {"ok": True, **self.workspace.get("auth", {})}
+        if method == "conversations.list":
+            return self.page(self.workspace.get("channels", []), params, "channels")
+        if method == "users.list":
+            return self.page(self.workspace.get("users", []), params, "members")
+        channel_id = params.get("channel")
+        channel = self.channel(channel_id)
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        if method == "conversations.info":
+            return {"ok": True, "channel": channel}
+        if method == "conversations.history":
+            return self.history_page(channel["id"], params)
+        if method == "conversations.replies":
+            thread = self.workspace.get("replies", {}).get(channel["id"], {}).get(params.get("ts"))
+            parent = [message for message in self.history.get(channel["id"], []) if message["ts"] == params.get("ts")]
+            if thread is None or not parent:
+                return {"ok": False, "error": "thread_not_found"}
+            return self.page(parent + thread, params, "messages")
+        return {"ok": False, "error": "unknown_method"}
+
+    def history_page(self, channel_id: str, params: dict[str, str]) -> dict[str, Any]:
+        messages = self.history.get(channel_id, [])
+        stamps = self.stamps.get(channel_id, [])
+        oldest = float(params.get("oldest") or 0)
+        latest = float(params.get("latest") or "inf")
+        if params.get("inclusive") == "true":
+            low, high = bisect.bisect_left(stamps, oldest), bisect.bisect_right(stamps, latest)
+        else:
+            low, high = bisect.bisect_right(stamps, oldest), bisect.bisect_left(stamps, latest)
+        # Newest first: offset ``n`` is the n-th newest message in range.
+        offset = decode_cursor(params.get("cursor"))
+        size = max(1, min(int(params.get("limit") or 100), self.max_page_size))
+        stop = high - offset
+        chunk = messages[max(low, stop - size) : max(low, stop)][::-1]
+        more = stop - size > low
+        return {
+            "ok": True,
+            "messages": chunk,
+            "has_more": more,
+            "response_metadata": {"next_cursor": encode_cursor(offset + size) if more else ""},
+        }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandIn
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+        params = dict(urllib.parse.parse_qsl(body))
+        method = self.path.rsplit("/", 1)[-1]
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if not self.server.admit(method):
+            self.send_response(429)
+            self.send_header("Retry-After", f"{self.server.retry_after:g}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            payload: dict[str, Any] = {"ok": False, "error": "not_authed"}
+        else:
+            payload = self.server.answer(method, params)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.server.lock:
+            self.server.bytes_sent += len(data)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", help="Workspace JSON to serve (the connector test harness's shape).")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Serve a generated channel of N messages.")
+    parser.add_argument("--thread-every", type=int, default=20)
+    parser.add_argument("--replies", type=int, default=3, help="Replies per synthetic thread.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int, default=1000)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Refuse every Nth request with a 429 (0: never).")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on an injected 429.")
+    args = parser.parse_args(argv)
+
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as handle:
+            workspace = json.load(handle)
+    else:
+        workspace = synthetic_workspace(args.synthetic, args.thread_every, args.replies)
+    server = StandIn(
+        (args.host, args.port),
+        workspace,
+        latency=args.latency_ms / 1000,
+        max_page_size=args.max_page_size,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+    )
+    print(f"Slack API stand-in at {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
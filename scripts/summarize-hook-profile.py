@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Summarize a parity-safety-net latency profile.
+
+``LISA_HOOK_PROFILE=<file>`` makes ``parity-safety-net.sh`` append one JSON
+line per screened command: wall time per phase (intake, classifier, normalize,
+guard_engine / guards, custom_rules), the heredoc classifier's in-process time
+and per-rule times (its ``bash -n`` check is the ``bash_parses`` rule), the
+verdict, and the exit status. This prints p50/p95/p99 per phase and per
+classifier rule, so it is clear whether latency goes to interpreter startup,
+``bash -n``, the rules, or the guards.
+
+    python3 scripts/summarize-hook-profile.py [profile.jsonl ...]
+
+Reads stdin when no file is given. Times are printed in milliseconds. A phase's
+sample count is the number of records that reached it, not the total.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fileinput
+import json
+import math
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered: list[int], rank: int) -> int:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+def collect(lines: Iterable[str]) -> tuple[dict[str, list[int]], Counter[str], int]:
+    """Samples per row label (microseconds), verdict counts, and bad lines."""
+    samples: dict[str, list[int]] = defaultdict(list)
+    verdicts: Counter[str] = Counter()
+    skipped = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            samples["total"].append(int(record["total_us"]))
+            for phase, elapsed in record["phases_us"].items():
+                samples[f"phase {phase}"].append(int(elapsed))
+            classifier = record.get("classifier") or {}
+            if "classify_us" in classifier:
+                samples["classify (in-process)"].append(int(classifier["classify_us"]))
+            for rule, elapsed in classifier.get("rules_us", {}).items():
+                samples[f"rule {rule}"].append(int(elapsed))
+            verdicts[f"{record['verdict']} exit={record['exit']}"] += 1
+        except (ValueError, KeyError, TypeError, AttributeError):
+            skipped += 1
+    return samples, verdicts, skipped
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("profiles", nargs="*", help="Profile files (default: stdin).")
+    args = parser.parse_args(argv)
+
+    with fileinput.input(args.profiles, encoding="utf-8") as lines:
+        samples, verdicts, skipped = collect(lines)
+    if not samples:
+        print("no profile records", file=sys.stderr)
+        return 1
+
+    width = max(len(label) for label in samples)
+    header = " ".join(f"{f'p{rank} ms':>9}" for rank in PERCENTILES)
+    print(f"{'':<{width}} {'n':>7} {header}")
+    for label, values in samples.items():
+        ordered = sorted(values)
+        cells = " ".join(
+            f"{percentile(ordered, rank) / 1000:>9.2f}" for rank in PERCENTILES
+        )
+        print(f"{label:<{width}} {len(ordered):>7} {cells}")
+    print()
+    for verdict, count in verdicts.most_common():
+        print(f"{count:>7}  {verdict}")
+    if skipped:
+        print(f"skipped {skipped} unreadable line(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
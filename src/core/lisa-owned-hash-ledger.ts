@@ -367,22 +367,26 @@ export const LISA_OWNED_HASH_LEDGER: Readonly<
     "90601e31603c440d8f19d213d63bfef8d18596c60f88cb6e28c93d12453c5c0c",
   ]),
   "scripts/lisa-hooks/parity-safety-net.sh": Object.freeze([
+    "02da0d6b7d039868727056a1a570b406df58cff900fe9783e659a2093bc075b2",
     "062c69eea85157f1e941ec3626d8912aa9f182af6ccdbe19687588a6074db5ce",
     "07002535de10d89f6d73e8922517550a02a8974549aaf200c9c314e6f4f83c70",
     "1162ffd16cef3b23282d2f5207abcb88429462a74a9df1035f0df4968f6dd456",
     "14fc5e292aebf83dd24fec12fb32e2beb509a9324f127a24a64d5c5d4d05c576",
     "1bf3512bb94923a6cb25b1e7a619a3fc8e1336bffa16f499b459aaee3eaed66d",
     "1d4fbe135f1bb4e861d286a6512ed201d4522250dfe3f9eba6584bc5ff166a95",
+    "20fa346e61fba3510bb8b40d08fa4580850d842046a7c819b9ee19c06bbaa7ee",
     "388cf8847581d96a1ff8ea98290a33a5f96d67cdd502ea807a0b8d88efe90e19",
     "64546813f168fb446f39e34bc674fd3af85b15bd5e7f4f6bf4503463e701a7b9",
     "772202ddd42d626625ff719666afbbe83445d8bae1bc7c0fb5ffdcb402be83f8",
     "7f55986eb29f8ace8616595da4bbe60d80a96f9f29b24fb72efd66bb96b22464",
+    "7fc6c6d79a490226955804fe3874c1ddfaef11d263b5f58c66a5d5dcb7352509",
     "8e19d5f1ba7abe3d22fbee47ff8e0fad76b965ccca20b8849e3c43ab07d9a4ef",
     "a22fd1b7c483f1a538202353ee85c82be17a8910e03c0a930635ce8cb3595c64",
     "b83c5043a0f29b2d8851258acfe6906aab7922cd80f486e25220e55f26a8c0a5",
     "caea02a07027fc1c74d47e08b36299d369c5c9f7c4043da8828fbca3c64eb2aa",
     "d12583803e8ff5e4b64e68eafc8d3c377af4c400d8b7ecd1c7fe699d8f92784a",
     "d9ea58150aa27e7f0aa9a4ef155ed446d30bdfc932d01c64e2b8ca211aa0de7b",
+    "f281e40757e34c5a2f39d78b3a95084b4db54f20a96fa0347c9463c1181e407b",
     "f740f600b255742a50f28e5c9d09427c5783c4084e84052dca46bc1f0c94a187",
     "fa8f4a6517eacd9266feb7afd62398cdf2075d4824cac24b45bb64ad0cd18c86",
   ]),
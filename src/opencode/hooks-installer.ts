@@ -76,6 +76,8 @@ const NO_VERIFY_DENY_PATTERNS: Readonly<Record<string, "deny">> = {
 const PLUGIN_SUPPORT_FILES = [
   "parity-safety-net.sh",
   "parity-safety-net-heredoc.py",
+  "parity-safety-net-guards.py",
+  "parity-safety-net-heredoc-daemon.py",
 ] as const;
 
 /** Result of the OpenCode hooks install pass */
@@ -0,0 +1,242 @@
+/**
+ * Harness for driving the REAL ingest_slack_channel.py connector in tests.
+ *
+ * Runs the connector's `main()` in a python3 subprocess with `SlackClient.call`
+ * answered from an in-memory fixture workspace, so no test ever reaches
+ * slack.com. History and replies are paged the way Slack pages them (newest
+ * first, `next_cursor` until exhausted, thread parent first in replies), and
+ * every API call the connector makes is recorded for assertions and counted
+ * in the client's stats as a real call would be. `failAfter` cuts a method off
+ * mid-run to simulate an outage. Attachment downloads are served from
+ * `downloads` and recorded as `GET` calls.
+ * @module tests/helpers/slack-ingest-harness
+ */
+import { spawnSync } from "node:child_process";
+import { readFileSync, writeFileSync } from "node:fs";
+import path from "node:path";
+
+const SCRIPT_PATH = path.resolve(
+  "plugins/src/wiki/scripts/ingest_slack_channel.py"
+);
+const PYTHON_BIN = process.env.PYTHON ?? "python3";
+
+/**
+ * Python driver: loads the connector, swaps in the fixture client, runs main().
+ * argv: connector path, fixture path, calls-out path, then connector args.
+ */
+const DRIVER = String.raw`
+import importlib.util, json, sys
+
+spec = importlib.util.spec_from_file_location("slack_ingest", sys.argv[1])
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+workspace = json.load(open(sys.argv[2], encoding="utf-8"))
+calls_path = sys.argv[3]
+calls = []
+served = {}
+
+
+def page(items, params):
+    start = int(params.get("cursor") or 0)
+    size = int(params.get("limit") or 100)
+    chunk = items[start : start + size]
+    more = start + size < len(items)
+    return chunk, {"next_cursor": str(start + size) if more else ""}
+
+
+class FixtureClient(mod.SlackClient):
+    def call(self, method, params=None, retries=5):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        calls.append([method, params])
+        self.record(method, calls=1)
+        served[method] = served.get(method, 0) + 1
+        if served[method] > workspace.get("failAfter", {}).get(method, float("inf")):
+            raise RuntimeError(f"fixture outage on {method}")
+        if method == "auth.test":
+            return {"ok": True, **workspace.get("auth", {})}
+        if method == "conversations.info":
+            for channel in workspace["channels"]:
+                if channel["id"] == params["channel"]:
+                    return {"ok": True, "channel": channel}
+            raise RuntimeError("channel_not_found")
+        if method == "conversations.list":
+            chunk, meta = page(workspace["channels"], params)
+            return {"ok": True, "channels": chunk, "response_metadata": meta}
+        if method == "conversations.history":
+            oldest = float(params.get("oldest") or 0)
+            latest = float(params.get("latest") or "inf")
+            inclusive = params.get("inclusive") == "true"
+            history = [
+                message
+                for message in workspace["history"].get(params["channel"], [])
+                if (oldest <= float(message["ts"]) <= latest if inclusive else oldest < float(message["ts"]) < latest)
+            ]
+            history.sort(key=lambda message: float(message["ts"]), reverse=True)
+            chunk, meta = page(history, params)
+            return {"ok": True, "messages": chunk, "response_metadata": meta}
+        if method == "users.list":
+            chunk, meta = page(workspace.get("users", []), params)
+            return {"ok": True, "members": chunk, "response_metadata": meta}
+        if method == "conversations.replies":
+            thread = workspace["replies"][params["channel"]][params["ts"]]
+            parent = [m for m in workspace["history"][params["channel"]] if m["ts"] == params["ts"]]
+            chunk, meta = page(parent + thread, params)
+            return {"ok": True, "messages": chunk, "response_metadata": meta}
+        raise RuntimeError(f"unexpected Slack method {method}")
+
+
+class FixtureFiles(mod.FileStore):
+    def get(self, url, sink):
+        calls.append(["GET", {"url": url}])
+        if url not in workspace.get("downloads", {}):
+            raise OSError("HTTP 404 Not Found")
+        sink(workspace["downloads"][url].encode("utf-8"))
+        return "application/octet-stream"
+
+
+mod.SlackClient = FixtureClient
+mod.FileStore = FixtureFiles
+sys.argv = ["ingest_slack_channel.py", *sys.argv[4:]]
+try:
+    status = mod.main()
+finally:
+    json.dump(calls, open(calls_path, "w", encoding="utf-8"))
+sys.exit(status)
+`;
+
+/** A Slack message as the fixture workspace serves it. */
+export interface SlackMessage {
+  readonly ts: string;
+  readonly user?: string;
+  readonly text?: string;
+  readonly thread_ts?: string;
+  readonly reply_count?: number;
+  readonly latest_reply?: string;
+  readonly [key: string]: unknown;
+}
+
+/** A channel as `conversations.list` and `conversations.info` return it. */
+export interface SlackChannel {
+  readonly id: string;
+  readonly name: string;
+  readonly is_member?: boolean;
+  readonly created?: number;
+}
+
+/** A member as `users.list` returns it. */
+export interface SlackUser {
+  readonly id: string;
+  readonly name: string;
+  readonly real_name?: string;
+  readonly profile?: {
+    readonly display_name?: string;
+    readonly real_name?: string;
+  };
+}
+
+/** The workspace a fixture client answers from. */
+export interface SlackWorkspace {
+  readonly auth?: { readonly team_id: string; readonly url: string };
+  readonly channels: readonly SlackChannel[];
+  readonly users?: readonly SlackUser[];
+  readonly history: Record<string, readonly SlackMessage[]>;
+  readonly replies: Record<string, Record<string, readonly SlackMessage[]>>;
+  /** Per method: calls answered before every later one fails, like an outage. */
+  readonly failAfter?: Record<string, number>;
+  /** Attachment bodies by download URL; any other URL answers 404. */
+  readonly downloads?: Record<string, string>;
+}
+
+/** One recorded API call: method and the non-null params it was sent. */
+export type SlackCall = readonly [string, Record<string, unknown>];
+
+/** Exit status, output and API calls captured from one connector run. */
+export interface IngestRun {
+  readonly status: number | null;
+  readonly stdout: string;
+  readonly stderr: string;
+  readonly calls: readonly SlackCall[];
+}
+
+/**
+ * Runs the connector against a fixture workspace.
+ * @param dir - Working directory; the fixture and call log are written here.
+ * @param workspace - What the fixture client serves.
+ * @param args - Connector arguments (a token is supplied unless given).
+ * @returns The run's status, output and recorded calls.
+ */
+export const runIngest = (
+  dir: string,
+  workspace: SlackWorkspace,
+  args: readonly string[]
+): IngestRun => {
+  const fixturePath = path.join(dir, "slack-workspace.json");
+  const callsPath = path.join(dir, "slack-calls.json");
+  writeFileSync(fixturePath, JSON.stringify(workspace));
+  writeFileSync(callsPath, "[]");
+  const result = spawnSync(
+    PYTHON_BIN,
+    [
+      "-c",
+      DRIVER,
+      SCRIPT_PATH,
+      fixturePath,
+      callsPath,
+      ...(args.includes("--token") ? [] : ["--token", "xoxp-fixture"]),
+      ...args,
+    ],
+    { cwd: dir, encoding: "utf8" }
+  );
+  return {
+    status: result.status,
+    stdout: result.stdout,
+    stderr: result.stderr,
+    calls: JSON.parse(readFileSync(callsPath, "utf8")) as SlackCall[],
+  };
+};
+
+/**
+ * Runs a Python snippet with the connector module loaded as `mod`.
+ * @param snippet - Python source; whatever it prints is returned.
+ * @returns The snippet's exit status, stdout and stderr.
+ */
+export const runConnectorPython = (
+  snippet: string
+): { status: number | null; stdout: string; stderr: string } => {
+  const result = spawnSync(
+    PYTHON_BIN,
+    [
+      "-c",
+      [
+        "import importlib.util, sys",
+        "spec = importlib.util.spec_from_file_location('slack_ingest', sys.argv[1])",
+        "mod = importlib.util.module_from_spec(spec)",
+        "spec.loader.exec_module(mod)",
+        snippet,
+      ].join("\n"),
+      SCRIPT_PATH,
+    ],
+    { encoding: "utf8" }
+  );
+  return {
+    status: result.status,
+    stdout: result.stdout,
+    stderr: result.stderr,
+  };
+};
+
+/**
+ * A channel of `count` top-level messages, one second apart from `start`.
+ * @param count - Number of messages.
+ * @param start - Epoch seconds of the first message.
+ * @returns Messages in ascending ts order.
+ */
+export const messagesFrom = (
+  count: number,
+  start = 1_700_000_000
+): SlackMessage[] =>
+  Array.from({ length: count }, (_, index) => ({
+    ts: `${start + index}.000100`,
+    user: `U${index % 7}`,
+    text: `message ${index}`,
+  }));
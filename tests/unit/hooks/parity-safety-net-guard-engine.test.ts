@@ -0,0 +1,149 @@
+/**
+ * In-process guard engine for parity-safety-net.sh.
+ *
+ * parity-safety-net-guards.py evaluates the built-in guards in one Python
+ * process; the shell keeps its own grep/sed guards as the fallback when the
+ * engine is absent or defers. These tests pin that the engine really answers,
+ * that it agrees with the shell fallback on every stateless fixture (status
+ * AND reason), and that the fallback and custom rules still apply.
+ * @module tests/unit/hooks/parity-safety-net-guard-engine
+ */
+import { spawnSync } from "node:child_process";
+import {
+  chmodSync,
+  cpSync,
+  mkdirSync,
+  mkdtempSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import {
+  PROJECT_DIR_TOKEN,
+  STATELESS_FIXTURES,
+} from "../../helpers/safety-net-guard-fixtures";
+import {
+  EXIT_ALLOWED,
+  EXIT_BLOCKED,
+} from "../../helpers/safety-net-guard-harness";
+
+const HOOK_DIR = path.resolve("plugins/lisa/hooks");
+const HOOK_NAME = "parity-safety-net.sh";
+const ENGINE_NAME = "parity-safety-net-guards.py";
+const STASH_REASON = "git stash drop/clear destroys stashed work";
+const ENGINE_SIZE_LIMIT = 64 * 1024;
+const ENGINE_DEFER = 3;
+
+/** Outcome of one hook invocation. */
+interface HookResult {
+  readonly status: number | null;
+  readonly stderr: string;
+}
+
+/**
+ * Runs a copy of the hook on a Bash command.
+ * @param hookDir - Directory holding parity-safety-net.sh and its helpers.
+ * @param command - The Bash command under test.
+ * @param options - Working directory and extra environment.
+ * @param options.cwd - Directory the hook runs in.
+ * @param options.env - Variables layered over the scrubbed environment.
+ * @returns Exit status and stderr.
+ */
+const runHookIn = (
+  hookDir: string,
+  command: string,
+  options: { cwd: string; env?: Record<string, string> }
+): HookResult => {
+  const baseEnv = Object.fromEntries(
+    Object.entries(process.env).filter(([key]) => !key.startsWith("GIT_"))
+  );
+  const result = spawnSync("/bin/bash", [path.join(hookDir, HOOK_NAME)], {
+    input: JSON.stringify({ tool_name: "Bash", tool_input: { command } }),
+    encoding: "utf8",
+    cwd: options.cwd,
+    env: { ...baseEnv, CLAUDE_PROJECT_DIR: options.cwd, ...options.env },
+  });
+  return { status: result.status, stderr: result.stderr };
+};
+
+describe("parity-safety-net.sh — in-process guard engine", () => {
+  let workRoot: string;
+  let projectDir: string;
+  let shellOnlyDir: string;
+
+  beforeAll(() => {
+    workRoot = mkdtempSync(path.join(tmpdir(), "safety-net-engine-"));
+    projectDir = path.join(workRoot, "project");
+    mkdirSync(projectDir);
+    shellOnlyDir = path.join(workRoot, "shell-only");
+    cpSync(HOOK_DIR, shellOnlyDir, { recursive: true });
+    rmSync(path.join(shellOnlyDir, ENGINE_NAME));
+  });
+
+  afterAll(() => {
+    rmSync(workRoot, { recursive: true, force: true });
+  });
+
+  it("answers the built-in guards without the shell's grep pipeline", () => {
+    const stubBin = path.join(workRoot, "bin");
+    mkdirSync(stubBin, { recursive: true });
+    const stub = path.join(stubBin, "grep");
+    writeFileSync(stub, "#!/bin/sh\nexit 1\n");
+    chmodSync(stub, 0o755);
+    const { status, stderr } = runHookIn(HOOK_DIR, "git stash drop", {
+      cwd: projectDir,
+      env: { PATH: `${stubBin}:${process.env.PATH ?? ""}` },
+    });
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(STASH_REASON);
+  });
+
+  it.each(STATELESS_FIXTURES)(
+    "$id agrees with the shell fallback on $command",
+    fixture => {
+      const command = fixture.command.split(PROJECT_DIR_TOKEN).join(projectDir);
+      const engine = runHookIn(HOOK_DIR, command, { cwd: projectDir });
+      const shell = runHookIn(shellOnlyDir, command, { cwd: projectDir });
+      expect(engine).toEqual(shell);
+    }
+  );
+
+  it("falls back to the shell guards past the engine's size limit", () => {
+    const command = `git stash drop # ${"x".repeat(ENGINE_SIZE_LIMIT)}`;
+    const { status, stderr } = runHookIn(HOOK_DIR, command, {
+      cwd: projectDir,
+    });
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(STASH_REASON);
+  });
+
+  it("defers non-ASCII commands to the shell guards", () => {
+    const command = "git stash drop # caf\u00e9";
+    const engine = spawnSync(
+      "python3",
+      [path.join(HOOK_DIR, ENGINE_NAME), projectDir, ""],
+      { input: command, encoding: "utf8" }
+    );
+    expect(engine.status).toBe(ENGINE_DEFER);
+    const { status, stderr } = runHookIn(HOOK_DIR, command, {
+      cwd: projectDir,
+    });
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(STASH_REASON);
+  });
+
+  it("still applies custom rules after the engine allows", () => {
+    const rulesPath = path.join(workRoot, "custom-rules.txt");
+    writeFileSync(rulesPath, "FORBIDDEN_TOKEN\n");
+    const env = { SAFETY_NET_RULES_FILE: rulesPath };
+    expect(
+      runHookIn(HOOK_DIR, "echo FORBIDDEN_TOKEN", { cwd: projectDir, env })
+        .status
+    ).toBe(EXIT_BLOCKED);
+    expect(
+      runHookIn(HOOK_DIR, "echo fine", { cwd: projectDir, env }).status
+    ).toBe(EXIT_ALLOWED);
+  });
+});
@@ -0,0 +1,132 @@
+/**
+ * `--batch` mode of the heredoc classifier.
+ *
+ * Batch mode replays newline-delimited JSON commands through one classifier
+ * process so recorded sessions can be audited and diffed between classifier
+ * versions. Its verdicts must be the ones the one-shot hook path returns,
+ * unless `--rules-only` skips the `bash -n` check. Each record carries the
+ * markers bash would see and a per-command timing.
+ * @module tests/unit/hooks/parity-safety-net-heredoc-batch
+ */
+import { spawnSync } from "node:child_process";
+import path from "node:path";
+
+const CLASSIFIER_PATH = path.resolve(
+  "plugins/lisa/hooks/parity-safety-net-heredoc.py"
+);
+const SAFE_WRITER = "gh pr comment 1 --body-file - <<'EOF'\nrm -rf /\nEOF";
+const EXPANDING_BODY = "cat <<EOF\n$(whoami)\nEOF";
+const STRIPPED_QUOTED = 'cat <<-"END"\n\tplain\n\tEND';
+const UNPARSEABLE = "cat <<'EOF'\nx\nEOF\nif";
+const QUOTED_LOOKALIKE = 'echo "a\ncat <<EOF\nb"';
+
+/** One `--batch` output record. */
+interface BatchRecord {
+  readonly line: number;
+  readonly status?: number;
+  readonly verdict?: string;
+  readonly sanitized?: string;
+  readonly markers?: readonly Record<string, unknown>[];
+  readonly elapsed_us?: number;
+  readonly error?: string;
+}
+
+/**
+ * Runs the classifier once over newline-delimited input.
+ * @param lines - Raw input lines, already JSON-encoded where meant to be.
+ * @param flags - Extra flags after `--batch`.
+ * @returns The parsed output records.
+ */
+const runBatch = (
+  lines: readonly string[],
+  flags: readonly string[] = []
+): BatchRecord[] => {
+  const result = spawnSync("python3", [CLASSIFIER_PATH, "--batch", ...flags], {
+    input: `${lines.join("\n")}\n`,
+    encoding: "utf8",
+    env: { ...process.env, LISA_SAFETY_NET_VERDICT_CACHE: "off" },
+  });
+  expect(result.status).toBe(0);
+  return result.stdout
+    .trim()
+    .split("\n")
+    .map(line => JSON.parse(line) as BatchRecord);
+};
+
+/**
+ * Runs the one-shot classifier the hook uses.
+ * @param command - Command text on stdin.
+ * @returns Exit status and stdout.
+ */
+const runOneShot = (
+  command: string
+): { status: number | null; out: string } => {
+  const result = spawnSync("python3", [CLASSIFIER_PATH], {
+    input: command,
+    encoding: "utf8",
+    env: { ...process.env, LISA_SAFETY_NET_VERDICT_CACHE: "off" },
+  });
+  return { status: result.status, out: result.stdout };
+};
+
+describe("parity-safety-net heredoc classifier --batch", () => {
+  it("agrees with the one-shot classifier on every command", () => {
+    const commands = [
+      SAFE_WRITER,
+      EXPANDING_BODY,
+      STRIPPED_QUOTED,
+      UNPARSEABLE,
+      "ls",
+    ];
+    const records = runBatch(commands.map(command => JSON.stringify(command)));
+    expect(records).toHaveLength(commands.length);
+    commands.forEach((command, index) => {
+      const { status, out } = runOneShot(command);
+      expect(records[index]?.status).toBe(status);
+      expect(records[index]?.sanitized).toBe(out);
+      expect(records[index]?.elapsed_us).toBeGreaterThanOrEqual(0);
+    });
+  });
+
+  it("reports verdict names and marker details", () => {
+    const [writer, stripped] = runBatch([
+      JSON.stringify({ command: SAFE_WRITER }),
+      JSON.stringify({ tool_input: { command: STRIPPED_QUOTED } }),
+    ]);
+    expect(writer?.verdict).toBe("SAFE");
+    expect(writer?.markers).toEqual([
+      {
+        start: SAFE_WRITER.indexOf("<<"),
+        end: SAFE_WRITER.indexOf("\n"),
+        delimiter: "EOF",
+        quoted: true,
+        strip_tabs: false,
+      },
+    ]);
+    expect(stripped?.verdict).toBe("UNSUPPORTED");
+    expect(stripped?.markers?.[0]).toMatchObject({
+      delimiter: "END",
+      quoted: true,
+      strip_tabs: true,
+    });
+  });
+
+  it("skips the bash -n check only under --rules-only", () => {
+    const input = [JSON.stringify(UNPARSEABLE)];
+    expect(runBatch(input)[0]?.verdict).toBe("MALFORMED");
+    expect(runBatch(input, ["--rules-only"])[0]?.verdict).toBe("UNSUPPORTED");
+  });
+
+  it("reports no marker for a << inside a quoted string", () => {
+    const [record] = runBatch([JSON.stringify(QUOTED_LOOKALIKE)]);
+    expect(record?.markers).toEqual([]);
+  });
+
+  it("records an error for unusable lines and keeps going", () => {
+    const records = runBatch(["not json", "", '{"id": 7}', '"ls"']);
+    expect(records.map(record => record.line)).toEqual([1, 3, 4]);
+    expect(records[0]?.error).toBeDefined();
+    expect(records[1]?.error).toBe("expected a command string");
+    expect(records[2]?.verdict).toBe("SAFE");
+  });
+});
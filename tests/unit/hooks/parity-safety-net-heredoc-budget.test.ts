@@ -0,0 +1,80 @@
+/**
+ * Heredoc-classifier cost bound.
+ *
+ * The classifier runs on every heredoc command, so a hostile or merely huge
+ * command must not turn the PreToolUse hook into a hang. Cost is linear in the
+ * command (`scripts/bench-heredoc-classifier.py` measures that per shape), and
+ * past `WORK_BUDGET` (256 KiB) the verdict is MALFORMED without scanning — the
+ * budget only ever blocks, it never lets a payload through unclassified. The
+ * ceiling is enforced while stdin is read, so an oversized paste is never held
+ * whole, and `LISA_SAFETY_NET_WORK_BUDGET` can lower it per host.
+ * @module tests/unit/hooks/parity-safety-net-heredoc-budget
+ */
+import { spawnSync } from "node:child_process";
+import path from "node:path";
+
+const HOOK_PATH = path.resolve("plugins/lisa/hooks/parity-safety-net.sh");
+const EXIT_BLOCKED = 2;
+const EXIT_ALLOWED = 0;
+const HEREDOC_WALL_REASON = "malformed or ambiguous heredoc";
+const WORK_BUDGET = 256 * 1024;
+// Generous: these shapes finish in well under a second when linear, and took
+// tens of seconds when a single long shell word was tokenized quadratically.
+const HOOK_TIMEOUT_MS = 20000;
+
+const runHook = (
+  command: string,
+  env: NodeJS.ProcessEnv = {}
+): { status: number | null; stderr: string } => {
+  const result = spawnSync("/bin/bash", [HOOK_PATH], {
+    input: JSON.stringify({ tool_name: "Bash", tool_input: { command } }),
+    encoding: "utf8",
+    timeout: HOOK_TIMEOUT_MS,
+    maxBuffer: 4 * WORK_BUDGET,
+    env: { ...process.env, LISA_SAFETY_NET_VERDICT_CACHE: "off", ...env },
+  });
+  return { status: result.status, stderr: result.stderr };
+};
+
+describe("parity-safety-net heredoc classifier cost bound", () => {
+  it("blocks a heredoc command larger than the work budget", () => {
+    const command = ["cat <<'EOF'", "x".repeat(WORK_BUDGET), "EOF"].join("\n");
+    const { status, stderr } = runHook(command);
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(HEREDOC_WALL_REASON);
+  });
+
+  it("still allows a large safe writer body under the budget", () => {
+    const command = [
+      "gh pr create --title t --body-file - <<'EOF'",
+      ...Array.from({ length: 8000 }, () => "prose that quotes rm -rf /"),
+      "EOF",
+    ].join("\n");
+    expect(runHook(command).status).toBe(EXIT_ALLOWED);
+  });
+
+  it("applies a lower ceiling from LISA_SAFETY_NET_WORK_BUDGET", () => {
+    const command = [
+      "gh pr create --title t --body-file - <<'EOF'",
+      "p".repeat(4096),
+      "EOF",
+    ].join("\n");
+    expect(runHook(command).status).toBe(EXIT_ALLOWED);
+    const lowered = runHook(command, { LISA_SAFETY_NET_WORK_BUDGET: "1024" });
+    expect(lowered.status).toBe(EXIT_BLOCKED);
+    expect(lowered.stderr).toContain(HEREDOC_WALL_REASON);
+  });
+
+  it("ignores a LISA_SAFETY_NET_WORK_BUDGET that is not a positive count", () => {
+    const command = ["cat <<'EOF'", "x".repeat(WORK_BUDGET), "EOF"].join("\n");
+    const { status } = runHook(command, { LISA_SAFETY_NET_WORK_BUDGET: "0" });
+    expect(status).toBe(EXIT_BLOCKED);
+  });
+
+  it("classifies one very long quoted word without stalling", () => {
+    const command = `gh pr create --title '${"t".repeat(128 * 1024)}' <<EOF\nEOF`;
+    const { status, stderr } = runHook(command);
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(HEREDOC_WALL_REASON);
+  });
+});
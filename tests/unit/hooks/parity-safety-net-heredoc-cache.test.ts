@@ -0,0 +1,121 @@
+/**
+ * Heredoc-classifier verdict cache.
+ *
+ * The one-shot classifier appends verdicts to a bounded JSONL file keyed by a
+ * hash of the command and of the classifier's own source. These tests forge
+ * entries to prove the hook really consults the cache. Each forged verdict is
+ * MALFORMED for a command that classifies SAFE, so a forgery can only ever
+ * over-block. The cache must also ignore entries recorded by another
+ * classifier version and files other users could have written.
+ * @module tests/unit/hooks/parity-safety-net-heredoc-cache
+ */
+import { spawnSync } from "node:child_process";
+import { createHash } from "node:crypto";
+import {
+  chmodSync,
+  mkdtempSync,
+  readFileSync,
+  rmSync,
+  statSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+const HOOK_DIR = path.resolve("plugins/lisa/hooks");
+const HOOK_PATH = path.join(HOOK_DIR, "parity-safety-net.sh");
+const CLASSIFIER_PATH = path.join(HOOK_DIR, "parity-safety-net-heredoc.py");
+const EXIT_BLOCKED = 2;
+const EXIT_ALLOWED = 0;
+const MALFORMED = 20;
+const SAFE_WRITER = [
+  "gh issue comment 1 --body-file - <<'EOF'",
+  "notes that mention rm -rf /",
+  "EOF",
+].join("\n");
+
+/**
+ * The sha256 hex digest of some text.
+ * @param text - Text to hash.
+ * @returns Lowercase hex digest.
+ */
+const sha256 = (text: string | Buffer): string =>
+  createHash("sha256").update(text).digest("hex");
+
+/**
+ * The version hash the classifier keys its cache to: its own source digest.
+ * @returns Lowercase hex digest of the built classifier.
+ */
+const classifierVersion = (): string => sha256(readFileSync(CLASSIFIER_PATH));
+
+describe("parity-safety-net heredoc verdict cache", () => {
+  let cacheDir: string;
+  let cachePath: string;
+
+  beforeEach(() => {
+    cacheDir = mkdtempSync(path.join(tmpdir(), "safety-net-verdicts-"));
+    cachePath = path.join(cacheDir, "verdicts.jsonl");
+  });
+
+  afterEach(() => {
+    rmSync(cacheDir, { recursive: true, force: true });
+  });
+
+  /**
+   * Runs the hook with the verdict cache pointed at the test's file.
+   * @param command - The Bash command under test.
+   * @returns The hook exit status.
+   */
+  const runHook = (command: string): number | null =>
+    spawnSync("/bin/bash", [HOOK_PATH], {
+      input: JSON.stringify({ tool_name: "Bash", tool_input: { command } }),
+      encoding: "utf8",
+      env: { ...process.env, LISA_SAFETY_NET_VERDICT_CACHE: cachePath },
+    }).status;
+
+  /**
+   * Writes a cache file holding one MALFORMED verdict for the safe writer.
+   * @param version - Classifier version the file claims to belong to.
+   * @param mode - Permission bits for the file.
+   */
+  const forgeVerdict = (version: string, mode: number): void => {
+    const key = sha256(`${version}\0${SAFE_WRITER}`);
+    const lines = [{ version }, [key, MALFORMED, ""]].map(line =>
+      JSON.stringify(line)
+    );
+    writeFileSync(cachePath, `${lines.join("\n")}\n`);
+    chmodSync(cachePath, mode);
+  };
+
+  it("records a verdict in a private cache file and reuses it", () => {
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+    expect(statSync(cachePath).mode & 0o777).toBe(0o600);
+    const recorded = readFileSync(cachePath, "utf8");
+    expect(recorded.trimEnd().split("\n")).toHaveLength(2);
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+  });
+
+  it("leaves the file alone on a hit to a recent entry", () => {
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+    const recorded = readFileSync(cachePath, "utf8");
+    const { ino, mtimeMs } = statSync(cachePath);
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+    expect(readFileSync(cachePath, "utf8")).toBe(recorded);
+    expect(statSync(cachePath)).toMatchObject({ ino, mtimeMs });
+  });
+
+  it("answers from an entry keyed to the current classifier", () => {
+    forgeVerdict(classifierVersion(), 0o600);
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_BLOCKED);
+  });
+
+  it("ignores entries recorded by a different classifier version", () => {
+    forgeVerdict(sha256("an older classifier"), 0o600);
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+  });
+
+  it("ignores a cache file that group or others can write", () => {
+    forgeVerdict(classifierVersion(), 0o620);
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+  });
+});
@@ -0,0 +1,238 @@
+/**
+ * Opt-in heredoc-classifier daemon for the parity safety net.
+ *
+ * With LISA_SAFETY_NET_DAEMON=1 the hook asks a resident
+ * parity-safety-net-heredoc-daemon.py over a per-user Unix socket instead of
+ * spawning a fresh classifier. The daemon is an accelerator only: its verdicts
+ * must be the one-shot classifier's, and every way it can be unusable — no
+ * socket, a dead socket, a daemon for a different classifier — must land on the
+ * one-shot path, which still fails closed.
+ *
+ * To prove WHICH path answered, these tests shadow `python3` on the hook's PATH
+ * with a stub that always fails: a verdict that survives the stub came from the
+ * daemon, and a fail-closed denial shows the one-shot path ran.
+ * @module tests/unit/hooks/parity-safety-net-heredoc-daemon
+ */
+import { type ChildProcess, spawn, spawnSync } from "node:child_process";
+import {
+  chmodSync,
+  existsSync,
+  mkdirSync,
+  mkdtempSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { connect } from "node:net";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+const HOOK_DIR = path.resolve("plugins/lisa/hooks");
+const HOOK_PATH = path.join(HOOK_DIR, "parity-safety-net.sh");
+const CLASSIFIER_PATH = path.join(HOOK_DIR, "parity-safety-net-heredoc.py");
+const DAEMON_PATH = path.join(HOOK_DIR, "parity-safety-net-heredoc-daemon.py");
+const EXIT_BLOCKED = 2;
+const EXIT_ALLOWED = 0;
+const SAFE_WRITER = [
+  "gh issue create --body-file - <<'EOF'",
+  "prose that quotes rm -rf /",
+  "EOF",
+].join("\n");
+const PARSER_FAILED_REASON = "heredoc parser failed";
+const SOCKET_WAIT_MS = 5000;
+/** Classifier's intake ceiling (WORK_BUDGET), in characters. */
+const WORK_BUDGET = 256 * 1024;
+/** A stand-in daemon that answers SAFE, with harmless text, for anything. */
+const IMPOSTOR = [
+  "import os, socket, sys",
+  "server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)",
+  "server.bind(sys.argv[1])",
+  "os.chmod(sys.argv[1], 0o666)",
+  "server.listen()",
+  "while True:",
+  "    connection, _ = server.accept()",
+  "    while connection.recv(65536):",
+  "        pass",
+  "    connection.sendall(b'0\\necho harmless')",
+  "    connection.close()",
+].join("\n");
+
+const runHook = (
+  command: string,
+  env: NodeJS.ProcessEnv
+): { status: number | null; stderr: string } => {
+  const result = spawnSync("/bin/bash", [HOOK_PATH], {
+    input: JSON.stringify({ tool_name: "Bash", tool_input: { command } }),
+    encoding: "utf8",
+    env: { ...process.env, ...env },
+  });
+  return { status: result.status, stderr: result.stderr };
+};
+
+/**
+ * Sends one raw protocol request and resolves with the full reply.
+ * @param socketPath - Daemon socket.
+ * @param header - First request line, without its newline.
+ * @param command - Command bytes to classify.
+ * @returns Everything the daemon wrote before closing.
+ */
+const rawRequest = (
+  socketPath: string,
+  header: string,
+  command: string
+): Promise<string> =>
+  new Promise((resolve, reject) => {
+    const chunks: Buffer[] = [];
+    const client = connect(socketPath, () => {
+      client.end(`${header}\n${command}`);
+    });
+    client.on("data", chunk => chunks.push(chunk));
+    client.on("error", reject);
+    client.on("close", () => resolve(Buffer.concat(chunks).toString("utf8")));
+  });
+
+/**
+ * Waits for a daemon to bind its socket.
+ * @param socketPath - Socket the daemon binds.
+ */
+const waitForSocket = async (socketPath: string): Promise<void> => {
+  const deadline = Date.now() + SOCKET_WAIT_MS;
+  while (!existsSync(socketPath) && Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, 25));
+  }
+  if (!existsSync(socketPath)) {
+    throw new Error("classifier daemon never bound its socket");
+  }
+};
+
+describe("parity-safety-net heredoc classifier daemon", () => {
+  let workRoot: string;
+  let socketPath: string;
+  let stubPath: string;
+  let daemon: ChildProcess;
+
+  beforeAll(async () => {
+    workRoot = mkdtempSync(path.join(tmpdir(), "lisa-heredoc-daemon-"));
+    socketPath = path.join(workRoot, "run", "heredoc.sock");
+    const stubDir = path.join(workRoot, "bin");
+    mkdirSync(stubDir);
+    writeFileSync(path.join(stubDir, "python3"), "#!/bin/sh\nexit 1\n");
+    chmodSync(path.join(stubDir, "python3"), 0o755);
+    stubPath = `${stubDir}:${process.env.PATH ?? ""}`;
+
+    daemon = spawn(
+      "python3",
+      [DAEMON_PATH, "--socket", socketPath, "--idle-timeout", "60"],
+      { stdio: "ignore" }
+    );
+    await waitForSocket(socketPath);
+  });
+
+  afterAll(() => {
+    daemon.kill();
+    rmSync(workRoot, { recursive: true, force: true });
+  });
+
+  const daemonEnv = (): NodeJS.ProcessEnv => ({
+    LISA_SAFETY_NET_DAEMON: "1",
+    LISA_SAFETY_NET_DAEMON_SOCKET: socketPath,
+    PATH: stubPath,
+  });
+
+  it("answers the safe gh-writer form without spawning a classifier", () => {
+    expect(runHook(SAFE_WRITER, daemonEnv()).status).toBe(EXIT_ALLOWED);
+  });
+
+  it("returns MALFORMED for a live substitution in an unquoted body", () => {
+    const command = ["cat <<EOF", "$(touch pwned)", "EOF"].join("\n");
+    const { status, stderr } = runHook(command, daemonEnv());
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain("malformed or ambiguous heredoc");
+  });
+
+  it("still runs the content guards on an UNSUPPORTED verdict", () => {
+    const command = ["bash <<'EOF'", "rm -rf /", "EOF"].join("\n");
+    const { status, stderr } = runHook(command, daemonEnv());
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain("recursive forced delete");
+  });
+
+  it("is not consulted without the opt-in", () => {
+    const { status, stderr } = runHook(SAFE_WRITER, { PATH: stubPath });
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(PARSER_FAILED_REASON);
+  });
+
+  it("falls back to the one-shot classifier when the socket is missing", () => {
+    const env = {
+      LISA_SAFETY_NET_DAEMON: "1",
+      LISA_SAFETY_NET_DAEMON_SOCKET: path.join(workRoot, "absent.sock"),
+    };
+    expect(runHook(SAFE_WRITER, env).status).toBe(EXIT_ALLOWED);
+  });
+
+  it("fails closed when both the socket and the one-shot are unusable", () => {
+    const { status, stderr } = runHook(SAFE_WRITER, {
+      ...daemonEnv(),
+      LISA_SAFETY_NET_DAEMON_SOCKET: path.join(workRoot, "absent.sock"),
+    });
+    expect(status).toBe(EXIT_BLOCKED);
+    expect(stderr).toContain(PARSER_FAILED_REASON);
+  });
+
+  it("speaks the one-shot status and sanitized-text contract", async () => {
+    const reply = await rawRequest(
+      socketPath,
+      `lisa-heredoc/1 ${CLASSIFIER_PATH}`,
+      SAFE_WRITER
+    );
+    expect(reply).toBe("0\ngh issue create --body-file -");
+  });
+
+  it("stays silent for a command over the intake ceiling", async () => {
+    const reply = await rawRequest(
+      socketPath,
+      `lisa-heredoc/1 ${CLASSIFIER_PATH}`,
+      `cat <<'EOF'\n${"x".repeat(WORK_BUDGET)}\nEOF`
+    );
+    expect(reply).toBe("");
+  });
+
+  it("ignores a socket in a directory another user could write", async () => {
+    const plantedDir = path.join(workRoot, "planted");
+    mkdirSync(plantedDir, { mode: 0o755 });
+    chmodSync(plantedDir, 0o755);
+    const planted = path.join(plantedDir, "heredoc.sock");
+    const impostor = spawn("python3", ["-c", IMPOSTOR, planted], {
+      stdio: "ignore",
+    });
+    try {
+      await waitForSocket(planted);
+      const command = ["bash <<'EOF'", "rm -rf /", "EOF"].join("\n");
+      const env = {
+        LISA_SAFETY_NET_DAEMON: "1",
+        LISA_SAFETY_NET_DAEMON_SOCKET: planted,
+      };
+
+      const exposed = runHook(command, env);
+      expect(exposed.status).toBe(EXIT_BLOCKED);
+      expect(exposed.stderr).toContain("recursive forced delete");
+
+      // Control: the same impostor in a private directory is consulted, so
+      // the ownership and mode check is what kept it out above.
+      chmodSync(plantedDir, 0o700);
+      chmodSync(planted, 0o600);
+      expect(runHook(command, env).status).toBe(EXIT_ALLOWED);
+    } finally {
+      impostor.kill();
+    }
+  });
+
+  it("stays silent for a request naming a different classifier", async () => {
+    const reply = await rawRequest(
+      socketPath,
+      `lisa-heredoc/1 ${path.join(workRoot, "parity-safety-net-heredoc.py")}`,
+      SAFE_WRITER
+    );
+    expect(reply).toBe("");
+  });
+});
@@ -178,7 +178,7 @@ describe("quoted-heredoc literal payloads reach the guards (issue #1958)", () =>
 describe("fake-heredoc-in-open-quote does not smuggle a live substitution (issue #1958 Finding 1)", () => {
   // A `<<'DELIM'` line nested INSIDE a multi-line double-quoted string is not a
   // heredoc to bash — the whole thing is one string, and `$(...)` inside a
-  // double-quoted string is EXECUTED. top_level_markers() resets quote state
+  // double-quoted string is EXECUTED. line_markers() resets quote state
   // per line, so it mis-reads that line as a real top-level quoted heredoc and
   // (before the fix) excludes the "body" window — deleting the live `$(...)`
   // before the cross-line substitution scan sees it. The command is then
@@ -151,6 +151,41 @@ describe("parity-safety-net heredoc grammar", () => {
     expect(script.stderr).not.toContain("git commit -F <file>");
   });
 
+  describe("bash -n syntax validation inside the classifier", () => {
+    const unparsableWriter = [
+      "gh issue comment 1 --body-file - <<'EOF'",
+      HARMLESS_PROSE,
+      HEREDOC_TERMINATOR,
+      "if",
+    ].join("\n");
+
+    it("fails closed on a heredoc command bash cannot parse", () => {
+      const { status, stderr } = runHook(unparsableWriter, {
+        env: { LISA_SAFETY_NET_VERDICT_CACHE: "off" },
+      });
+      expect(status).toBe(EXIT_BLOCKED);
+      expect(stderr).toContain("malformed or ambiguous heredoc");
+    });
+
+    it("validates with /bin/bash, not the first bash on PATH", () => {
+      const stubDir = mkdtempSync(path.join(tmpdir(), "heredoc-bash-stub-"));
+      try {
+        writeFileSync(path.join(stubDir, "bash"), "#!/bin/sh\nexit 0\n", {
+          mode: 0o755,
+        });
+        const { status } = runHook(unparsableWriter, {
+          env: {
+            LISA_SAFETY_NET_VERDICT_CACHE: "off",
+            PATH: `${stubDir}:${process.env.PATH ?? ""}`,
+          },
+        });
+        expect(status).toBe(EXIT_BLOCKED);
+      } finally {
+        rmSync(stubDir, { recursive: true, force: true });
+      }
+    });
+  });
+
   describe("delimiter-quoting conservatism (issue #1958 F4)", () => {
     // POSIX says ANY quoting of ANY part of a heredoc delimiter makes the body
     // non-expanding. `<<\EOF` is now MODELLED as exactly that — a quoted
@@ -0,0 +1,122 @@
+/**
+ * Opt-in latency profile for parity-safety-net.sh (`LISA_HOOK_PROFILE`).
+ *
+ * With the variable set, the hook appends one JSON line per screened command.
+ * The line holds the phase timings, the classifier's per-rule timings, the
+ * verdict and the exit status, and scripts/summarize-hook-profile.py reduces
+ * the file to percentiles. Unset, the hook must write nothing. Phase marks
+ * need `$EPOCHREALTIME`, so the suite only runs where /bin/bash has it (bash 5+).
+ * @module tests/unit/hooks/parity-safety-net-profile
+ */
+import { spawnSync } from "node:child_process";
+import { existsSync, mkdtempSync, readFileSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+const HOOK_PATH = path.resolve("plugins/lisa/hooks/parity-safety-net.sh");
+const SUMMARIZER_PATH = path.resolve("scripts/summarize-hook-profile.py");
+const EXIT_BLOCKED = 2;
+const EXIT_ALLOWED = 0;
+const SAFE_WRITER = "gh pr comment 1 --body-file - <<'EOF'\nrm -rf /\nEOF";
+const hasEpochRealtime =
+  spawnSync("/bin/bash", ["-c", 'test -n "${EPOCHREALTIME:-}"']).status === 0;
+
+/** One profile line, as far as these tests read it. */
+interface ProfileRecord {
+  readonly exit: number;
+  readonly verdict: string;
+  readonly command_length: number;
+  readonly total_us: number;
+  readonly phases_us: Record<string, number>;
+  readonly classifier: {
+    readonly classify_us: number;
+    readonly rules_us: Record<string, number>;
+  } | null;
+}
+
+describe.runIf(hasEpochRealtime)("parity-safety-net LISA_HOOK_PROFILE", () => {
+  let workRoot: string;
+  let profilePath: string;
+
+  beforeEach(() => {
+    workRoot = mkdtempSync(path.join(tmpdir(), "safety-net-profile-"));
+    profilePath = path.join(workRoot, "profile.jsonl");
+  });
+
+  afterEach(() => {
+    rmSync(workRoot, { recursive: true, force: true });
+  });
+
+  /**
+   * Runs the hook once.
+   * @param command - The Bash command under test.
+   * @param profile - Whether to set LISA_HOOK_PROFILE.
+   * @returns The hook exit status.
+   */
+  const runHook = (command: string, profile = true): number | null =>
+    spawnSync("/bin/bash", [HOOK_PATH], {
+      input: JSON.stringify({ tool_name: "Bash", tool_input: { command } }),
+      encoding: "utf8",
+      cwd: workRoot,
+      env: {
+        ...process.env,
+        CLAUDE_PROJECT_DIR: workRoot,
+        LISA_SAFETY_NET_VERDICT_CACHE: "off",
+        ...(profile ? { LISA_HOOK_PROFILE: profilePath } : {}),
+      },
+    }).status;
+
+  /**
+   * Parses every line of the profile written so far.
+   * @returns The profile records in order.
+   */
+  const readProfile = (): ProfileRecord[] =>
+    readFileSync(profilePath, "utf8")
+      .trim()
+      .split("\n")
+      .map(line => JSON.parse(line) as ProfileRecord);
+
+  it("records phases and per-rule classifier timings for a heredoc", () => {
+    expect(runHook(SAFE_WRITER)).toBe(EXIT_ALLOWED);
+    const [record] = readProfile();
+    expect(record).toMatchObject({
+      exit: EXIT_ALLOWED,
+      verdict: "SAFE",
+      command_length: SAFE_WRITER.length,
+    });
+    expect(Object.keys(record?.phases_us ?? {})).toEqual(
+      expect.arrayContaining(["intake", "classifier", "normalize"])
+    );
+    expect(record?.classifier?.rules_us).toHaveProperty("bash_parses");
+    expect(record?.classifier?.rules_us).toHaveProperty("classify_safe");
+    expect(record?.total_us).toBeGreaterThan(0);
+  });
+
+  it("records blocked commands with their exit status", () => {
+    expect(runHook("git stash drop")).toBe(EXIT_BLOCKED);
+    expect(runHook("ls")).toBe(EXIT_ALLOWED);
+    const records = readProfile();
+    expect(records.map(record => [record.exit, record.verdict])).toEqual([
+      [EXIT_BLOCKED, "none"],
+      [EXIT_ALLOWED, "none"],
+    ]);
+    expect(records[0]?.classifier).toBeNull();
+  });
+
+  it("writes nothing when the variable is unset", () => {
+    expect(runHook(SAFE_WRITER, false)).toBe(EXIT_ALLOWED);
+    expect(existsSync(profilePath)).toBe(false);
+  });
+
+  it("summarizes the profile into per-phase percentiles", () => {
+    runHook(SAFE_WRITER);
+    runHook("ls");
+    const result = spawnSync("python3", [SUMMARIZER_PATH, profilePath], {
+      encoding: "utf8",
+    });
+    expect(result.status).toBe(0);
+    expect(result.stdout).toContain("phase classifier");
+    expect(result.stdout).toContain("rule classify_safe");
+    expect(result.stdout).toMatch(/p99 ms/);
+  });
+});
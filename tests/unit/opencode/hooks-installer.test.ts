@@ -32,6 +32,14 @@ const INSTR = "lisa-block-instruction-file-edits.ts";
 const ISSUE = "lisa-block-direct-issue-create.ts";
 const BASE_RULES = "base-rules.md";
 
+/** Canonical hook files the parity-safety-net adapter runs beside itself. */
+const SUPPORT_FILES = [
+  "parity-safety-net.sh",
+  "parity-safety-net-heredoc.py",
+  "parity-safety-net-guards.py",
+  "parity-safety-net-heredoc-daemon.py",
+] as const;
+
 describe("opencode/hooks-installer", () => {
   let tempDir: string;
   let lisaDir: string;
@@ -296,7 +304,24 @@ describe("opencode/hooks-installer", () => {
       const result = await installHooks(lisaDir, destDir, ["typescript"], []);
       const files = await listInstalledPluginFiles(destDir);
       expect(result.pluginCount).toBe(files.length);
-      expect(result.managedFiles).toHaveLength(files.length + 2);
+      expect(result.managedFiles).toHaveLength(
+        files.length + SUPPORT_FILES.length
+      );
+    });
+
+    it("ships every safety-net support file beside the plugins", async () => {
+      const result = await installHooks(lisaDir, destDir, ["typescript"], []);
+      const pluginDir = path.join(
+        destDir,
+        OPENCODE_CONFIG_DIR,
+        OPENCODE_PLUGIN_SUBDIR
+      );
+      for (const filename of SUPPORT_FILES) {
+        expect(result.managedFiles).toContain(
+          path.join(OPENCODE_PLUGIN_SUBDIR, filename)
+        );
+        expect(await fs.pathExists(path.join(pluginDir, filename))).toBe(true);
+      }
     });
   });
 
@@ -34,6 +34,8 @@ describe("OpenCode parity-safety-net plugin", () => {
     for (const filename of [
       "parity-safety-net.sh",
       "parity-safety-net-heredoc.py",
+      "parity-safety-net-guards.py",
+      "parity-safety-net-heredoc-daemon.py",
     ]) {
       await fs.copy(
         path.join(HOOK_DIR, filename),
@@ -27,6 +27,8 @@ const BLOCK_NO_VERIFY_AGY = "block-no-verify.agy.sh";
 const PARITY_SAFETY_NET = "parity-safety-net.sh";
 const PARITY_SAFETY_NET_AGY = "parity-safety-net.agy.sh";
 const PARITY_HEREDOC = "parity-safety-net-heredoc.py";
+const PARITY_DAEMON = "parity-safety-net-heredoc-daemon.py";
+const PARITY_GUARDS = "parity-safety-net-guards.py";
 const INSTALL_PKGS = "install-pkgs.sh";
 const SETUP_JIRA = "setup-jira-cli.sh";
 
@@ -78,6 +80,8 @@ async function scaffoldSource(
     PARITY_SAFETY_NET_AGY,
     PARITY_SAFETY_NET,
     PARITY_HEREDOC,
+    PARITY_DAEMON,
+    PARITY_GUARDS,
   ]) {
     await fs.writeFile(
       path.join(srcDir, "hooks", script),
@@ -167,6 +171,8 @@ describe("generate-agy-plugin-artifacts (plugin-bundled root hooks.json)", () =>
         PARITY_SAFETY_NET_AGY,
         PARITY_SAFETY_NET,
         PARITY_HEREDOC,
+        PARITY_DAEMON,
+        PARITY_GUARDS,
       ]) {
         const supportPath = path.join(outDir, "hooks", script);
         expect(fs.existsSync(supportPath)).toBe(true);
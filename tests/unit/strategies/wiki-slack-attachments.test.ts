@@ -0,0 +1,272 @@
+/**
+ * Slack connector: content-addressed attachment store.
+ *
+ * Under `--files`, message attachments are downloaded into
+ * `wiki/sources/slack/files/` under their sha256 and linked from the note;
+ * text ones are redacted first, because the store is committed with the wiki.
+ * `files/index.json` maps Slack file IDs to stored paths so a file is
+ * downloaded once however often it is seen; oversized and failed downloads
+ * are listed in the note with the reason. Without it they are only listed.
+ * @module tests/unit/strategies/wiki-slack-attachments
+ */
+import { spawnSync } from "node:child_process";
+import { createHash } from "node:crypto";
+import {
+  existsSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  runConnectorPython,
+  runIngest,
+  type SlackMessage,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0FILES";
+const LINT_SCRIPT = path.resolve("plugins/src/wiki/scripts/lint-wiki.mjs");
+const SOURCE_DIR = path.join("wiki", "sources", "slack");
+const LOG_URL = "https://files.slack.com/files-pri/T0-F1/crash.log";
+const LOG = "Traceback: boom\n";
+const LOG_SHA = createHash("sha256").update(LOG).digest("hex");
+const ENV_URL = "https://files.slack.com/files-pri/T0-F4/env.txt";
+const PNG_URL = "https://files.slack.com/files-pri/T0-F5/shot.png";
+
+/**
+ * A Slack file object as message payloads carry it.
+ * @param id - Slack file ID.
+ * @param name - File name.
+ * @param url - Download URL.
+ * @param size - Size Slack reports, in bytes.
+ * @returns The file object.
+ */
+const fileOf = (id: string, name: string, url: string, size = LOG.length) => ({
+  id,
+  name,
+  size,
+  mimetype: "text/plain",
+  url_private_download: url,
+});
+
+const HISTORY: SlackMessage[] = [
+  {
+    ts: "1700000000.000100",
+    text: "it crashed",
+    files: [fileOf("F1", "crash.log", LOG_URL)],
+  },
+  {
+    ts: "1700000001.000100",
+    text: "same log, reshared",
+    files: [
+      fileOf("F1", "crash.log", LOG_URL),
+      fileOf("F2", "copy.log", LOG_URL),
+    ],
+  },
+  {
+    ts: "1700000002.000100",
+    text: "recording",
+    files: [fileOf("F3", "demo.mp4", "https://files.slack.com/demo.mp4", 2e9)],
+  },
+];
+
+const WORKSPACE: SlackWorkspace = {
+  channels: [{ id: CHANNEL, name: "files" }],
+  history: { [CHANNEL]: HISTORY },
+  replies: {},
+  downloads: { [LOG_URL]: LOG },
+};
+
+const LEAKY: SlackWorkspace = {
+  ...WORKSPACE,
+  history: {
+    [CHANNEL]: [
+      {
+        ts: "1700000000.000100",
+        text: "config and screenshot",
+        files: [
+          fileOf("F4", "env.txt", ENV_URL),
+          { ...fileOf("F5", "shot.png", PNG_URL), mimetype: "image/png" },
+        ],
+      },
+    ],
+  },
+  downloads: {
+    [ENV_URL]: "client_secret=ABCDEFGHIJKLMNOPQRSTUVWX\n",
+    [PNG_URL]: "PNG",
+  },
+};
+
+describe("lisa-wiki Slack connector attachments", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-files-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Ingests the fixture channel.
+   * @param args - Extra connector arguments.
+   * @param workspace - What the fixture client serves.
+   * @returns The note text and the URLs downloaded.
+   */
+  const ingest = (args: readonly string[] = [], workspace = WORKSPACE) => {
+    const run = runIngest(tmp, workspace, [
+      "--channel",
+      CHANNEL,
+      "--no-user-names",
+      ...args,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const notePath = /Wrote (\S+)/.exec(run.stdout)?.[1] ?? "";
+    return {
+      note: readFileSync(path.join(tmp, notePath), "utf8"),
+      downloads: run.calls
+        .filter(([method]) => method === "GET")
+        .map(([, params]) => params.url),
+    };
+  };
+
+  it("stores each attachment once under its sha256 and links it", () => {
+    const { note, downloads } = ingest(["--files"]);
+    const stored = `files/${LOG_SHA.slice(0, 2)}/${LOG_SHA}.log`;
+
+    expect(downloads).toEqual([LOG_URL, LOG_URL]);
+    expect(readFileSync(path.join(tmp, SOURCE_DIR, stored), "utf8")).toBe(LOG);
+    expect(readdirSync(path.join(tmp, SOURCE_DIR, "files")).sort()).toEqual([
+      LOG_SHA.slice(0, 2),
+      "index.json",
+    ]);
+    expect(note).toContain(`- file: [crash.log](${stored})`);
+    expect(note).toContain(`- file: [copy.log](${stored})`);
+    expect(note).toContain("- file: demo.mp4 (over the 25 MB limit)");
+  });
+
+  it("never downloads a stored file again", () => {
+    ingest(["--files"]);
+    const { note, downloads } = ingest(["--files", "--full-refresh"]);
+
+    expect(downloads).toEqual([]);
+    expect(note).toContain(`(files/${LOG_SHA.slice(0, 2)}/${LOG_SHA}.log)`);
+  });
+
+  it("lists attachments without downloading unless --files", () => {
+    const { note, downloads } = ingest();
+
+    expect(downloads).toEqual([]);
+    expect(note).toContain("- file: crash.log (not downloaded)");
+    expect(existsSync(path.join(tmp, SOURCE_DIR, "files"))).toBe(false);
+  });
+
+  it("stores text attachments redacted, in a store lint accepts", () => {
+    ingest(["--files"], LEAKY);
+    const files = path.join(tmp, SOURCE_DIR, "files");
+    const index = JSON.parse(
+      readFileSync(path.join(files, "index.json"), "utf8")
+    ) as Record<string, { path: string }>;
+
+    expect(readFileSync(path.join(files, index.F4?.path ?? ""), "utf8")).toBe(
+      "client_secret=[REDACTED:API_KEY]\n"
+    );
+    const lint = spawnSync(
+      process.execPath,
+      [LINT_SCRIPT, "--wiki", "wiki", "--json"],
+      { cwd: tmp, encoding: "utf8" }
+    );
+    const { items } = JSON.parse(lint.stdout) as {
+      items: { group: string; file?: string }[];
+    };
+    const stored = items.filter(item =>
+      item.file?.startsWith(path.join("sources", "slack", "files"))
+    );
+    expect(stored).toEqual([]);
+  });
+
+  it("streams over HTTP, capped, with the token kept to Slack hosts", () => {
+    const run = runConnectorPython(String.raw`
+import json, tempfile, threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+seen = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        seen.append([self.path, self.headers.get("Authorization")])
+        if self.path in ("/moved", "/to-ftp"):
+            target = f"http://localhost:{self.server.server_port}/signed" if self.path == "/moved" else "ftp://example.com/e.txt"
+            self.send_response(302)
+            self.send_header("Location", target)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = {"/signin": b"<html>sign in</html>", "/big": b"x" * 4096}.get(self.path, b"attachment")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html" if self.path == "/signin" else "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+root = Path(tempfile.mkdtemp()) / "files"
+store = mod.FileStore(root, "xoxp-fixture", f"{base}/api", 1024, 2)
+outcomes = store.fetch_all([
+    {"id": "F1", "name": "a.txt", "url_private_download": f"{base}/moved"},
+    {"id": "F2", "name": "b.txt", "url_private_download": f"{base}/big"},
+    {"id": "F3", "name": "c.txt", "url_private_download": f"{base}/signin", "mimetype": "text/plain"},
+    {"id": "F4", "name": "d.txt", "url_private_download": f"{base}/plain"},
+    {"id": "F5", "name": "e.txt", "url_private_download": "ftp://example.com/e.txt"},
+    {"id": "F6", "name": "f.txt", "url_private_download": f"{base}/to-ftp"},
+])
+store.close()
+print(json.dumps({
+    "outcomes": {key: value.get("skipped", "stored") for key, value in outcomes.items()},
+    "seen": dict(sorted(seen)),
+    "stored": sorted(path.name for path in root.rglob("*") if path.is_file()),
+}))
+`);
+    expect(run.stderr).toBe("");
+    const result = JSON.parse(run.stdout) as {
+      outcomes: Record<string, string>;
+      seen: Record<string, string | null>;
+      stored: string[];
+    };
+
+    expect(result.outcomes.F1).toBe("stored");
+    expect(result.outcomes.F2).toMatch(/MB limit$/);
+    expect(result.outcomes.F3).toMatch(/sign-in page/);
+    expect(result.outcomes.F4).toBe("stored");
+    expect(result.outcomes.F5).toMatch(/^download failed: not an http\(s\)/);
+    expect(result.outcomes.F6).toMatch(/^download failed: not an http\(s\)/);
+    expect(result.seen).toEqual({
+      "/big": "Bearer xoxp-fixture",
+      "/moved": "Bearer xoxp-fixture",
+      "/plain": "Bearer xoxp-fixture",
+      "/signed": null,
+      "/signin": "Bearer xoxp-fixture",
+      "/to-ftp": "Bearer xoxp-fixture",
+    });
+    const sha = createHash("sha256").update("attachment").digest("hex");
+    expect(result.stored).toEqual([`${sha}.txt`, "index.json"]);
+  });
+});
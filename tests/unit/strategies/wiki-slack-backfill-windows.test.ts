@@ -0,0 +1,114 @@
+/**
+ * Slack connector: parallel time-window backfill.
+ *
+ * `--backfill-windows N` splits the `--oldest`..`--latest` range (the channel's
+ * creation time standing in for a missing `--oldest`) into N windows, each paged
+ * on its own cursor chain under the shared rate limiter. Pages are stitched back
+ * oldest first, and a message on a window edge is written once.
+ * @module tests/unit/strategies/wiki-slack-backfill-windows
+ */
+import { mkdtempSync, readFileSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0BACKFILL";
+const START = 1_700_000_000;
+
+/**
+ * A 400-message channel created at `START`, plus one message exactly on the
+ * middle edge of a four-window split of `START`..`START + 400`.
+ * @param created - The channel's creation time, if it reports one.
+ * @returns The fixture workspace.
+ */
+const channelOf = (created?: number): SlackWorkspace => ({
+  channels: [{ id: CHANNEL, name: "backfill", created }],
+  history: {
+    [CHANNEL]: [
+      ...messagesFrom(400, START),
+      { ts: `${START + 200}.000000`, user: "U1", text: "edge message" },
+    ],
+  },
+  replies: {},
+});
+
+describe("lisa-wiki Slack connector backfill windows", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-backfill-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Backfills the channel up to `START + 400`.
+   * @param workspace - What the fixture client serves.
+   * @param args - Extra connector arguments.
+   * @returns The history calls' bounds and the note's message lines.
+   */
+  const backfill = (workspace: SlackWorkspace, args: string[]) => {
+    const run = runIngest(tmp, workspace, [
+      "--channel",
+      CHANNEL,
+      "--latest",
+      String(START + 400),
+      "--limit",
+      "25",
+      ...args,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const notePath = /Wrote (\S+)/.exec(run.stdout)?.[1] ?? "";
+    const note = readFileSync(path.join(tmp, notePath), "utf8");
+    return {
+      windows: [
+        ...new Set(
+          run.calls
+            .filter(([method]) => method === "conversations.history")
+            .map(([, params]) => `${params.oldest}..${params.latest}`)
+        ),
+      ].sort(),
+      lines: [...note.matchAll(/^(?:message \d+|edge message)$/gm)].map(
+        match => match[0]
+      ),
+    };
+  };
+
+  it("pages each window on its own chain and stitches them in order", () => {
+    const { windows, lines } = backfill(channelOf(START), [
+      "--backfill-windows",
+      "4",
+    ]);
+    const sequential = backfill(channelOf(START), []);
+
+    expect(windows).toEqual([
+      "1700000000.000000..1700000100.000000",
+      "1700000100.000000..1700000200.000000",
+      "1700000200.000000..1700000300.000000",
+      "1700000300.000000..1700000400.000000",
+    ]);
+    expect(lines).toHaveLength(401);
+    expect(lines.filter(line => line === "edge message")).toHaveLength(1);
+    expect(lines).toEqual(sequential.lines);
+  });
+
+  it("pages one chain when there is no lower bound to split", () => {
+    const { windows, lines } = backfill(channelOf(), [
+      "--backfill-windows",
+      "4",
+    ]);
+
+    expect(windows).toEqual(["undefined..1700000400"]);
+    expect(lines).toHaveLength(401);
+  });
+});
@@ -0,0 +1,129 @@
+/**
+ * Slack connector: keep-alive connection pool.
+ *
+ * `SlackClient` sends every call through a pool of persistent `http.client`
+ * connections to the API base, asking for gzip. These tests point it at a
+ * local stand-in server and count the TCP connections it actually opens.
+ * @module tests/unit/strategies/wiki-slack-connection-pool
+ */
+import { describe, expect, it } from "vitest";
+
+import { runConnectorPython } from "../../helpers/slack-ingest-harness.js";
+
+/**
+ * A keep-alive stand-in for the Slack Web API on an ephemeral port. It answers
+ * every method with `{ok, method}` (gzipped when asked), records the client
+ * port of each request, hangs up after `conversations.info`, and answers
+ * `users.list` with one 429.
+ */
+const STAND_IN = String.raw`
+import gzip, json, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+peers = []
+encodings = []
+limited = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        peers.append(self.client_address[1])
+        if self.path.endswith("users.list") and not limited:
+            limited.append(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"ok": True, "method": self.path}).encode()
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        encodings.append(self.headers.get("Accept-Encoding"))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path.endswith("conversations.info"):
+            self.close_connection = True
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}/api"
+client = mod.SlackClient("xoxp-fixture", mod.RateLimiter({2: 60000, 3: 60000}), base)
+`;
+
+/**
+ * Runs a scenario against the stand-in and parses the JSON it prints.
+ * @param scenario - Python source run after the stand-in is up.
+ * @returns The printed value.
+ */
+const against = (scenario: string): Record<string, unknown> => {
+  const { status, stdout, stderr } = runConnectorPython(
+    `${STAND_IN}\n${scenario}`
+  );
+  expect(stderr).toBe("");
+  expect(status).toBe(0);
+  return JSON.parse(stdout) as Record<string, unknown>;
+};
+
+describe("lisa-wiki Slack connector connection pool", () => {
+  it("sends many calls over one gzip keep-alive connection", () => {
+    const result = against(
+      [
+        "methods = {client.call('conversations.history')['method'] for _ in range(25)}",
+        "print(json.dumps({'methods': sorted(methods), 'connections': len(set(peers)), 'encodings': sorted(set(encodings))}))",
+      ].join("\n")
+    );
+
+    expect(result).toEqual({
+      methods: ["/api/conversations.history"],
+      connections: 1,
+      encodings: ["gzip"],
+    });
+  });
+
+  it("reconnects when the server drops an idle connection", () => {
+    const result = against(
+      [
+        "client.call('conversations.history')",
+        "client.call('conversations.info')",
+        "after = client.call('conversations.history')['method']",
+        "print(json.dumps({'after': after, 'opened': client.pool.opened, 'connections': len(set(peers))}))",
+      ].join("\n")
+    );
+
+    expect(result).toEqual({
+      after: "/api/conversations.history",
+      opened: 2,
+      connections: 2,
+    });
+  });
+
+  it("turns an HTTP 429 into a paced retry", () => {
+    const result = against(
+      [
+        "payload = client.call('users.list')",
+        "print(json.dumps({'ok': payload['ok'], 'rate_limited': client.stats['rate_limited']}))",
+      ].join("\n")
+    );
+
+    expect(result).toEqual({ ok: true, rate_limited: 1 });
+  });
+
+  it("rejects an API base that is not an http(s) URL", () => {
+    const { status, stderr } = runConnectorPython(
+      "mod.SlackClient('xoxp-fixture', api_base='ftp://slack.example/api')"
+    );
+
+    expect(status).toBe(1);
+    expect(stderr).toContain("Slack API base must be an http(s) URL");
+  });
+});
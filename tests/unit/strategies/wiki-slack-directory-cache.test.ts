@@ -0,0 +1,131 @@
+/**
+ * Slack connector: persistent channel and user directory cache.
+ *
+ * `conversations.list` and `users.list` are paged once per TTL into
+ * `wiki/state/slack/directory.json`. Until the TTL lapses, `#name` resolution
+ * and user names come from that file without a call, and notes render users
+ * by name. A name the fresh cache has never seen forces one refresh.
+ * @module tests/unit/strategies/wiki-slack-directory-cache
+ */
+import { existsSync, mkdtempSync, readFileSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const DIRECTORY = path.join("wiki", "state", "slack", "directory.json");
+const LISTING_METHODS = ["conversations.list", "users.list"];
+
+const WORKSPACE: SlackWorkspace = {
+  channels: [
+    { id: "C0GENERAL", name: "general" },
+    { id: "C0DESIGN", name: "design" },
+  ],
+  users: [
+    { id: "U0", name: "ada", profile: { display_name: "Ada" } },
+    { id: "U1", name: "grace", real_name: "Grace Hopper" },
+  ],
+  history: { C0GENERAL: messagesFrom(2), C0DESIGN: messagesFrom(1) },
+  replies: {},
+};
+
+describe("lisa-wiki Slack connector directory cache", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-directory-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Ingests a channel and reports which directory listings it paged.
+   * @param workspace - What the fixture client serves.
+   * @param args - Connector arguments.
+   * @returns The directory methods called, and the run's stdout.
+   */
+  const ingest = (workspace: SlackWorkspace, args: string[]) => {
+    const run = runIngest(tmp, workspace, args);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    return {
+      listings: run.calls
+        .map(([method]) => method)
+        .filter(method => LISTING_METHODS.includes(method)),
+      stdout: run.stdout,
+    };
+  };
+
+  it("renders user names from a cached users.list directory", () => {
+    const first = ingest(WORKSPACE, ["--channel", "#general"]);
+    const notePath = /Wrote (\S+)/.exec(first.stdout)?.[1] ?? "";
+    const note = readFileSync(path.join(tmp, notePath), "utf8");
+    const directory = JSON.parse(
+      readFileSync(path.join(tmp, DIRECTORY), "utf8")
+    ) as Record<string, { validated_at: string; entries: unknown }>;
+
+    expect(first.listings).toEqual(LISTING_METHODS);
+    expect(note).toContain(" - Ada (U0)");
+    expect(note).toContain(" - Grace Hopper (U1)");
+    expect(directory.users?.entries).toEqual({
+      U0: "Ada",
+      U1: "Grace Hopper",
+    });
+    expect(Object.keys(directory.channels ?? {}).sort()).toEqual([
+      "entries",
+      "validated_at",
+    ]);
+  });
+
+  it("resolves names without a listing while the cache is fresh", () => {
+    ingest(WORKSPACE, ["--channel", "#general"]);
+    const second = ingest(WORKSPACE, ["--channel", "#design"]);
+
+    expect(second.listings).toEqual([]);
+  });
+
+  it("re-lists once the cache is older than the TTL", () => {
+    ingest(WORKSPACE, ["--channel", "#general"]);
+    const stale = ingest(WORKSPACE, [
+      "--channel",
+      "#general",
+      "--directory-ttl-hours",
+      "0",
+    ]);
+
+    expect(stale.listings).toEqual(LISTING_METHODS);
+  });
+
+  it("refreshes once for a channel newer than the cache", () => {
+    ingest(WORKSPACE, ["--channel", "#general"]);
+    const grown: SlackWorkspace = {
+      ...WORKSPACE,
+      channels: [...WORKSPACE.channels, { id: "C0NEW", name: "brand-new" }],
+      history: { ...WORKSPACE.history, C0NEW: messagesFrom(1) },
+    };
+    const { listings } = ingest(grown, ["--channel", "#brand-new"]);
+
+    expect(listings).toEqual(["conversations.list"]);
+  });
+
+  it("keeps nothing on disk with --directory-cache off", () => {
+    const { listings } = ingest(WORKSPACE, [
+      "--channel",
+      "#general",
+      "--directory-cache",
+      "off",
+      "--no-user-names",
+    ]);
+
+    expect(listings).toEqual(["conversations.list"]);
+    expect(existsSync(path.join(tmp, DIRECTORY))).toBe(false);
+  });
+});
@@ -0,0 +1,139 @@
+/**
+ * Slack connector: cross-run message fingerprints.
+ *
+ * The proposed cursor carries a fingerprint index (`ts` → short hash of the
+ * message's edit ts, text and reply count) for the overlap window. A later run
+ * emits only messages whose fingerprint moved, so a change Slack does not mark
+ * as an edit still lands, and a run that finds nothing new writes no note.
+ * @module tests/unit/strategies/wiki-slack-fingerprints
+ */
+import {
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0PRINTS";
+const META = path.join("wiki", "state", "handoff", "slack.json");
+const STATE_DIR = path.join("wiki", "state", "slack");
+const SOURCE_DIR = path.join("wiki", "sources", "slack");
+
+interface Cursor {
+  fingerprints?: Record<string, string>;
+  source_notes: string[];
+  last_message_count: number;
+}
+
+/**
+ * Ten messages; `rewrite` replaces message 4's text without an edit mark, as
+ * a bot updating its own message can.
+ * @param rewrite - New text for message 4, if any.
+ * @returns The fixture workspace.
+ */
+const channelOf = (rewrite?: string): SlackWorkspace => ({
+  channels: [{ id: CHANNEL, name: "prints" }],
+  history: {
+    [CHANNEL]: messagesFrom(10).map((message, index) =>
+      index === 4 && rewrite ? { ...message, text: rewrite } : message
+    ),
+  },
+  replies: {},
+});
+
+describe("lisa-wiki Slack connector fingerprint index", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-prints-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Runs one ingest and advances state from its proposed cursor, as the kernel
+   * does after verification.
+   * @param fixture - The workspace as of this run.
+   * @param keep - Rewrites the cursor before it is stored as state.
+   * @returns The proposed cursor and the notes written by this run.
+   */
+  const ingest = (
+    fixture: SlackWorkspace,
+    keep: (cursor: Cursor) => Cursor = cursor => cursor
+  ) => {
+    rmSync(path.join(tmp, SOURCE_DIR), { force: true, recursive: true });
+    const run = runIngest(tmp, fixture, [
+      "--channel",
+      CHANNEL,
+      "--emit-meta",
+      META,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const { proposedCursor } = JSON.parse(
+      readFileSync(path.join(tmp, META), "utf8")
+    ) as { proposedCursor: Cursor };
+    mkdirSync(path.join(tmp, STATE_DIR), { recursive: true });
+    writeFileSync(
+      path.join(tmp, STATE_DIR, `${CHANNEL}.json`),
+      JSON.stringify(keep(proposedCursor))
+    );
+    const notes = readdirSync(path.join(tmp, SOURCE_DIR))
+      .filter(name => name.endsWith(".md"))
+      .map(name => readFileSync(path.join(tmp, SOURCE_DIR, name), "utf8"));
+    return { cursor: proposedCursor, notes, stdout: run.stdout };
+  };
+
+  it("fingerprints every message in the overlap window", () => {
+    const { cursor } = ingest(channelOf());
+    const fingerprints = cursor.fingerprints ?? {};
+
+    expect(Object.keys(fingerprints)).toHaveLength(10);
+    for (const digest of Object.values(fingerprints)) {
+      expect(digest).toMatch(/^[0-9a-f]{16}$/);
+    }
+  });
+
+  it("writes no note when nothing changed", () => {
+    const first = ingest(channelOf());
+    const second = ingest(channelOf());
+
+    expect(second.notes).toEqual([]);
+    expect(second.stdout).toContain("no note written");
+    expect(second.cursor.last_message_count).toBe(0);
+    expect(second.cursor.source_notes).toEqual(first.cursor.source_notes);
+    expect(second.cursor.fingerprints).toEqual(first.cursor.fingerprints);
+  });
+
+  it("emits a message whose text changed without an edit mark", () => {
+    ingest(channelOf());
+    const { cursor, notes } = ingest(channelOf("message 4, rewritten"));
+
+    expect(cursor.last_message_count).toBe(1);
+    expect(notes).toHaveLength(1);
+    expect(notes[0]).toContain("message 4, rewritten");
+    expect(notes[0]?.match(/^- ts: /gm)).toHaveLength(1);
+  });
+
+  it("falls back to the watermark for state without fingerprints", () => {
+    ingest(channelOf(), cursor => ({ ...cursor, fingerprints: undefined }));
+    const { notes, cursor } = ingest(channelOf());
+
+    expect(notes).toEqual([]);
+    expect(Object.keys(cursor.fingerprints ?? {})).toHaveLength(10);
+  });
+});
@@ -0,0 +1,137 @@
+/**
+ * Slack connector: multi-channel and whole-workspace ingest.
+ *
+ * `--channels` takes IDs, `#names`, name globs and `all-member`, resolves them
+ * in at most one `conversations.list` pass, ingests the channels concurrently
+ * under one client, and emits one proposed cursor per channel.
+ * @module tests/unit/strategies/wiki-slack-multi-channel
+ */
+import {
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const META = path.join("wiki", "state", "handoff", "slack.json");
+const SOURCE_DIR = path.join("wiki", "sources", "slack");
+
+const WORKSPACE: SlackWorkspace = {
+  auth: { team_id: "T0FIXTURE", url: "https://fixture.slack.com/" },
+  channels: [
+    { id: "C0ALPHA", name: "eng-alpha", is_member: true },
+    { id: "C0BETA", name: "eng-beta", is_member: true },
+    { id: "C0RANDOM", name: "random", is_member: false },
+    { id: "C0OPS", name: "ops", is_member: true },
+  ],
+  history: {
+    C0ALPHA: messagesFrom(3),
+    C0BETA: messagesFrom(4),
+    C0RANDOM: messagesFrom(5),
+    C0OPS: messagesFrom(6),
+  },
+  replies: {},
+};
+
+describe("lisa-wiki Slack connector multi-channel ingest", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-channels-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Ingests with `--channels` and reads back the emitted cursors.
+   * @param selectors - The `--channels` values.
+   * @param extra - Further connector arguments.
+   * @returns Recorded methods, cursor channel IDs and message counts.
+   */
+  const ingest = (selectors: string[], extra: string[] = []) => {
+    const run = runIngest(tmp, WORKSPACE, [
+      "--channels",
+      ...selectors,
+      "--emit-meta",
+      META,
+      ...extra,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const { proposedCursors } = JSON.parse(
+      readFileSync(path.join(tmp, META), "utf8")
+    ) as {
+      proposedCursors: { channel_id: string; last_message_count: number }[];
+    };
+    return {
+      methods: run.calls.map(([method]) => method),
+      channels: proposedCursors.map(cursor => cursor.channel_id),
+      counts: proposedCursors.map(cursor => cursor.last_message_count),
+    };
+  };
+
+  it("resolves globs and IDs in one listing pass", () => {
+    const { methods, channels, counts } = ingest(["#eng-*", "C0OPS"]);
+
+    expect(channels).toEqual(["C0ALPHA", "C0BETA", "C0OPS"]);
+    expect(counts).toEqual([3, 4, 6]);
+    expect(methods.filter(method => method === "conversations.list")).toEqual(
+      ["conversations.list"]
+    );
+    expect(methods).not.toContain("conversations.info");
+    expect(
+      readdirSync(path.join(tmp, SOURCE_DIR)).filter(name =>
+        name.endsWith(".md")
+      )
+    ).toHaveLength(3);
+  });
+
+  it("ingests every channel the user belongs to under all-member", () => {
+    const { channels } = ingest(["all-member"]);
+
+    expect(channels).toEqual(["C0ALPHA", "C0BETA", "C0OPS"]);
+  });
+
+  it("accepts comma-separated IDs without listing the workspace", () => {
+    const { methods, channels } = ingest(["C0RANDOM,C0ALPHA"]);
+
+    expect(channels).toEqual(["C0RANDOM", "C0ALPHA"]);
+    expect(methods).not.toContain("conversations.list");
+  });
+
+  it("runs the tenant guard once for the whole run", () => {
+    const config = path.join(tmp, "wiki", "lisa-wiki.config.json");
+    mkdirSync(path.dirname(config), { recursive: true });
+    writeFileSync(
+      config,
+      JSON.stringify({
+        connectors: { slack: { tenantGuard: { teamId: "T0FIXTURE" } } },
+      })
+    );
+    const { methods, channels } = ingest(["all-member"], ["--config", config]);
+
+    expect(channels).toHaveLength(3);
+    expect(methods.filter(method => method === "auth.test")).toHaveLength(1);
+  });
+
+  it("fails on a channel name that does not exist", () => {
+    const run = runIngest(tmp, WORKSPACE, ["--channels", "#missing"]);
+
+    expect(run.status).toBe(1);
+    expect(run.stderr).toContain("Could not resolve Slack channel '#missing'");
+  });
+});
@@ -0,0 +1,114 @@
+/**
+ * Slack connector: token-bucket pacing and retries.
+ *
+ * Every `SlackClient.call` takes a token from its method tier's bucket, so a
+ * burst drains the bucket and later calls are spaced at the tier's rate. A 429
+ * holds the whole tier for `Retry-After`; 5xx and network errors are retried
+ * after a jittered backoff. Time spent throttled is counted on the client.
+ * @module tests/unit/strategies/wiki-slack-rate-limit
+ */
+import { describe, expect, it } from "vitest";
+
+import { runConnectorPython } from "../../helpers/slack-ingest-harness.js";
+
+/**
+ * Runs a snippet that prints one JSON value and parses it.
+ * @param snippet - Python source ending in a `print(json.dumps(...))`.
+ * @returns The printed value.
+ */
+const evaluate = (snippet: string): unknown => {
+  const { status, stdout, stderr } = runConnectorPython(snippet);
+  expect(stderr).toBe("");
+  expect(status).toBe(0);
+  return JSON.parse(stdout);
+};
+
+describe("lisa-wiki Slack connector rate limiting", () => {
+  it("lets a burst through, then spaces calls at the tier rate", () => {
+    const waits = evaluate(
+      [
+        "import json",
+        "bucket = mod.TokenBucket(600, 2)",
+        "now = bucket.updated",
+        "print(json.dumps([round(bucket.reserve(now), 3) for _ in range(4)]))",
+      ].join("\n")
+    );
+
+    expect(waits).toEqual([0, 0, 0.1, 0.2]);
+  });
+
+  it("holds a tier for Retry-After before its next token", () => {
+    const wait = evaluate(
+      [
+        "import json",
+        "bucket = mod.TokenBucket(600, 2)",
+        "now = bucket.updated",
+        "bucket.pause(now, 5)",
+        "print(json.dumps(round(bucket.reserve(now), 3)))",
+      ].join("\n")
+    );
+
+    expect(wait).toBe(5.1);
+  });
+
+  it("paces Tier 2 methods slower than Tier 4 methods", () => {
+    const rates = evaluate(
+      [
+        "import json",
+        "limiter = mod.RateLimiter()",
+        "print(json.dumps([limiter.bucket(m).rate * 60 for m in ('conversations.list', 'conversations.replies', 'auth.test')]))",
+      ].join("\n")
+    );
+
+    expect(rates).toEqual([20, 50, 100]);
+  });
+
+  it("retries 429, 5xx and network errors and counts the time throttled", () => {
+    const stats = evaluate(
+      [
+        "import io, json, urllib.error",
+        "class Flaky(mod.SlackClient):",
+        "    BACKOFF_BASE = 0.01",
+        "    steps = ['429', '503', 'reset', 'ok']",
+        "    def send(self, method, params):",
+        "        step = self.steps.pop(0)",
+        "        if step == '429':",
+        "            raise urllib.error.HTTPError('u', 429, 'ratelimited', {'Retry-After': '0.2'}, io.BytesIO())",
+        "        if step == '503':",
+        "            raise urllib.error.HTTPError('u', 503, 'unavailable', {}, io.BytesIO())",
+        "        if step == 'reset':",
+        "            raise urllib.error.URLError('connection reset')",
+        "        return {'ok': True}",
+        "client = Flaky('xoxp-fixture', mod.RateLimiter({3: 6000}))",
+        "assert client.call('conversations.history') == {'ok': True}",
+        "print(json.dumps(client.stats))",
+      ].join("\n")
+    );
+
+    expect(stats).toMatchObject({
+      calls: 4,
+      rate_limited: 1,
+      rate_limited_seconds: 0.2,
+      retries: 3,
+    });
+    expect(
+      (stats as { throttled_seconds: number }).throttled_seconds
+    ).toBeGreaterThanOrEqual(0.2);
+  });
+
+  it("gives up once the retry budget is spent", () => {
+    const { status, stderr } = runConnectorPython(
+      [
+        "import io, urllib.error",
+        "class Down(mod.SlackClient):",
+        "    BACKOFF_BASE = 0.001",
+        "    def send(self, method, params):",
+        "        raise urllib.error.HTTPError('u', 502, 'bad gateway', {}, io.BytesIO())",
+        "Down('xoxp-fixture').call('conversations.history', retries=2)",
+      ].join("\n")
+    );
+
+    expect(status).not.toBe(0);
+    expect(stderr).toContain("HTTP Error 502");
+  });
+});
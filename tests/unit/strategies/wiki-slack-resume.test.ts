@@ -0,0 +1,126 @@
+/**
+ * Slack connector: resumable checkpoints.
+ *
+ * Every fetched history page is spooled under
+ * `wiki/state/slack/checkpoints/<channel>/` next to a `checkpoint.json` holding
+ * each chain's next cursor, the running counts and the index of threads already
+ * fetched. A run that dies leaves them behind; `--resume` continues from the
+ * last saved page, and a finished run removes them.
+ * @module tests/unit/strategies/wiki-slack-resume
+ */
+import { existsSync, mkdtempSync, readFileSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0RESUME";
+const CHECKPOINT = path.join("wiki", "state", "slack", "checkpoints", CHANNEL);
+const ARGS = ["--channel", CHANNEL, "--limit", "10", "--no-user-names"];
+
+/**
+ * 95 messages, ten to a page; message 90, on the newest page, opens a thread.
+ * @returns The fixture workspace.
+ */
+const channelOf = (): SlackWorkspace => {
+  const history = messagesFrom(95);
+  const parent = history[90]?.ts ?? "";
+  const reply = { ts: "1700000091.000200", thread_ts: parent, text: "a reply" };
+  history[90] = {
+    ...history[90],
+    ts: parent,
+    thread_ts: parent,
+    reply_count: 1,
+    latest_reply: reply.ts,
+  };
+  return {
+    channels: [{ id: CHANNEL, name: "resume" }],
+    history: { [CHANNEL]: history },
+    replies: { [CHANNEL]: { [parent]: [reply] } },
+  };
+};
+
+describe("lisa-wiki Slack connector resumable checkpoints", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-resume-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Runs the connector into an outage on the fourth history page.
+   * @returns The checkpoint the failed run left behind.
+   */
+  const crash = () => {
+    const run = runIngest(
+      tmp,
+      { ...channelOf(), failAfter: { "conversations.history": 3 } },
+      ARGS
+    );
+    expect(run.status).toBe(1);
+    return JSON.parse(
+      readFileSync(path.join(tmp, CHECKPOINT, "checkpoint.json"), "utf8")
+    ) as {
+      chains: { cursor: string | null; pages: number; done: boolean }[];
+      threads: Record<string, unknown>;
+    };
+  };
+
+  it("checkpoints every page and thread fetched before a failure", () => {
+    const checkpoint = crash();
+
+    expect(checkpoint.chains).toEqual([
+      { cursor: "30", pages: 3, done: false },
+    ]);
+    expect(Object.keys(checkpoint.threads)).toEqual(["1700000090.000100"]);
+  });
+
+  it("resumes from the last saved page with --resume", () => {
+    crash();
+    const run = runIngest(tmp, channelOf(), [...ARGS, "--resume"]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const notePath = /Wrote (\S+)/.exec(run.stdout)?.[1] ?? "";
+    const note = readFileSync(path.join(tmp, notePath), "utf8");
+    const order = [...note.matchAll(/^message (\d+)$/gm)].map(match =>
+      Number(match[1])
+    );
+
+    expect(
+      run.calls
+        .filter(([method]) => method === "conversations.history")
+        .map(([, params]) => params.cursor)
+    ).toEqual(["30", "40", "50", "60", "70", "80", "90"]);
+    expect(run.calls.map(([method]) => method)).not.toContain(
+      "conversations.replies"
+    );
+    expect(note).toContain("- Messages: `95`");
+    expect(note).toContain("a reply");
+    expect(order).toHaveLength(95);
+    expect(order).toEqual([...order].sort((left, right) => left - right));
+    expect(existsSync(path.join(tmp, path.dirname(CHECKPOINT)))).toBe(false);
+  });
+
+  it("starts over when run without --resume", () => {
+    crash();
+    const run = runIngest(tmp, channelOf(), ARGS);
+    const history = run.calls.filter(
+      ([method]) => method === "conversations.history"
+    );
+
+    expect(run.status).toBe(0);
+    expect(history[0]?.[1].cursor).toBeUndefined();
+    expect(history).toHaveLength(10);
+    expect(existsSync(path.join(tmp, path.dirname(CHECKPOINT)))).toBe(false);
+  });
+});
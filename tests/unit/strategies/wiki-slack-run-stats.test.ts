@@ -0,0 +1,141 @@
+/**
+ * Slack connector: run statistics in the proposed cursor.
+ *
+ * Each proposed cursor carries `run_stats` for the run that produced it: API
+ * calls in total and per method, bytes received, rate-limit and retry time,
+ * history pages fetched, wall time per phase and peak memory. Channels
+ * ingested together each report only their own calls.
+ * @module tests/unit/strategies/wiki-slack-run-stats
+ */
+import { mkdtempSync, readFileSync, rmSync } from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const META = path.join("wiki", "state", "handoff", "slack.json");
+const PARENT = "1700000100.000100";
+
+const WORKSPACE: SlackWorkspace = {
+  channels: [
+    { id: "C0STATS", name: "stats" },
+    { id: "C0QUIET", name: "quiet" },
+  ],
+  history: {
+    C0STATS: [
+      ...messagesFrom(25),
+      {
+        ts: PARENT,
+        text: "thread",
+        thread_ts: PARENT,
+        reply_count: 1,
+        latest_reply: "1700000101.000200",
+      },
+    ],
+    C0QUIET: messagesFrom(3),
+  },
+  replies: {
+    C0STATS: {
+      [PARENT]: [{ ts: "1700000101.000200", thread_ts: PARENT, text: "r" }],
+    },
+  },
+};
+
+interface RunStats {
+  calls: number;
+  methods: Record<string, number>;
+  bytes_received: number;
+  rate_limited_seconds: number;
+  backoff_seconds: number;
+  resumed: boolean;
+  pages: number;
+  wall_seconds: Record<string, number>;
+  peak_rss_mb: number | null;
+}
+
+describe("lisa-wiki Slack connector run statistics", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-stats-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Ingests with the given target arguments and reads back each cursor's stats.
+   * @param args - Channel selection and other connector arguments.
+   * @returns The `run_stats` of every emitted cursor, keyed by channel ID.
+   */
+  const statsOf = (args: readonly string[]) => {
+    const run = runIngest(tmp, WORKSPACE, [
+      ...args,
+      "--limit",
+      "10",
+      "--no-user-names",
+      "--emit-meta",
+      META,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const meta = JSON.parse(readFileSync(path.join(tmp, META), "utf8")) as {
+      proposedCursor?: { channel_id: string; run_stats: RunStats };
+      proposedCursors?: { channel_id: string; run_stats: RunStats }[];
+    };
+    const cursors = meta.proposedCursors ?? [];
+    return Object.fromEntries(
+      (meta.proposedCursor ? [meta.proposedCursor] : cursors).map(cursor => [
+        cursor.channel_id,
+        cursor.run_stats,
+      ])
+    );
+  };
+
+  it("reports calls, pages and wall time per phase", () => {
+    const stats = statsOf(["--channel", "C0STATS"]).C0STATS;
+
+    expect(stats).toMatchObject({
+      calls: 4,
+      methods: { "conversations.history": 3, "conversations.replies": 1 },
+      bytes_received: 0,
+      rate_limited_seconds: 0,
+      backoff_seconds: 0,
+      resumed: false,
+      pages: 3,
+    });
+    expect(Object.keys(stats?.wall_seconds ?? {})).toEqual([
+      "resolve",
+      "history",
+      "replies",
+      "files",
+      "render",
+      "write",
+      "total",
+    ]);
+    for (const seconds of Object.values(stats?.wall_seconds ?? {})) {
+      expect(seconds).toBeGreaterThanOrEqual(0);
+    }
+    if (process.platform !== "win32") {
+      expect(stats?.peak_rss_mb).toBeGreaterThan(0);
+    }
+  });
+
+  it("counts each channel's own calls under --channels", () => {
+    const stats = statsOf(["--channels", "C0STATS,C0QUIET"]);
+
+    expect(stats.C0STATS?.methods).toEqual({
+      "conversations.history": 3,
+      "conversations.replies": 1,
+    });
+    expect(stats.C0QUIET?.methods).toEqual({ "conversations.history": 1 });
+    expect(stats.C0QUIET?.pages).toBe(1);
+  });
+});
@@ -0,0 +1,192 @@
+/**
+ * Slack connector: day-sharded source notes.
+ *
+ * With `--shard-by day` a channel's messages live in
+ * `wiki/sources/slack/<name>-<id>/YYYY-MM-DD.md` (plus JSONL sidecars), one
+ * shard per UTC day of the thread parent, with `index.json`/`index.md` mapping
+ * days to time ranges. Later runs merge into the shards and rewrite only those
+ * whose content changed; the cursor lists just the index note.
+ * @module tests/unit/strategies/wiki-slack-shards
+ */
+import {
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  runIngest,
+  type SlackMessage,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0SHARD";
+const META = path.join("wiki", "state", "handoff", "slack.json");
+const STATE_DIR = path.join("wiki", "state", "slack");
+const SHARDS = path.join("wiki", "sources", "slack", "shard-C0SHARD");
+const DAY = 86_400;
+/** 2023-11-15T00:00:00Z */
+const START = 1_700_006_400;
+const PARENT = `${START + 3600}.000100`;
+const LATE_REPLY = `${START + DAY + 10}.000200`;
+
+/**
+ * A message `offset` seconds after midnight on 2023-11-15.
+ * @param offset - Seconds after `START`.
+ * @param text - Message text.
+ * @returns The message.
+ */
+const at = (offset: number, text: string): SlackMessage => ({
+  ts: `${START + offset}.000100`,
+  text,
+});
+
+/**
+ * Three days of messages; the thread started on day one has a reply on day two.
+ * @param extra - Messages to add to the history.
+ * @returns The fixture workspace.
+ */
+const channelOf = (extra: SlackMessage[] = []): SlackWorkspace => ({
+  channels: [{ id: CHANNEL, name: "shard" }],
+  history: {
+    [CHANNEL]: [
+      at(60, "day one"),
+      {
+        ...at(3600, "thread on day one"),
+        thread_ts: PARENT,
+        reply_count: 1,
+        latest_reply: LATE_REPLY,
+      },
+      at(DAY + 5, "day two"),
+      at(2 * DAY + 7, "day three"),
+      ...extra,
+    ],
+  },
+  replies: {
+    [CHANNEL]: {
+      [PARENT]: [{ ts: LATE_REPLY, thread_ts: PARENT, text: "next-day reply" }],
+    },
+  },
+});
+
+describe("lisa-wiki Slack connector day shards", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-shards-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Runs one sharded ingest and advances state from its proposed cursor, as
+   * the kernel does after verification.
+   * @param fixture - The workspace as of this run.
+   * @returns The proposed cursor.
+   */
+  const ingest = (fixture: SlackWorkspace) => {
+    const run = runIngest(tmp, fixture, [
+      "--channel",
+      CHANNEL,
+      "--shard-by",
+      "day",
+      "--no-user-names",
+      "--emit-meta",
+      META,
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    const { proposedCursor } = JSON.parse(
+      readFileSync(path.join(tmp, META), "utf8")
+    ) as {
+      proposedCursor: { source_notes: string[]; shards_written: string[] };
+    };
+    mkdirSync(path.join(tmp, STATE_DIR), { recursive: true });
+    writeFileSync(
+      path.join(tmp, STATE_DIR, `${CHANNEL}.json`),
+      JSON.stringify(proposedCursor)
+    );
+    return proposedCursor;
+  };
+
+  const read = (name: string) =>
+    readFileSync(path.join(tmp, SHARDS, name), "utf8");
+
+  it("writes one shard per day with an index of their ranges", () => {
+    const cursor = ingest(channelOf());
+    const index = JSON.parse(read("index.json")) as Record<
+      string,
+      { path: string; from_ts: string; to_ts: string; messages: number }
+    >;
+
+    expect(readdirSync(path.join(tmp, SHARDS)).sort()).toEqual([
+      "2023-11-15.jsonl",
+      "2023-11-15.md",
+      "2023-11-16.jsonl",
+      "2023-11-16.md",
+      "2023-11-17.jsonl",
+      "2023-11-17.md",
+      "index.json",
+      "index.md",
+    ]);
+    expect(index["2023-11-15"]).toMatchObject({
+      path: "2023-11-15.md",
+      from_ts: `${START + 60}.000100`,
+      to_ts: LATE_REPLY,
+      messages: 2,
+    });
+    expect(read("2023-11-15.md")).toContain("next-day reply");
+    expect(read("2023-11-16.md")).not.toContain("next-day reply");
+    expect(read("index.md")).toContain(
+      "| [2023-11-16](2023-11-16.md) | 2023-11-16T00:00:05Z |"
+    );
+    expect(cursor.source_notes).toEqual([path.join(SHARDS, "index.md")]);
+    expect(cursor.shards_written).toHaveLength(3);
+  });
+
+  it("rewrites only the shards whose content changed", () => {
+    ingest(channelOf());
+    const untouched = ingest(channelOf());
+    const [dayOne, dayTwo, dayThree] = ["15", "16", "17"].map(day =>
+      read(`2023-11-${day}.md`)
+    );
+    const edited = channelOf([at(2 * DAY + 900, "later on day three")]);
+    const history = edited.history[CHANNEL] ?? [];
+    const changed = ingest({
+      ...edited,
+      history: {
+        [CHANNEL]: history.map(message =>
+          message.text === "day two"
+            ? {
+                ...message,
+                text: "day two, edited",
+                edited: { ts: `${START + 3 * DAY}.000000` },
+              }
+            : message
+        ),
+      },
+    });
+
+    expect(untouched.shards_written).toEqual([]);
+    expect(changed.shards_written).toEqual([
+      path.join(SHARDS, "2023-11-16.md"),
+      path.join(SHARDS, "2023-11-17.md"),
+    ]);
+    expect(read("2023-11-15.md")).toBe(dayOne);
+    expect(read("2023-11-16.md")).not.toBe(dayTwo);
+    expect(read("2023-11-16.md")).toContain("day two, edited");
+    expect(read("2023-11-16.md").match(/- ts: /g)).toHaveLength(1);
+    expect(read("2023-11-17.md")).toContain("day three");
+    expect(read("2023-11-17.md")).not.toBe(dayThree);
+    expect(changed.source_notes).toEqual([path.join(SHARDS, "index.md")]);
+  });
+});
@@ -0,0 +1,93 @@
+/**
+ * Slack connector: local API stand-in and end-to-end benchmark.
+ *
+ * `scripts/bench-slack-ingest.py` runs the real connector, over HTTP, against
+ * `scripts/slack-api-stand-in.py` serving a synthetic channel, with pacing
+ * lifted through `--tier-rate` and 429s injected on request. These runs keep
+ * both scripts working and check that every message lands despite the 429s.
+ * @module tests/unit/strategies/wiki-slack-stand-in-bench
+ */
+import { spawnSync } from "node:child_process";
+import path from "node:path";
+
+import { describe, expect, it } from "vitest";
+
+import { runConnectorPython } from "../../helpers/slack-ingest-harness.js";
+
+const BENCH = path.resolve("scripts/bench-slack-ingest.py");
+const PYTHON_BIN = process.env.PYTHON ?? "python3";
+
+/**
+ * Benchmarks a 300-message channel, refusing every seventh request.
+ * @param connectorArgs - Extra connector arguments.
+ * @returns The benchmark's exit status, stderr and parsed JSON row.
+ */
+const bench = (connectorArgs: readonly string[] = []) => {
+  const result = spawnSync(
+    PYTHON_BIN,
+    [
+      BENCH,
+      "--sizes",
+      "300",
+      "--latency-ms",
+      "0",
+      "--page-size",
+      "50",
+      "--rate-limit-every",
+      "7",
+      "--retry-after",
+      "0",
+      "--json",
+      ...(connectorArgs.length ? ["--", ...connectorArgs] : []),
+    ],
+    { encoding: "utf8", timeout: 60_000 }
+  );
+  return {
+    status: result.status,
+    stderr: result.stderr,
+    row: JSON.parse(result.stdout || "{}") as {
+      ingested?: number;
+      replies?: number;
+      rate_limited?: number;
+      calls?: Record<string, number>;
+    },
+  };
+};
+
+describe("lisa-wiki Slack connector stand-in benchmark", () => {
+  it("ingests every message through injected 429s", () => {
+    const { status, stderr, row } = bench();
+
+    expect(stderr).toBe("");
+    expect(status).toBe(0);
+    expect(row.ingested).toBe(300);
+    expect(row.replies).toBe(45);
+    expect(row.rate_limited).toBeGreaterThan(0);
+    expect(row.calls?.["conversations.history"]).toBe(6);
+  });
+
+  it("passes connector arguments after --", () => {
+    const { status, row } = bench(["--backfill-windows", "3"]);
+
+    expect(status).toBe(0);
+    expect(row.ingested).toBe(300);
+    expect(row.calls?.["conversations.history"]).toBeGreaterThan(6);
+  });
+
+  it("rejects a --tier-rate outside Slack's tiers", () => {
+    const run = runConnectorPython(
+      [
+        "print(mod.tier_rate('3=600'))",
+        "try:",
+        "    mod.tier_rate('5=10')",
+        "except Exception as error:",
+        "    print(type(error).__name__)",
+      ].join("\n")
+    );
+
+    expect(run.stdout.trim().split("\n")).toEqual([
+      "(3, 600)",
+      "ArgumentTypeError",
+    ]);
+  });
+});
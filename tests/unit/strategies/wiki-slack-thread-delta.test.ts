@@ -0,0 +1,214 @@
+/**
+ * Slack connector: delta-only thread refresh.
+ *
+ * The proposed cursor carries a thread index (`thread_ts` →
+ * `[latest_reply, reply_count]`). A later run over the overlap window fetches
+ * replies only for threads whose entry moved, and emits only messages that are
+ * new or edited since the cursor's watermark. Each test plays the kernel's
+ * part by advancing `wiki/state/slack/<channel>.json` from the emitted meta.
+ * @module tests/unit/strategies/wiki-slack-thread-delta
+ */
+import {
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+  writeFileSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type IngestRun,
+  type SlackMessage,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0DELTA";
+const META = path.join("wiki", "state", "handoff", "slack.json");
+const STATE_DIR = path.join("wiki", "state", "slack");
+const SOURCE_DIR = path.join("wiki", "sources", "slack");
+
+type Cursor = Record<string, unknown>;
+
+/**
+ * A reply to `parent`, `offset` seconds after it.
+ * @param parent - The thread parent's ts.
+ * @param offset - Seconds after the parent.
+ * @returns The reply message.
+ */
+const replyTo = (parent: string, offset: number): SlackMessage => ({
+  ts: `${Number.parseInt(parent, 10) + offset}.000200`,
+  thread_ts: parent,
+  user: "U9",
+  text: `reply ${offset} to ${parent}`,
+});
+
+/**
+ * A channel of 20 messages where messages 0, 5, 10 and 15 open threads.
+ * @param replyCounts - Replies per thread parent index.
+ * @param extra - Messages appended after the first 20.
+ * @returns The fixture workspace.
+ */
+const workspace = (
+  replyCounts: Record<number, number>,
+  extra: SlackMessage[] = []
+): SlackWorkspace => {
+  const replies: Record<string, SlackMessage[]> = {};
+  const history = messagesFrom(20, 1_700_000_000).map((message, index) => {
+    const count = replyCounts[index];
+    if (count === undefined) return message;
+    const thread = Array.from({ length: count }, (_, offset) =>
+      replyTo(message.ts, offset + 1)
+    );
+    replies[message.ts] = thread;
+    return {
+      ...message,
+      thread_ts: message.ts,
+      reply_count: count,
+      latest_reply: thread.at(-1)?.ts,
+    };
+  });
+  return {
+    channels: [{ id: CHANNEL, name: "delta" }],
+    history: { [CHANNEL]: [...history, ...extra] },
+    replies: { [CHANNEL]: replies },
+  };
+};
+
+describe("lisa-wiki Slack connector delta thread refresh", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-delta-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Runs one ingest and advances state from its proposed cursor, as the kernel
+   * does after verification.
+   * @param fixture - The workspace as of this run.
+   * @param args - Extra connector arguments.
+   * @param keep - Rewrites the cursor before it is stored as state.
+   * @returns The run, its note text ("" when none was written) and cursor.
+   */
+  const ingest = (
+    fixture: SlackWorkspace,
+    args: string[] = [],
+    keep: (cursor: Cursor) => Cursor = cursor => cursor
+  ) => {
+    rmSync(path.join(tmp, SOURCE_DIR), { force: true, recursive: true });
+    const run: IngestRun = runIngest(tmp, fixture, [
+      "--channel",
+      CHANNEL,
+      "--emit-meta",
+      META,
+      ...args,
+    ]);
+    expect(run.status).toBe(0);
+    const { proposedCursor } = JSON.parse(
+      readFileSync(path.join(tmp, META), "utf8")
+    ) as { proposedCursor: Cursor };
+    mkdirSync(path.join(tmp, STATE_DIR), { recursive: true });
+    writeFileSync(
+      path.join(tmp, STATE_DIR, `${CHANNEL}.json`),
+      JSON.stringify(keep(proposedCursor))
+    );
+    const note =
+      readdirSync(path.join(tmp, SOURCE_DIR)).find(name =>
+        name.endsWith(".md")
+      ) ?? "";
+    return {
+      replyCalls: run.calls.filter(([m]) => m === "conversations.replies"),
+      note: note ? readFileSync(path.join(tmp, SOURCE_DIR, note), "utf8") : "",
+      cursor: proposedCursor,
+    };
+  };
+
+  it("indexes every fetched thread in the proposed cursor", () => {
+    const first = ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }));
+
+    expect(first.replyCalls).toHaveLength(4);
+    expect(first.cursor.threads).toEqual({
+      "1700000000.000100": ["1700000002.000200", 2],
+      "1700000005.000100": ["1700000006.000200", 1],
+      "1700000010.000100": ["1700000013.000200", 3],
+      "1700000015.000100": ["1700000016.000200", 1],
+    });
+  });
+
+  it("fetches nothing and emits nothing when no thread moved", () => {
+    ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }));
+    const second = ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }));
+
+    expect(second.replyCalls).toEqual([]);
+    expect(second.note).toBe("");
+    expect(second.cursor).toMatchObject({
+      last_message_count: 0,
+      last_skipped_count: 20,
+    });
+  });
+
+  it("refreshes only the moved thread and emits only what is new", () => {
+    ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }));
+    const fixture = workspace(
+      { 0: 2, 5: 4, 10: 3, 15: 1 },
+      messagesFrom(1, 1_700_000_100)
+    );
+    const history = (fixture.history[CHANNEL] ?? []).map(message =>
+      message.ts === "1700000003.000100"
+        ? {
+            ...message,
+            text: "edited message 3",
+            edited: { ts: "1700000200.000000" },
+          }
+        : message
+    );
+    const third = ingest({ ...fixture, history: { [CHANNEL]: history } });
+
+    expect(third.replyCalls.map(([, params]) => params.ts)).toEqual([
+      "1700000005.000100",
+    ]);
+    expect(third.note).toContain("- Messages: `3`");
+    expect(third.note).toContain("- Thread replies: `3`");
+    expect(third.note).toContain("edited message 3");
+    expect(third.note).not.toContain("reply 1 to 1700000005");
+    expect(third.note).toContain("reply 4 to 1700000005");
+    expect(third.note).not.toMatch(/^message 7$/m);
+  });
+
+  it("depends on state carrying the whole proposed cursor", () => {
+    const threads = { 0: 2, 5: 1, 10: 3, 15: 1 };
+    // What a kernel that copied only the watermark would leave behind.
+    ingest(workspace(threads), [], cursor => ({
+      ...cursor,
+      threads: undefined,
+      fingerprints: undefined,
+    }));
+    const watermarkOnly = ingest(workspace(threads));
+    const carried = ingest(workspace(threads));
+
+    expect(watermarkOnly.replyCalls).toHaveLength(4);
+    expect(watermarkOnly.cursor.last_message_count).toBe(4);
+    expect(carried.replyCalls).toEqual([]);
+    expect(carried.note).toBe("");
+  });
+
+  it("re-fetches every thread under --full-refresh", () => {
+    ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }));
+    const again = ingest(workspace({ 0: 2, 5: 1, 10: 3, 15: 1 }), [
+      "--full-refresh",
+    ]);
+
+    expect(again.replyCalls).toHaveLength(4);
+    expect(again.note).toContain("- Messages: `20`");
+  });
+});
@@ -0,0 +1,124 @@
+/**
+ * Slack connector: concurrent thread-reply fetching.
+ *
+ * `conversations.replies` runs on a bounded worker pool that shares the
+ * client's rate limiter. Replies are merged back in message order, so a note
+ * written with many workers must be byte-identical to a serial run apart from
+ * the ingest timestamp.
+ * @module tests/unit/strategies/wiki-slack-thread-fetch
+ */
+import {
+  mkdirSync,
+  mkdtempSync,
+  readdirSync,
+  readFileSync,
+  rmSync,
+} from "node:fs";
+import { tmpdir } from "node:os";
+import path from "node:path";
+
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+
+import {
+  messagesFrom,
+  runIngest,
+  type SlackMessage,
+  type SlackWorkspace,
+} from "../../helpers/slack-ingest-harness.js";
+
+const CHANNEL = "C0THREADS";
+const SOURCE_DIR = path.join("wiki", "sources", "slack");
+
+/**
+ * A channel where every third message opens a thread of three replies.
+ * @returns The fixture workspace.
+ */
+const threadedWorkspace = (): SlackWorkspace => {
+  const replies: Record<string, SlackMessage[]> = {};
+  const history = messagesFrom(45).map((message, index) => {
+    if (index % 3 !== 0) return message;
+    const seconds = message.ts.split(".")[0] ?? "";
+    replies[message.ts] = [1, 2, 3].map(offset => ({
+      ts: `${seconds}.00010${offset}`,
+      thread_ts: message.ts,
+      user: "U9",
+      text: `reply ${offset} to ${message.text}`,
+    }));
+    return { ...message, thread_ts: message.ts, reply_count: 3 };
+  });
+  return {
+    channels: [{ id: CHANNEL, name: "threads" }],
+    history: { [CHANNEL]: history },
+    replies: { [CHANNEL]: replies },
+  };
+};
+
+/**
+ * The note a run wrote, minus the lines that record when it ran.
+ * @param dir - The run's working directory.
+ * @returns Note text without its timestamps.
+ */
+const noteWithoutTimestamps = (dir: string): string => {
+  const sourceDir = path.join(dir, SOURCE_DIR);
+  const note =
+    readdirSync(sourceDir).find(name => name.endsWith(".md")) ?? "";
+  return readFileSync(path.join(sourceDir, note), "utf8")
+    .split("\n")
+    .filter(line => !/^(created|updated): |^- Ingested at: /.test(line))
+    .join("\n");
+};
+
+describe("lisa-wiki Slack connector thread fetching", () => {
+  let tmp: string;
+
+  beforeEach(() => {
+    tmp = mkdtempSync(path.join(tmpdir(), "lisa-slack-threads-"));
+  });
+
+  afterEach(() => {
+    rmSync(tmp, { force: true, recursive: true });
+  });
+
+  /**
+   * Ingests the threaded channel with a given pool size.
+   * @param workers - Value for --thread-workers.
+   * @returns The run's working directory and recorded calls.
+   */
+  const ingestWith = (workers: number) => {
+    const dir = path.join(tmp, `workers-${workers}`);
+    mkdirSync(dir);
+    const run = runIngest(dir, threadedWorkspace(), [
+      "--channel",
+      CHANNEL,
+      "--limit",
+      "10",
+      "--thread-workers",
+      String(workers),
+    ]);
+    expect(run.stderr).toBe("");
+    expect(run.status).toBe(0);
+    return { dir, calls: run.calls };
+  };
+
+  it("writes the same note with a worker pool as serially", () => {
+    const serial = ingestWith(1);
+    const pooled = ingestWith(8);
+
+    const note = noteWithoutTimestamps(pooled.dir);
+    expect(note).toBe(noteWithoutTimestamps(serial.dir));
+    expect(note).toContain("- Thread replies: `45`");
+    expect(note.indexOf("reply 1 to message 0")).toBeLessThan(
+      note.indexOf("reply 1 to message 3")
+    );
+  });
+
+  it("fetches each thread's replies exactly once", () => {
+    const { calls } = ingestWith(8);
+    const threads = calls
+      .filter(([method]) => method === "conversations.replies")
+      .map(([, params]) => params.ts);
+
+    expect(threads).toHaveLength(15);
+    expect(new Set(threads).size).toBe(15);
+  });
+});